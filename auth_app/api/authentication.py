@@ -0,0 +1,81 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+from rest_framework.authtoken.models import Token
+
+
+def token_cache_key(key):
+    """Cache key for a token; the raw token never appears in the cache."""
+    return 'authtoken:' + hashlib.sha256(key.encode()).hexdigest()
+
+
+def get_token_cache():
+    return caches[settings.AUTH_TOKEN_CACHE_ALIAS]
+
+
+def invalidate_token(key):
+    """Drop the cached resolution of a single token."""
+    get_token_cache().delete(token_cache_key(key))
+
+
+def invalidate_user_tokens(user):
+    """Drop cached resolutions of every token belonging to the user."""
+    keys = Token.objects.filter(user=user).values_list('key', flat=True)
+    get_token_cache().delete_many([token_cache_key(key) for key in keys])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in replacement for DRF's TokenAuthentication that caches the
+    token -> (user, token) resolution for `AUTH_TOKEN_CACHE_TTL` seconds.
+    Entries are invalidated by `auth_app.signals` on logout, token changes,
+    and any user save (password change, deactivation, profile edits).
+    """
+
+    def authenticate_credentials(self, key):
+        cache = get_token_cache()
+        cache_key = token_cache_key(key)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+        user, token = super().authenticate_credentials(key)
+        cache.set(cache_key, (user, token), settings.AUTH_TOKEN_CACHE_TTL)
+        return user, token
+
+    async def aauthenticate(self, request):
+        """
+        Async counterpart of `authenticate` for async views (plain Django
+        requests): same header parsing, errors and cache entries.
+        """
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) == 1:
+            raise exceptions.AuthenticationFailed(_('Invalid token header. No credentials provided.'))
+        if len(auth) > 2:
+            raise exceptions.AuthenticationFailed(_('Invalid token header. Token string should not contain spaces.'))
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(
+                _('Invalid token header. Token string should not contain invalid characters.'))
+        return await self.aauthenticate_credentials(key)
+
+    async def aauthenticate_credentials(self, key):
+        cache = get_token_cache()
+        cache_key = token_cache_key(key)
+        cached = await cache.aget(cache_key)
+        if cached is not None:
+            return cached
+        try:
+            token = await self.get_model().objects.select_related('user').aget(key=key)
+        except self.get_model().DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        await cache.aset(cache_key, (token.user, token), settings.AUTH_TOKEN_CACHE_TTL)
+        return token.user, token
@@ -1,8 +1,9 @@
 from django.urls import path
-from .views import RegistrationView, CustomLoginView, EmailCheckView
+from .views import RegistrationView, CustomLoginView, LogoutView, EmailCheckView
 
 urlpatterns = [
     path('email-check/', EmailCheckView.as_view(), name='email-check'),
     path('registration/', RegistrationView.as_view(), name='registration'),
     path('login/', CustomLoginView.as_view(), name='login'),
+    path('logout/', LogoutView.as_view(), name='logout'),
 ]
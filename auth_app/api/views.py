@@ -76,3 +76,14 @@ class EmailCheckView(APIView):
             'email': user.email,
             'fullname': user.get_full_name() or user.username
         }, status=status.HTTP_200_OK)
+
+
+class LogoutView(APIView):
+    """
+    Logs the user out by deleting the token used for this request.
+    """
+
+    def post(self, request):
+        if request.auth is not None:
+            request.auth.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
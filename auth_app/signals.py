@@ -0,0 +1,19 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from .api.authentication import invalidate_token, invalidate_user_tokens
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def invalidate_changed_token(sender, instance, **kwargs):
+    """Logout and token rotation delete/replace tokens; forget their cached user."""
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=User)
+def invalidate_tokens_of_changed_user(sender, instance, created, **kwargs):
+    """Deactivation and profile edits must not be served from cache."""
+    if not created:
+        invalidate_user_tokens(instance)
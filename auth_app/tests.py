@@ -1,3 +1,56 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class CachedTokenAuthenticationTests(APITestCase):
+    """Token lookups are cached, and the cache never outlives a revoked token or changed user."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='user@example.com', email='user@example.com', password='old-password')
+        self.token = Token.objects.create(user=self.user)
+
+    def get(self, key=None):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {key or self.token.key}')
+        return self.client.get('/api/email-check/?email=user@example.com').status_code
+
+    def test_repeated_request_skips_token_query(self):
+        self.assertEqual(self.get(), 200)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.get(), 200)
+        self.assertEqual([query['sql'] for query in queries if 'authtoken_token' in query['sql']], [])
+
+    def test_logout_revokes_cached_token(self):
+        self.assertEqual(self.get(), 200)
+        self.assertEqual(self.client.post('/api/logout/').status_code, 204)
+        self.assertEqual(self.get(), 401)
+
+    def test_rotated_or_deleted_token_is_rejected(self):
+        self.assertEqual(self.get(), 200)
+        self.token.delete()
+        rotated = Token.objects.create(user=self.user)
+        self.assertEqual(self.get(), 401)
+        self.assertEqual(self.get(rotated.key), 200)
+        rotated.delete()
+        self.assertEqual(self.get(rotated.key), 401)
+
+    def test_user_change_reloads_cached_token(self):
+        self.assertEqual(self.get(), 200)
+        self.user.set_password('new-password')
+        self.user.save()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.get(), 200)
+        self.assertEqual(len([query for query in queries if 'authtoken_token' in query['sql']]), 1)
+
+    def test_deactivated_user_is_rejected(self):
+        self.assertEqual(self.get(), 200)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.get(), 401)
@@ -0,0 +1,197 @@
+"""
+Per-endpoint request metrics in Prometheus text format.
+
+`MetricsMiddleware` records, per URL name and method, histograms of
+latency, SQL queries, SQL time and response bytes, plus a request counter
+by status class. SQL is measured by a wrapper installed on every database
+connection that adds to the stats of the current request (a context
+variable, so queries run by async views through `sync_to_async` count
+too). Updating a request's metrics is a few dict lookups under one lock.
+
+Metrics live in the process: with several workers, each one exposes its
+own numbers and Prometheus should scrape them separately (or sum them).
+"""
+import bisect
+import contextvars
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.permissions import BasePermission
+from rest_framework.views import APIView
+from auth_app.api.authentication import CachedTokenAuthentication
+
+HISTOGRAMS = {
+    'kanban_http_request_duration_seconds': (
+        'Time from the first middleware to the response.',
+        (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)),
+    'kanban_http_db_queries': (
+        'SQL queries per request.',
+        (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)),
+    'kanban_http_db_duration_seconds': (
+        'Time spent in SQL per request.',
+        (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)),
+    'kanban_http_response_bytes': (
+        'Response body size (streaming responses are not counted).',
+        (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)),
+}
+UNMATCHED = '<unmatched>'
+
+_current = contextvars.ContextVar('kanban_request_stats', default=None)
+
+
+class Registry:
+    """Histograms keyed by (view, method) and request counts by (view, method, status class)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {name: {} for name in HISTOGRAMS}
+        self.requests = {}
+
+    def observe(self, view, method, status, values):
+        key = (view, method)
+        with self.lock:
+            for name, value in values.items():
+                series = self.histograms[name].get(key)
+                if series is None:
+                    # One slot per bucket plus +Inf, then sum.
+                    series = self.histograms[name][key] = [0] * (len(HISTOGRAMS[name][1]) + 1) + [0]
+                series[bisect.bisect_left(HISTOGRAMS[name][1], value)] += 1
+                series[-1] += value
+            counter_key = (view, method, f'{status // 100}xx')
+            self.requests[counter_key] = self.requests.get(counter_key, 0) + 1
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {name: {} for name in HISTOGRAMS}
+            self.requests = {}
+
+    def render(self):
+        """The Prometheus text exposition (format 0.0.4)."""
+        with self.lock:
+            histograms = {name: {key: list(series) for key, series in data.items()}
+                          for name, data in self.histograms.items()}
+            requests = dict(self.requests)
+        lines = ['# HELP kanban_http_requests_total Requests by URL name, method and status class.',
+                 '# TYPE kanban_http_requests_total counter']
+        for (view, method, status), count in sorted(requests.items()):
+            lines.append(f'kanban_http_requests_total{_labels(view=view, method=method, status=status)} {count}')
+        for name, (help_text, buckets) in HISTOGRAMS.items():
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+            for (view, method), series in sorted(histograms[name].items()):
+                cumulative = 0
+                for bound, count in zip([*buckets, '+Inf'], series):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{_labels(view=view, method=method, le=bound)} {cumulative}')
+                labels = _labels(view=view, method=method)
+                lines.append(f'{name}_sum{labels} {_number(series[-1])}')
+                lines.append(f'{name}_count{labels} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _labels(**labels):
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return '{' + ','.join(f'{name}="{escape(value)}"' for name, value in labels.items()) + '}'
+
+
+registry = Registry()
+
+
+def record_query(execute, sql, params, many, context):
+    """Connection execute wrapper: adds the query to the current request's stats, if any."""
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats[0] += 1
+        stats[1] += time.perf_counter() - started
+
+
+def install_wrapper(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+connection_created.connect(install_wrapper, dispatch_uid='kanban_metrics')
+
+
+class MetricsMiddleware:
+    """Records metrics for every request; put it first in MIDDLEWARE so the whole stack is timed."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        # Connections opened before this module was imported missed connection_created.
+        for connection in connections.all(initialized_only=True):
+            install_wrapper(connection)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        stats = [0, 0.0]
+        token = _current.set(stats)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.record(request, response, time.perf_counter() - started, stats)
+        return response
+
+    async def __acall__(self, request):
+        stats = [0, 0.0]
+        token = _current.set(stats)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.record(request, response, time.perf_counter() - started, stats)
+        return response
+
+    def record(self, request, response, seconds, stats):
+        match = request.resolver_match
+        view = (match.view_name or match._func_path) if match else UNMATCHED
+        values = {
+            'kanban_http_request_duration_seconds': seconds,
+            'kanban_http_db_queries': stats[0],
+            'kanban_http_db_duration_seconds': stats[1],
+        }
+        if not response.streaming:
+            values['kanban_http_response_bytes'] = len(response.content)
+        registry.observe(view, request.method, response.status_code, values)
+
+
+class MetricsAccess(BasePermission):
+    """Staff users, or any client at an address in KANBAN_METRICS_ALLOWED_IPS."""
+
+    def has_permission(self, request, view):
+        if request.META.get('REMOTE_ADDR') in settings.KANBAN_METRICS_ALLOWED_IPS:
+            return True
+        return bool(request.user and request.user.is_staff)
+
+
+class MetricsView(APIView):
+    """Prometheus scrape endpoint; staff authenticate with their API token or a session."""
+    authentication_classes = [CachedTokenAuthentication, SessionAuthentication]
+    permission_classes = [MetricsAccess]
+
+    def get(self, request):
+        return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
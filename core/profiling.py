@@ -0,0 +1,232 @@
+"""
+Sampling request profiler.
+
+`ProfilingMiddleware` profiles a fraction of requests (`KANBAN_PROFILE_RATE`)
+and every request with a valid `X-Kanban-Profile` header (a signed token
+from `manage.py profile_token`). For each profiled request it stores, in
+`KANBAN_PROFILE_DIR`:
+
+    <id>.prof   cProfile stats (open with pstats, snakeviz, ...)
+    <id>.json   method, path, view, status, duration, the top functions by
+                cumulative time and the SQL statements with their duration
+                (the first `KANBAN_PROFILE_MAX_QUERIES`; all are counted)
+
+The directory is pruned to `KANBAN_PROFILE_MAX_COUNT` profiles and
+`KANBAN_PROFILE_MAX_BYTES` after every write, oldest first. Responses of
+profiled requests carry the profile id in `X-Kanban-Profile-Id`; staff
+users list and download profiles under /api/profiles/.
+
+cProfile follows the request's thread: requests handled by the async
+middleware chain (ASGI) are not profiled, and a signed header arriving
+there is logged as a warning; async views called from WSGI are missing
+from the stats (their SQL is still logged). At most one request per
+process is profiled at a time.
+"""
+import contextvars
+import cProfile
+import io
+import json
+import logging
+import pstats
+import random
+import re
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core import signing
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import FileResponse, Http404
+from django.utils import timezone
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+logger = logging.getLogger('kanban.profiling')
+
+HEADER = 'X-Kanban-Profile'
+SALT = 'kanban.profile'
+PROFILE_ID = re.compile(r'^\d{8}T\d{12}-[0-9a-f]{8}$')
+SQL_MAX_LENGTH = 2000
+TOP_FUNCTIONS = 40
+
+_queries = contextvars.ContextVar('kanban_profile_queries', default=None)
+_running = threading.Lock()
+
+
+def make_token():
+    return signing.TimestampSigner(salt=SALT).sign('profile')
+
+
+def valid_token(value):
+    try:
+        signing.TimestampSigner(salt=SALT).unsign(value, max_age=settings.KANBAN_PROFILE_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def record_query(execute, sql, params, many, context):
+    """Connection execute wrapper: logs statements of the request being profiled."""
+    log = _queries.get()
+    if log is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        ms = (time.perf_counter() - started) * 1000
+        log['count'] += 1
+        log['ms'] += ms
+        if len(log['queries']) < settings.KANBAN_PROFILE_MAX_QUERIES:
+            log['queries'].append({'sql': sql[:SQL_MAX_LENGTH], 'many': many, 'ms': round(ms, 3)})
+
+
+def install_wrapper(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+connection_created.connect(install_wrapper, dispatch_uid='kanban_profiling')
+
+
+def profile_dir():
+    return Path(settings.KANBAN_PROFILE_DIR)
+
+
+def save_profile(profile, meta, log):
+    """Write the .prof and .json files of one profile and prune the directory; returns the id."""
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    profile_id = f"{timezone.now():%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+    profile.dump_stats(directory / f'{profile_id}.prof')
+    top = io.StringIO()
+    pstats.Stats(profile, stream=top).sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+    meta = {
+        'id': profile_id,
+        **meta,
+        'query_count': log['count'],
+        'query_ms': round(log['ms'], 3),
+        'top': top.getvalue(),
+        'queries': log['queries'],
+    }
+    (directory / f'{profile_id}.json').write_text(json.dumps(meta))
+    prune(directory)
+    return profile_id
+
+
+def prune(directory):
+    """Delete the oldest profiles beyond the configured count and total size."""
+    profiles = sorted(directory.glob('*.json'), reverse=True)
+    total = 0
+    for number, path in enumerate(profiles):
+        prof = path.with_suffix('.prof')
+        try:
+            total += path.stat().st_size + prof.stat().st_size
+        except FileNotFoundError:  # pruned by another worker
+            continue
+        if number >= settings.KANBAN_PROFILE_MAX_COUNT or total > settings.KANBAN_PROFILE_MAX_BYTES:
+            path.unlink(missing_ok=True)
+            prof.unlink(missing_ok=True)
+
+
+class ProfilingMiddleware:
+    """Profiles sampled or explicitly requested sync requests; a no-op otherwise."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        for connection in connections.all(initialized_only=True):
+            install_wrapper(connection)
+
+    def __call__(self, request):
+        if self.is_async:
+            header = request.headers.get(HEADER)
+            if header is not None and valid_token(header):
+                logger.warning('Not profiling %s %s: requests served over ASGI are not profiled; '
+                               'send it to a WSGI worker instead.', request.method, request.path)
+            return self.get_response(request)
+        if not self.wanted(request) or not _running.acquire(blocking=False):
+            return self.get_response(request)
+        try:
+            return self.profile(request)
+        finally:
+            _running.release()
+
+    def wanted(self, request):
+        header = request.headers.get(HEADER)
+        if header is not None:
+            return valid_token(header)
+        rate = settings.KANBAN_PROFILE_RATE
+        return rate > 0 and random.random() < rate
+
+    def profile(self, request):
+        log = {'count': 0, 'ms': 0.0, 'queries': []}
+        token = _queries.set(log)
+        profile = cProfile.Profile()
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profile.disable()
+            _queries.reset(token)
+        match = request.resolver_match
+        response[f'{HEADER}-Id'] = save_profile(profile, {
+            'created_at': timezone.now().isoformat(),
+            'method': request.method,
+            'path': request.get_full_path(),
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'ms': round((time.perf_counter() - started) * 1000, 3),
+        }, log)
+        return response
+
+
+def load_meta(profile_id):
+    path = profile_dir() / f'{profile_id}.json'
+    if not PROFILE_ID.match(profile_id) or not path.exists():
+        raise Http404('No such profile.')
+    return json.loads(path.read_text())
+
+
+class ProfileListView(APIView):
+    """Stored profiles, newest first, without their SQL and function listings."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        results = []
+        for path in sorted(profile_dir().glob('*.json'), reverse=True):
+            try:
+                meta = json.loads(path.read_text())
+            except FileNotFoundError:
+                continue
+            results.append({key: value for key, value in meta.items() if key not in ('top', 'queries')})
+        return Response({'count': len(results), 'results': results})
+
+
+class ProfileDetailView(APIView):
+    """One profile with its top functions and SQL statements."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, profile_id):
+        return Response(load_meta(profile_id))
+
+
+class ProfileDownloadView(APIView):
+    """The raw cProfile stats file of one profile."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, profile_id):
+        load_meta(profile_id)
+        path = profile_dir() / f'{profile_id}.prof'
+        return FileResponse(path.open('rb'), as_attachment=True, filename=path.name,
+                            content_type='application/octet-stream')
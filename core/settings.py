@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from core.database import database_from_env
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -44,6 +47,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.metrics.MetricsMiddleware',
+    'core.profiling.ProfilingMiddleware',
+    'core.tracing.TracingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -75,12 +81,11 @@ WSGI_APPLICATION = 'core.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+# Configured from DB_* environment variables (see core/database.py):
+# SQLite in tuned mode by default, PostgreSQL with DB_ENGINE=postgres.
 
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_from_env(os.environ, BASE_DIR),
 }
 
 
@@ -126,10 +131,98 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'kanban_app.api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'auth_app.api.authentication.CachedTokenAuthentication',
     ],
 }
+
+# Caches
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Local memory is per process: with several workers, switch to a shared backend
+# such as 'django.core.cache.backends.filebased.FileBasedCache' so that
+# invalidations (logout, password change) reach every worker.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'kanmind',
+    },
+}
+
+# Token -> user resolutions cached by CachedTokenAuthentication
+AUTH_TOKEN_CACHE_ALIAS = 'default'
+AUTH_TOKEN_CACHE_TTL = 300
+
+# Serialized board detail payloads (kanban_app.response_cache). Any Django cache
+# backend works, e.g. 'django.core.cache.backends.redis.RedisCache' against a local Redis.
+KANBAN_RESPONSE_CACHE_ALIAS = 'default'
+KANBAN_BOARD_DETAIL_CACHE_TTL = 300
+
+# Board change feed: most entries per response, and how long entries are kept
+# before `compact_changes` removes them (older cursors get a reset).
+KANBAN_CHANGES_LIMIT = 500
+KANBAN_CHANGE_RETENTION_DAYS = 30
+
+# Serve the hot read endpoints with async views (kanban_app.api.async_views).
+# Only useful under ASGI; compare with `manage.py bench_asgi` before enabling.
+KANBAN_ASYNC_READS = os.environ.get('KANBAN_ASYNC_READS', '0') == '1'
+
+# Task search index (kanban_app.search): 'auto' uses SQLite FTS5 on SQLite and the
+# in-process index elsewhere; 'memory' forces the in-process index.
+KANBAN_SEARCH_BACKEND = 'auto'
+KANBAN_SEARCH_LIMIT = 20
+KANBAN_SEARCH_MAX_LIMIT = 100
+
+# Rows fetched per round trip when streaming board exports (kanban_app.export).
+KANBAN_EXPORT_CHUNK_SIZE = 2000
+
+# Bulk imports (kanban_app.imports): rows per transaction, and how many row errors a job keeps.
+KANBAN_IMPORT_CHUNK_SIZE = 2000
+KANBAN_IMPORT_MAX_ERRORS = 100
+
+# Pending events per WebSocket connection before it is told to resync.
+KANBAN_WS_QUEUE_SIZE = 100
+
+# Board member ids cached by kanban_app.membership (invalidated on membership changes)
+KANBAN_MEMBERSHIP_CACHE_TTL = 600
+
+# Upper bound of items (create + update + delete) per POST /api/tasks/bulk/
+KANBAN_BULK_MAX_ITEMS = 1000
+
+# Cursor pagination for list endpoints (see kanban_app/api/pagination.py)
+KANBAN_PAGE_SIZE = 50
+KANBAN_MAX_PAGE_SIZE = 500
+
+# Request metrics (core.metrics) at /metrics: open to staff users (API token or
+# session) and to these client addresses (comma-separated, e.g. the Prometheus
+# host). Empty by default: behind a reverse proxy every client looks local.
+KANBAN_METRICS_ALLOWED_IPS = [ip for ip in os.environ.get('KANBAN_METRICS_ALLOWED_IPS', '').split(',') if ip]
+
+# Request profiler (core.profiling): fraction of requests to profile (0 = only
+# requests with a signed X-Kanban-Profile header from `manage.py profile_token`),
+# where profiles are stored and how many / how much is kept.
+KANBAN_PROFILE_RATE = float(os.environ.get('KANBAN_PROFILE_RATE', '0'))
+KANBAN_PROFILE_DIR = os.environ.get('KANBAN_PROFILE_DIR', str(BASE_DIR / 'profiles'))
+KANBAN_PROFILE_MAX_COUNT = 100
+KANBAN_PROFILE_MAX_BYTES = 50 * 1024 * 1024
+KANBAN_PROFILE_MAX_QUERIES = 500
+KANBAN_PROFILE_TOKEN_MAX_AGE = 3600
+
+# Request tracing (core.tracing): '' = off, 'file' = OTLP/JSON lines appended to
+# KANBAN_TRACE_FILE, 'otlp' = POSTed to an OTLP/HTTP collector endpoint.
+KANBAN_TRACE_EXPORTER = os.environ.get('KANBAN_TRACE_EXPORTER', '')
+KANBAN_TRACE_FILE = os.environ.get('KANBAN_TRACE_FILE', str(BASE_DIR / 'traces.ndjson'))
+KANBAN_TRACE_OTLP_ENDPOINT = os.environ.get('KANBAN_TRACE_OTLP_ENDPOINT', 'http://localhost:4318/v1/traces')
+KANBAN_TRACE_SAMPLE_RATE = float(os.environ.get('KANBAN_TRACE_SAMPLE_RATE', '1'))
+KANBAN_TRACE_MAX_SPANS = 2000
+
+# Build task list pages and board detail from `.values()` rows instead of the
+# serializers (kanban_app/api/lean.py); same output, less CPU per row. Opt-in.
+KANBAN_LEAN_READS = os.environ.get('KANBAN_LEAN_READS', '0') == '1'
@@ -0,0 +1,379 @@
+"""
+Opt-in request tracing with nested spans.
+
+With `KANBAN_TRACE_EXPORTER` set ('file' or 'otlp'), `TracingMiddleware`
+opens a root span per request and DRF is instrumented to add child spans:
+
+    drf.authenticate                  APIView.perform_authentication
+    permission <Class>.has_permission  each permission class (and has_object_permission)
+    <View>.get_queryset / get_object   per view class
+    serialize <Serializer>            Serializer.data / ListSerializer.data
+    field <Serializer>.<method>       each SerializerMethodField value
+    db.query                          every SQL statement (db.statement attribute)
+
+The current span lives in a context variable, so SQL run by async views
+through `sync_to_async` nests correctly. Outside a traced request every
+hook is a context-variable lookup. The hooks are installed by the first
+`TracingMiddleware` and stay for the process; `uninstall()` restores the
+original DRF methods (used by the tests). A trace keeps at most
+`KANBAN_TRACE_MAX_SPANS` spans; the root span counts the dropped ones.
+
+Traces are written in OTLP/JSON (one `resourceSpans` document per trace):
+appended as lines to `KANBAN_TRACE_FILE`, or POSTed in batches from a
+background thread to `KANBAN_TRACE_OTLP_ENDPOINT` (an OpenTelemetry
+collector's /v1/traces).
+"""
+import contextvars
+import functools
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from rest_framework import serializers
+from rest_framework.views import APIView
+
+logger = logging.getLogger('kanban.tracing')
+
+SERVICE_NAME = 'kanmind'
+STATEMENT_MAX_LENGTH = 1000
+OTLP_BATCH_SIZE = 50
+OTLP_QUEUE_SIZE = 1000
+
+_span = contextvars.ContextVar('kanban_trace_span', default=None)
+
+
+class Trace:
+    def __init__(self, max_spans):
+        self.trace_id = os.urandom(16).hex()
+        self.spans = []
+        self.max_spans = max_spans
+        self.dropped = 0
+
+
+class Span:
+    def __init__(self, trace, name, parent, attributes):
+        self.trace = trace
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else ''
+        self.attributes = attributes
+        self.start = time.time_ns()
+        self.end = None
+
+    def to_otlp(self):
+        return {
+            'traceId': self.trace.trace_id,
+            'spanId': self.span_id,
+            'parentSpanId': self.parent_id,
+            'name': self.name,
+            'kind': 2 if not self.parent_id else 1,  # SERVER for the root, INTERNAL below
+            'startTimeUnixNano': str(self.start),
+            'endTimeUnixNano': str(self.end),
+            'attributes': [_attribute(key, value) for key, value in self.attributes.items()],
+        }
+
+
+def _attribute(key, value):
+    if isinstance(value, bool):
+        return {'key': key, 'value': {'boolValue': value}}
+    if isinstance(value, int):
+        return {'key': key, 'value': {'intValue': str(value)}}
+    if isinstance(value, float):
+        return {'key': key, 'value': {'doubleValue': value}}
+    return {'key': key, 'value': {'stringValue': str(value)}}
+
+
+@contextmanager
+def span(name, **attributes):
+    """Child span of the current span; does nothing outside a traced request."""
+    parent = _span.get()
+    if parent is None:
+        yield None
+        return
+    trace = parent.trace
+    if len(trace.spans) >= trace.max_spans:
+        trace.dropped += 1
+        yield None
+        return
+    current = Span(trace, name, parent, attributes)
+    trace.spans.append(current)
+    token = _span.set(current)
+    try:
+        yield current
+    finally:
+        current.end = time.time_ns()
+        _span.reset(token)
+
+
+def traced(name):
+    """Decorator: run the function inside a span called `name`."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _span.get() is None:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+        wrapper._kanban_traced = True
+        return wrapper
+    return decorate
+
+
+def trace_document(trace):
+    return {'resourceSpans': [{
+        'resource': {'attributes': [_attribute('service.name', SERVICE_NAME)]},
+        'scopeSpans': [{'scope': {'name': 'kanban.tracing'}, 'spans': [s.to_otlp() for s in trace.spans]}],
+    }]}
+
+
+class FileExporter:
+    """Appends one OTLP/JSON document per trace to a file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def export(self, trace):
+        line = json.dumps(trace_document(trace), separators=(',', ':')) + '\n'
+        with self.lock, open(self.path, 'a', encoding='utf-8') as file:
+            file.write(line)
+
+
+class OtlpHttpExporter:
+    """
+    Sends traces to an OTLP/HTTP JSON endpoint from a daemon thread, so
+    requests never wait for the collector. Traces are dropped (and logged)
+    when the queue is full or the collector fails.
+    """
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        self.queue = queue.Queue(OTLP_QUEUE_SIZE)
+        threading.Thread(target=self.send_forever, name='kanban-trace-exporter', daemon=True).start()
+
+    def export(self, trace):
+        try:
+            self.queue.put_nowait(trace)
+        except queue.Full:
+            logger.warning('Trace queue full; dropping trace %s', trace.trace_id)
+
+    def send_forever(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < OTLP_BATCH_SIZE and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            spans = [s.to_otlp() for trace in batch for s in trace.spans]
+            document = trace_document(batch[0])
+            document['resourceSpans'][0]['scopeSpans'][0]['spans'] = spans
+            request = urllib.request.Request(
+                self.endpoint, data=json.dumps(document).encode(),
+                headers={'Content-Type': 'application/json'}, method='POST')
+            try:
+                urllib.request.urlopen(request, timeout=5).close()
+            except OSError as exc:
+                logger.warning('Could not export %d traces: %s', len(batch), exc)
+
+
+def get_exporter():
+    if settings.KANBAN_TRACE_EXPORTER == 'file':
+        return FileExporter(settings.KANBAN_TRACE_FILE)
+    if settings.KANBAN_TRACE_EXPORTER == 'otlp':
+        return OtlpHttpExporter(settings.KANBAN_TRACE_OTLP_ENDPOINT)
+    raise ValueError(f'KANBAN_TRACE_EXPORTER must be "", "file" or "otlp", not {settings.KANBAN_TRACE_EXPORTER!r}.')
+
+
+# Instrumentation ---------------------------------------------------------
+
+def trace_query(execute, sql, params, many, context):
+    if _span.get() is None:
+        return execute(sql, params, many, context)
+    with span('db.query', **{'db.system': context['connection'].vendor,
+                             'db.statement': sql[:STATEMENT_MAX_LENGTH], 'db.many': many}):
+        return execute(sql, params, many, context)
+
+
+def install_wrapper(connection, **kwargs):
+    if trace_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(trace_query)
+
+
+class TracedPermission:
+    """Wraps a permission instance so each check gets its own span."""
+
+    def __init__(self, permission):
+        self.permission = permission
+        self.label = type(permission).__name__
+
+    def __getattr__(self, name):
+        return getattr(self.permission, name)
+
+    def has_permission(self, request, view):
+        with span(f'permission {self.label}.has_permission'):
+            return self.permission.has_permission(request, view)
+
+    def has_object_permission(self, request, view, obj):
+        with span(f'permission {self.label}.has_object_permission'):
+            return self.permission.has_object_permission(request, view, obj)
+
+
+_installed = False
+_patches = []  # (owner, attribute, original), in patch order
+_MISSING = object()
+
+
+def patch(owner, name, replacement):
+    """Set `owner.name`, remembering what `uninstall()` has to put back."""
+    _patches.append((owner, name, owner.__dict__.get(name, _MISSING)))
+    setattr(owner, name, replacement)
+
+
+def instrument_view(cls):
+    """Wrap the view class's own get_queryset/get_object once (they are often overridden)."""
+    for name in ('get_queryset', 'get_object'):
+        method = getattr(cls, name, None)
+        if method is not None and not getattr(method, '_kanban_traced', False):
+            patch(cls, name, traced(f'{cls.__name__}.{name}')(method))
+
+
+def install():
+    """Patch DRF and the database connections once per process."""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    connection_created.connect(install_wrapper, dispatch_uid='kanban_tracing')
+    for connection in connections.all(initialized_only=True):
+        install_wrapper(connection)
+
+    initial = APIView.initial
+    perform_authentication = APIView.perform_authentication
+    get_permissions = APIView.get_permissions
+
+    def traced_initial(self, request, *args, **kwargs):
+        if _span.get() is not None:
+            instrument_view(type(self))
+        return initial(self, request, *args, **kwargs)
+
+    def traced_authentication(self, request):
+        with span('drf.authenticate'):
+            return perform_authentication(self, request)
+
+    def traced_permissions(self):
+        permissions = get_permissions(self)
+        return [TracedPermission(p) for p in permissions] if _span.get() is not None else permissions
+
+    patch(APIView, 'initial', traced_initial)
+    patch(APIView, 'perform_authentication', traced_authentication)
+    patch(APIView, 'get_permissions', traced_permissions)
+
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        data = cls.data
+
+        def traced_data(self, data=data):
+            if _span.get() is None:
+                return data.fget(self)
+            serializer = self.child if isinstance(self, serializers.ListSerializer) else self
+            with span(f'serialize {type(serializer).__name__}', many=serializer is not self):
+                return data.fget(self)
+
+        patch(cls, 'data', property(traced_data))
+
+    method_field = serializers.SerializerMethodField.to_representation
+
+    def traced_method_field(self, value):
+        if _span.get() is None:
+            return method_field(self, value)
+        with span(f'field {type(self.parent).__name__}.{self.method_name}'):
+            return method_field(self, value)
+
+    patch(serializers.SerializerMethodField, 'to_representation', traced_method_field)
+
+
+def uninstall():
+    """Undo `install()` and every view instrumented since."""
+    global _installed
+    while _patches:
+        owner, name, original = _patches.pop()
+        if original is _MISSING:
+            delattr(owner, name)
+        else:
+            setattr(owner, name, original)
+    connection_created.disconnect(dispatch_uid='kanban_tracing')
+    for connection in connections.all(initialized_only=True):
+        if trace_query in connection.execute_wrappers:
+            connection.execute_wrappers.remove(trace_query)
+    _installed = False
+
+
+class TracingMiddleware:
+    """Root span per request; removed from the stack when tracing is off."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.KANBAN_TRACE_EXPORTER:
+            raise MiddlewareNotUsed
+        self.exporter = get_exporter()
+        install()
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        root, token = self.start(request)
+        if root is None:
+            return self.get_response(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _span.reset(token)
+        self.finish(request, response, root)
+        return response
+
+    async def __acall__(self, request):
+        root, token = self.start(request)
+        if root is None:
+            return await self.get_response(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _span.reset(token)
+        self.finish(request, response, root)
+        return response
+
+    def start(self, request):
+        if random.random() >= settings.KANBAN_TRACE_SAMPLE_RATE:
+            return None, None
+        trace = Trace(settings.KANBAN_TRACE_MAX_SPANS)
+        root = Span(trace, f'{request.method} {request.path}', None, {'http.method': request.method})
+        trace.spans.append(root)
+        return root, _span.set(root)
+
+    def finish(self, request, response, root):
+        root.end = time.time_ns()
+        match = request.resolver_match
+        if match and match.view_name:
+            root.name = f'{request.method} {match.view_name}'
+            root.attributes['http.route'] = match.route
+        root.attributes['http.target'] = request.get_full_path()
+        root.attributes['http.status_code'] = response.status_code
+        if root.trace.dropped:
+            root.attributes['spans.dropped'] = root.trace.dropped
+        for open_span in root.trace.spans:
+            # Spans still open when the response leaves (e.g. streaming) end with the request.
+            open_span.end = open_span.end or root.end
+        self.exporter.export(root.trace)
@@ -16,6 +16,8 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
+from core.metrics import MetricsView
+from core.profiling import ProfileListView, ProfileDetailView, ProfileDownloadView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -24,4 +26,10 @@ urlpatterns = [
     # Registration, login, email check
     path('api/', include('auth_app.api.urls')),
     path('api-auth/', include('rest_framework.urls')),
+    # Prometheus metrics (staff or local addresses)
+    path('metrics', MetricsView.as_view(), name='metrics'),
+    # Request profiles (staff only)
+    path('api/profiles/', ProfileListView.as_view(), name='profile-list'),
+    path('api/profiles/<str:profile_id>/', ProfileDetailView.as_view(), name='profile-detail'),
+    path('api/profiles/<str:profile_id>/download/', ProfileDownloadView.as_view(), name='profile-download'),
 ]
@@ -0,0 +1,174 @@
+"""
+Async implementations of the hottest read endpoints, used under ASGI when
+the `KANBAN_ASYNC_READS` environment setting is on (see `core/settings.py`).
+
+They run on the event loop with the async ORM and async cache API instead of
+occupying a thread of the sync bridge per request. Authentication,
+permissions, pagination, serializers, conditional GET and error bodies are
+the same as in the DRF views in `views.py`; responses are always JSON.
+Writes and OPTIONS on the same URLs are handed to the DRF views.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import aprefetch_related_objects
+from django.http import Http404, HttpResponse
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.request import Request
+from auth_app.api.authentication import CachedTokenAuthentication
+from kanban_app.membership import ais_member_or_owner
+from kanban_app.models import Board, Task, Comment
+from kanban_app.response_cache import aget_board_detail, aset_board_detail
+from . import lean
+from .filters import TaskFilter, TaskOrderingFilter, requested_fields, sparse_queryset
+from .conditional import list_etag, list_stamp, make_etag, not_modified, set_validators
+from .pagination import IdCursorPagination, CommentCursorPagination
+from .renderers import FastJSONRenderer
+from .serializers import BoardSerializer, BoardDetailSerializer, TaskSerializer, CommentSerializer
+
+
+class AsyncReadView(View):
+    """
+    Base for async GET endpoints. Subclasses implement
+    `async def read(self, request, user, **kwargs)` and return a response.
+    `request` is a DRF Request wrapper (for query_params and serializer
+    context); authentication happens here, not through it.
+    """
+    authentication = CachedTokenAuthentication()
+    renderer = FastJSONRenderer()
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            result = await self.authentication.aauthenticate(request)
+            if result is None:
+                raise exceptions.NotAuthenticated()
+            return await self.read(Request(request), result[0], **kwargs)
+        except Http404 as exc:
+            return self.error_response(exceptions.NotFound(*exc.args))
+        except exceptions.APIException as exc:
+            return self.error_response(exc)
+
+    def render(self, data, status=200):
+        return HttpResponse(self.renderer.render(data), status=status, content_type='application/json')
+
+    def error_response(self, exc):
+        """Same status, body and WWW-Authenticate header as DRF's exception handler."""
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+        response = self.render(data, status=exc.status_code)
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            response.status_code = 401
+            response['WWW-Authenticate'] = self.authentication.authenticate_header(None)
+        return response
+
+    async def get_or_404(self, queryset, **lookup):
+        obj = await queryset.filter(**lookup).afirst()
+        if obj is None:
+            raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
+        return obj
+
+    async def paginated(self, paginator, queryset, serializer_class, request, **serializer_kwargs):
+        page = await paginator.apaginate_queryset(queryset, request, self)
+        data = serializer_class(page, many=True, context={'request': request}, **serializer_kwargs).data
+        return self.render(paginator.get_paginated_response(data).data)
+
+
+class BoardListReadView(AsyncReadView):
+    """Async `GET /api/boards/`, see `BoardViewSet.list`."""
+
+    async def read(self, request, user):
+        boards = Board.objects.visible_to(user)
+        stamp = await boards.aaggregate(**list_stamp())
+        etag = list_etag('boards', user.pk, stamp, request)
+        response = not_modified(request, etag)
+        if response is None:
+            response = await self.paginated(IdCursorPagination(), boards, BoardSerializer, request)
+        return set_validators(response, etag)
+
+
+class BoardDetailReadView(AsyncReadView):
+    """Async `GET /api/boards/{id}/`, see `BoardViewSet.retrieve`."""
+
+    async def read(self, request, user, pk):
+        board = await self.get_or_404(Board.objects.all(), pk=pk)
+        if not await ais_member_or_owner(board, user.pk, request):
+            raise exceptions.PermissionDenied()
+        etag = make_etag('board', board.pk, board.version)
+        response = not_modified(request, etag, board.updated_at)
+        if response is None:
+            data = await aget_board_detail(board)
+            if data is None and settings.KANBAN_LEAN_READS:
+                data = await lean.aboard_detail_data(board)
+                await aset_board_detail(board, data)
+            elif data is None:
+                await aprefetch_related_objects([board], *BoardDetailSerializer.get_prefetches())
+                data = BoardDetailSerializer(board, context={'request': request}).data
+                await aset_board_detail(board, data)
+            response = self.render(data)
+        return set_validators(response, etag, board.updated_at)
+
+
+class TaskListReadView(AsyncReadView):
+    """Async task list with the filters, ordering and `?fields=` of `TaskListMixin`."""
+    filter_backends = [TaskFilter, TaskOrderingFilter]
+
+    def get_queryset(self, user):
+        raise NotImplementedError
+
+    async def read(self, request, user):
+        fields = requested_fields(request)
+        tasks = TaskFilter().filter_queryset(request, self.get_queryset(user), self)
+        if settings.KANBAN_LEAN_READS:
+            paginator = IdCursorPagination()
+            rows = await paginator.apaginate_queryset(
+                lean.task_values(tasks, fields, TaskOrderingFilter().get_ordering(request, tasks, self)), request, self)
+            data = lean.task_data(rows, await lean.ausers_by_id(lean.user_ids(rows)), fields)
+            return self.render(paginator.get_paginated_response(data).data)
+        if fields is not None:
+            tasks = sparse_queryset(tasks, fields, TaskOrderingFilter().get_ordering(request, tasks, self))
+        return await self.paginated(IdCursorPagination(), tasks, TaskSerializer, request, fields=fields)
+
+
+class AssignedTaskReadView(TaskListReadView):
+    """Async `GET /api/tasks/assigned-to-me/`."""
+
+    def get_queryset(self, user):
+        return Task.objects.filter(assignee=user).select_related('assignee', 'reviewer')
+
+
+class ReviewingTaskReadView(TaskListReadView):
+    """Async `GET /api/tasks/reviewing/`."""
+
+    def get_queryset(self, user):
+        return Task.objects.filter(reviewer=user).select_related('assignee', 'reviewer')
+
+
+class CommentListReadView(AsyncReadView):
+    """Async `GET /api/tasks/{task_id}/comments/`, see `CommentsViewSet.list`."""
+
+    async def read(self, request, user, task_pk):
+        task = await self.get_or_404(Task.objects.select_related('board'), pk=task_pk)
+        if not await ais_member_or_owner(task.board, user.pk, request):
+            raise exceptions.PermissionDenied()
+        etag = make_etag('comments', task.pk, task.version, request=request)
+        response = not_modified(request, etag, task.updated_at)
+        if response is None:
+            comments = Comment.objects.filter(task=task).select_related('author')
+            response = await self.paginated(CommentCursorPagination(), comments, CommentSerializer, request)
+        return set_validators(response, etag, task.updated_at)
+
+
+def read_async(read_view, write_view):
+    """
+    One URL, two implementations: GET/HEAD go to the async read view,
+    every other method to the (sync) DRF view through the sync bridge.
+    """
+    write_view = sync_to_async(write_view)
+
+    async def view(request, *args, **kwargs):
+        if request.method in ('GET', 'HEAD'):
+            return await read_view(request, *args, **kwargs)
+        return await write_view(request, *args, **kwargs)
+
+    # DRF views are CSRF-exempt (token auth); keep it that way for the writes.
+    view.csrf_exempt = True
+    return view
@@ -0,0 +1,59 @@
+"""
+Helpers for conditional GET on kanban endpoints.
+
+Validators are derived from the version stamps maintained by
+`kanban_app.versions`, so answering a conditional request needs at most one
+cheap lookup and never touches serializers or nested queries.
+"""
+import hashlib
+
+from django.db.models import Count, Max, Sum
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def make_etag(*parts, request=None):
+    """
+    Build a quoted strong ETag from version parts. For list endpoints pass the
+    request so the query string (cursor, page size) is part of the tag.
+    """
+    value = '-'.join(str(part) for part in parts)
+    if request is not None and request.META.get('QUERY_STRING'):
+        query = hashlib.md5(request.META['QUERY_STRING'].encode()).hexdigest()[:12]
+        value = f'{value}-{query}'
+    return f'"{value}"'
+
+
+def list_stamp():
+    """Aggregates that change whenever a row of a versioned list is added, removed or changed."""
+    return {'count': Count('id'), 'versions': Sum('version'), 'latest': Max('updated_at')}
+
+
+def list_etag(prefix, owner_id, stamp, request):
+    """ETag for a list from the `list_stamp()` aggregate of its queryset."""
+    latest = stamp['latest'].timestamp() if stamp['latest'] else 0
+    return make_etag(prefix, owner_id, stamp['count'], stamp['versions'] or 0, latest, request=request)
+
+
+def not_modified(request, etag=None, last_modified=None):
+    """
+    Return a 304 response if the client's validators still match, else None.
+    The ETag takes precedence: Last-Modified has one-second resolution, so
+    `If-Modified-Since` is only honoured for responses without an ETag.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return None
+    timestamp = int(last_modified.timestamp()) if last_modified and not etag else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is not None and response.status_code == 304:
+        return response
+    return None
+
+
+def set_validators(response, etag=None, last_modified=None):
+    """Attach ETag/Last-Modified headers to a successful response."""
+    if etag:
+        response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
@@ -0,0 +1,137 @@
+"""
+Query parameters of the task list endpoints: filters, `?ordering=` and
+`?fields=` (sparse fieldsets). Everything here only builds querysets, so the
+sync DRF views and the async read views share it.
+"""
+from datetime import date
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+from django.db.models import Q
+from django.utils import timezone
+from kanban_app.models import Task
+
+STATUSES = [value for value, _ in Task._meta.get_field('status').choices]
+PRIORITIES = [value for value, _ in Task._meta.get_field('priority').choices]
+
+# Output field -> columns to load for it. `assignee`/`reviewer` are joined
+# only when requested; the nested user needs name and email.
+USER_COLUMNS = ('id', 'email', 'first_name', 'last_name')
+SPARSE_COLUMNS = {
+    'id': ('id',),
+    'board': ('board_id',),
+    'title': ('title',),
+    'description': ('description',),
+    'status': ('status',),
+    'priority': ('priority',),
+    'assignee': ('assignee', *(f'assignee__{column}' for column in USER_COLUMNS)),
+    'reviewer': ('reviewer', *(f'reviewer__{column}' for column in USER_COLUMNS)),
+    'due_date': ('due_date',),
+    'comments_count': ('comments_count',),
+}
+
+
+def _id_param(value, name):
+    """A user/board id, or None for `none` (unassigned)."""
+    if value == 'none':
+        return None
+    if not value.isdigit():
+        raise ValidationError({name: ['Must be an id or "none".']})
+    return int(value)
+
+
+def _choice_params(value, name, choices):
+    values = value.split(',')
+    invalid = [item for item in values if item not in choices]
+    if invalid:
+        raise ValidationError({name: [f'Invalid choice(s): {", ".join(invalid)}. Use {", ".join(choices)}.']})
+    return values
+
+
+def _date_param(value, name):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValidationError({name: ['Must be a date (YYYY-MM-DD).']})
+
+
+class TaskFilter(BaseFilterBackend):
+    """
+    `board`, `assignee`, `reviewer` (id or `none`), `status` and `priority`
+    (comma-separated), `due_date_after`/`due_date_before` (inclusive) and
+    `overdue=true|false` (due before today and not done).
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        lookups = {}
+        if 'board' in params:
+            board = _id_param(params['board'], 'board')
+            if board is None:
+                raise ValidationError({'board': ['Must be an id.']})
+            lookups['board_id'] = board
+        for name in ('assignee', 'reviewer'):
+            if name in params:
+                lookups[f'{name}_id'] = _id_param(params[name], name)
+        if 'status' in params:
+            lookups['status__in'] = _choice_params(params['status'], 'status', STATUSES)
+        if 'priority' in params:
+            lookups['priority__in'] = _choice_params(params['priority'], 'priority', PRIORITIES)
+        if 'due_date_after' in params:
+            lookups['due_date__gte'] = _date_param(params['due_date_after'], 'due_date_after')
+        if 'due_date_before' in params:
+            lookups['due_date__lte'] = _date_param(params['due_date_before'], 'due_date_before')
+        queryset = queryset.filter(**lookups)
+
+        overdue = params.get('overdue')
+        if overdue is not None:
+            if overdue not in ('true', 'false'):
+                raise ValidationError({'overdue': ['Must be "true" or "false".']})
+            is_overdue = Q(due_date__lt=timezone.localdate()) & ~Q(status='done')
+            queryset = queryset.filter(is_overdue) if overdue == 'true' else queryset.exclude(is_overdue)
+        return queryset
+
+
+class TaskOrderingFilter(OrderingFilter):
+    """
+    `?ordering=` on non-null columns only, because the cursor paginator keys
+    pages on the first ordering field. `id` is appended so rows with equal
+    values keep a stable order (DRF pages through them with a cursor offset).
+    """
+    ordering_fields = ['id', 'updated_at', 'title']
+
+    def get_default_ordering(self, view):
+        return ['id']
+
+    def get_ordering(self, request, queryset, view):
+        ordering = list(super().get_ordering(request, queryset, view))
+        if ordering[0].lstrip('-') != 'id':
+            ordering.append('-id' if ordering[0].startswith('-') else 'id')
+        return ordering
+
+
+def requested_fields(request):
+    """The `?fields=` names (validated), or None for the full representation."""
+    value = request.query_params.get('fields')
+    if value is None:
+        return None
+    fields = [name for name in value.split(',') if name]
+    invalid = [name for name in fields if name not in SPARSE_COLUMNS]
+    if not fields or invalid:
+        raise ValidationError({'fields': [f'Choose from {", ".join(SPARSE_COLUMNS)}.']})
+    return fields
+
+
+def sparse_queryset(queryset, fields, ordering):
+    """
+    Load only the columns behind `fields` (plus the ordering columns the
+    paginator reads) and join the user tables only for requested users.
+    """
+    columns = {'id', *(field.lstrip('-') for field in ordering)}
+    for field in fields:
+        columns.update(SPARSE_COLUMNS[field])
+    queryset = queryset.select_related(None)
+    related = [name for name in ('assignee', 'reviewer') if name in fields]
+    if related:
+        queryset = queryset.select_related(*related)
+    return queryset.only(*columns)
@@ -0,0 +1,106 @@
+"""
+Lean read path for the large JSON payloads: task lists and board detail.
+
+Tasks are read with `.values()` (no model instances), the users they
+reference are loaded with one query per page into a map, and the response
+dicts are built directly instead of through DRF's per-object field
+machinery. The output is identical to `TaskSerializer` and
+`BoardDetailSerializer` (the tests compare both), so a field added there
+must be added here as well. Used when `KANBAN_LEAN_READS` is on.
+"""
+from django.contrib.auth.models import User
+from kanban_app.models import Task
+
+TASK_FIELDS = ['id', 'board', 'title', 'description', 'status', 'priority',
+               'assignee', 'reviewer', 'due_date', 'comments_count']
+NESTED_TASK_FIELDS = ['id', 'title', 'description', 'status', 'priority',
+                      'assignee', 'reviewer', 'due_date', 'comments_count']
+COLUMNS = {'board': 'board_id', 'assignee': 'assignee_id', 'reviewer': 'reviewer_id'}
+USER_COLUMNS = ('id', 'email', 'first_name', 'last_name')
+
+
+def _user(row):
+    """`UserNestedSerializer` output from (id, email, first_name, last_name)."""
+    user_id, email, first_name, last_name = row
+    return {'id': user_id, 'email': email, 'fullname': f'{first_name} {last_name}'.strip()}
+
+
+def task_values(queryset, fields=None, ordering=()):
+    """`.values()` with the columns behind `fields` plus those the cursor paginator reads."""
+    names = fields or TASK_FIELDS
+    columns = ['id', *(COLUMNS.get(name, name) for name in names), *(field.lstrip('-') for field in ordering)]
+    return queryset.select_related(None).values(*dict.fromkeys(columns))
+
+
+def user_ids(rows):
+    ids = {row.get('assignee_id') for row in rows} | {row.get('reviewer_id') for row in rows}
+    ids.discard(None)
+    return ids
+
+
+def users_by_id(ids):
+    if not ids:
+        return {}
+    return {row[0]: _user(row) for row in User.objects.filter(pk__in=ids).values_list(*USER_COLUMNS)}
+
+
+async def ausers_by_id(ids):
+    if not ids:
+        return {}
+    return {row[0]: _user(row) async for row in User.objects.filter(pk__in=ids).values_list(*USER_COLUMNS)}
+
+
+def task_data(rows, users, fields=None, names=TASK_FIELDS):
+    """Task dicts in serializer field order; `fields` keeps a subset (`?fields=`)."""
+    names = [name for name in names if fields is None or name in fields]
+    data = []
+    for row in rows:
+        item = {}
+        for name in names:
+            if name == 'assignee' or name == 'reviewer':
+                user_id = row[COLUMNS[name]]
+                item[name] = None if user_id is None else users.get(user_id)
+            elif name == 'due_date':
+                due_date = row['due_date']
+                item[name] = None if due_date is None else due_date.isoformat()
+            else:
+                item[name] = row[COLUMNS.get(name, name)]
+        data.append(item)
+    return data
+
+
+def _board_queries(board):
+    # Same filters as the serializer's prefetches, so rows come back in the same order.
+    members = User.objects.filter(boards__in=[board.pk]).values_list(*USER_COLUMNS)
+    tasks = task_values(Task.objects.filter(board__in=[board.pk]), NESTED_TASK_FIELDS)
+    return members, tasks
+
+
+def _board_detail(board, members, tasks, users):
+    return {
+        'id': board.pk,
+        'title': board.title,
+        'owner_id': board.owner_id_id,
+        'members': members,
+        'tasks': task_data(tasks, users, names=NESTED_TASK_FIELDS),
+    }
+
+
+def board_detail_data(board):
+    """`BoardDetailSerializer(board).data` in three queries (members, tasks, non-member users)."""
+    members, tasks = _board_queries(board)
+    members = [_user(row) for row in members]
+    tasks = list(tasks)
+    users = {member['id']: member for member in members}
+    users.update(users_by_id(user_ids(tasks) - users.keys()))
+    return _board_detail(board, members, tasks, users)
+
+
+async def aboard_detail_data(board):
+    """Async counterpart of `board_detail_data`."""
+    members, tasks = _board_queries(board)
+    members = [_user(row) async for row in members]
+    tasks = [row async for row in tasks]
+    users = {member['id']: member for member in members}
+    users.update(await ausers_by_id(user_ids(tasks) - users.keys()))
+    return _board_detail(board, members, tasks, users)
@@ -0,0 +1,36 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class AsyncCursorPaginationMixin:
+    """
+    Adds `apaginate_queryset` for async views: DRF's `paginate_queryset`,
+    run through `sync_to_async` like every async ORM query (the async ORM
+    fetches rows on the sync thread as well). Links and the paginated
+    response come from the regular methods.
+    """
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        return await sync_to_async(self.paginate_queryset)(queryset, request, view)
+
+
+class IdCursorPagination(AsyncCursorPaginationMixin, CursorPagination):
+    """
+    Keyset pagination on the primary key, used for boards and tasks.
+    Page cost is constant at any depth; clients may pick `page_size` up to the configured maximum.
+    """
+    ordering = 'id'
+    page_size = settings.KANBAN_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.KANBAN_MAX_PAGE_SIZE
+
+
+class CommentCursorPagination(IdCursorPagination):
+    """
+    Keyset pagination for comment threads, oldest first.
+    The cursor position is `created_at` only (DRF keys on the first ordering
+    field); `id` just fixes the order of equal timestamps, which DRF pages
+    through with an offset stored in the cursor.
+    """
+    ordering = ('created_at', 'id')
@@ -1,9 +1,17 @@
-from django.contrib.auth.models import User
 from django.shortcuts import get_object_or_404
 from rest_framework.permissions import BasePermission, SAFE_METHODS
+from kanban_app.membership import is_member_or_owner
 from kanban_app.models import Board, Task
 
 
+def _user_id(value):
+    """Parse a user id from request data; None if missing or malformed."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
 class IsBoardOwnerOrMember(BasePermission):
     """Allow read/update for board owner or members; delete only for owner; create for any auth user."""
 
@@ -17,9 +25,9 @@ class IsBoardOwnerOrMember(BasePermission):
         """Check membership/ownership per method semantics."""
         user = request.user
         if request.method in set(SAFE_METHODS) | {'PUT', 'PATCH'}:
-            return obj.owner_id == user or obj.members.filter(pk=user.pk).exists()
+            return is_member_or_owner(obj, user.pk, request)
         if request.method == 'DELETE':
-            return obj.owner_id == user
+            return obj.owner_id_id == user.pk
         return False
 
 
@@ -36,29 +44,24 @@ class IsTaskOwnerOrBoardMember(BasePermission):
             board_id = request.data.get('board')
             if not board_id:
                 return False
-            board = get_object_or_404(Board, pk=board_id)
-            user = request.user
-            return board.members.filter(pk=user.pk).exists() or board.owner_id == user
+            board = get_object_or_404(Board.objects.only('id', 'owner_id'), pk=board_id)
+            return is_member_or_owner(board, request.user.pk, request)
         return True
 
     def has_object_permission(self, request, view, obj: Task):
         """Enforce member/owner for read/update, and creator/owner for delete. Validate assignee/reviewer membership."""
         user = request.user
-        is_member = obj.board.members.filter(
-            pk=user.pk).exists() or obj.board.owner_id == user
+        board = obj.board
         if request.method in SAFE_METHODS or request.method in ('PUT', 'PATCH'):
-            if not is_member:
+            if not is_member_or_owner(board, user.pk, request):
                 return False
             for field in ('assignee_id', 'reviewer_id'):
                 if field in request.data:
-                    u = User.objects.filter(pk=request.data[field]).first()
-                    if not u:
-                        return False
-                    if not (obj.board.members.filter(pk=u.pk).exists() or obj.board.owner_id == u):
+                    if not is_member_or_owner(board, _user_id(request.data[field]), request):
                         return False
             return True
         if request.method == 'DELETE':
-            return request.user == obj.created_by or obj.board.owner_id == request.user
+            return obj.created_by_id == user.pk or board.owner_id_id == user.pk
         return False
 
 
@@ -66,18 +69,19 @@ class IsCommentOwnerOrBoardMember(BasePermission):
     """GET/POST: board members/owner of the task's board; DELETE: only the comment author."""
 
     def has_permission(self, request, view):
-        """For list/create ensure requester is member/owner of the task's board."""
+        """
+        For list/create ensure requester is member/owner of the task's board.
+        The task is resolved through `view.get_task()` so the view reuses it.
+        """
         if request.method in ('GET', 'POST'):
-            task_pk = view.kwargs.get('task_pk')
-            task = get_object_or_404(Task, pk=task_pk)
-            user = request.user
-            return task.board.members.filter(pk=user.pk).exists() or task.board.owner_id == user
+            task = view.get_task()
+            return is_member_or_owner(task.board, request.user.pk, request)
         return True
 
     def has_object_permission(self, request, view, obj):
         """Only the author may delete; safe methods already allowed by has_permission."""
         if request.method == 'DELETE':
-            return obj.author == request.user
+            return obj.author_id == request.user.pk
         if request.method in SAFE_METHODS:
             return True
         return False
@@ -0,0 +1,32 @@
+"""
+JSON renderer backed by orjson when it is installed (`pip install orjson`).
+
+The output decodes to the same values as DRF's compact `JSONRenderer`:
+datetimes, decimals, lazy strings and other non-native values are handed to
+DRF's encoder. Floats may be spelled differently (orjson writes `1e-7` and
+`0.000025` where `json` writes `1e-07` and `2.5e-05`), so the bytes are not
+always identical. Without orjson, or when a client asks for `indent`, it
+falls back to `JSONRenderer`.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+_encoder = JSONEncoder()
+
+
+class FastJSONRenderer(JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        ret = orjson.dumps(data, default=_encoder.default,
+                           option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS)
+        # Escaped by JSONRenderer too: valid JSON, but not valid JavaScript.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -1,6 +1,9 @@
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.db.models import Prefetch
 from rest_framework import serializers
-from kanban_app.models import Board, Task, Comment
+from kanban_app.membership import is_member_or_owner
+from kanban_app.models import Board, BoardChange, Task, Comment, ImportJob
 
 
 class UserNestedSerializer(serializers.ModelSerializer):
@@ -20,9 +23,8 @@ class UserNestedSerializer(serializers.ModelSerializer):
 class TaskNestedSerializer(serializers.ModelSerializer):
     """
     Compact task representation for embedding in board detail responses.
-    Includes assignee/reviewer as nested users and a comments counter.
+    Includes assignee/reviewer as nested users and the stored comments counter.
     """
-    comments_count = serializers.SerializerMethodField()
     assignee = UserNestedSerializer(read_only=True)
     reviewer = UserNestedSerializer(read_only=True)
 
@@ -32,22 +34,15 @@ class TaskNestedSerializer(serializers.ModelSerializer):
             'id', 'title', 'description', 'status', 'priority',
             'assignee', 'reviewer', 'due_date', 'comments_count'
         ]
-        read_only_fields = ['id']
-
-    def get_comments_count(self, obj):
-        """Return number of comments attached to this task."""
-        return obj.comments.count()
+        read_only_fields = ['id', 'comments_count']
 
 
 class BoardSerializer(serializers.ModelSerializer):
     """
     Summary serializer for boards used in list views.
-    Provides aggregated counts for members, tickets, to-do tasks, and high-priority tasks.
+    Provides counts for members, tickets, to-do tasks, and high-priority tasks,
+    read from the denormalized counter columns on Board.
     """
-    member_count = serializers.SerializerMethodField()
-    ticket_count = serializers.SerializerMethodField()
-    tasks_to_do_count = serializers.SerializerMethodField()
-    tasks_high_prio_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Board
@@ -55,22 +50,9 @@ class BoardSerializer(serializers.ModelSerializer):
             'id', 'title', 'member_count', 'ticket_count',
             'tasks_to_do_count', 'tasks_high_prio_count', 'owner_id'
         ]
-
-    def get_member_count(self, obj):
-        """Return number of members on the board."""
-        return obj.members.count()
-
-    def get_ticket_count(self, obj):
-        """Return total number of tasks on the board."""
-        return Task.objects.filter(board=obj).count()
-
-    def get_tasks_to_do_count(self, obj):
-        """Return number of tasks in 'todo' status on the board."""
-        return Task.objects.filter(board=obj, status='todo').count()
-
-    def get_tasks_high_prio_count(self, obj):
-        """Return number of high-priority tasks on the board."""
-        return Task.objects.filter(board=obj, priority='high').count()
+        read_only_fields = [
+            'member_count', 'ticket_count', 'tasks_to_do_count', 'tasks_high_prio_count'
+        ]
 
 
 class BoardCreateSerializer(serializers.ModelSerializer):
@@ -137,8 +119,31 @@ class BoardDetailSerializer(BoardSerializer):
         fields = ['id', 'title', 'owner_id', 'members', 'tasks']
         read_only_fields = ['id']
 
+    @staticmethod
+    def get_prefetches():
+        """
+        Prefetches for serializing a board: members and tasks, with task users
+        joined, so the nested payload is built in a fixed number of queries.
+        """
+        tasks = Task.objects.select_related('assignee', 'reviewer')
+        return ['members', Prefetch('tasks', queryset=tasks)]
+
 
-class TaskSerializer(serializers.ModelSerializer):
+class SparseFieldsetMixin:
+    """
+    Accepts `fields=[...]` to keep only those readable fields in the output
+    (write-only fields stay). Used for `?fields=` on the task lists.
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                if not self.fields[name].write_only:
+                    self.fields.pop(name)
+
+
+class TaskSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Full task serializer used for list/retrieve/create.
     Accepts `assignee_id` and `reviewer_id` to set related users,
@@ -164,8 +169,6 @@ class TaskSerializer(serializers.ModelSerializer):
     )
     reviewer = UserNestedSerializer(read_only=True)
 
-    comments_count = serializers.SerializerMethodField()
-
     class Meta:
         model = Task
         fields = [
@@ -175,10 +178,6 @@ class TaskSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'comments_count']
 
-    def get_comments_count(self, obj):
-        """Return number of comments attached to this task."""
-        return obj.comments.count()
-
     def validate(self, attrs):
         """
         Prevent board changes on updates; ensure assignee/reviewer are members (or owner) of the board.
@@ -189,12 +188,12 @@ class TaskSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError({'board': 'Changing board is not allowed.'})
 
         board = attrs.get('board') or (self.instance.board if self.instance else None)
+        request = self.context.get('request')
 
         for field in ('assignee', 'reviewer'):
             user = attrs.get(field)
             if user and board:
-                is_member = board.members.filter(pk=user.pk).exists() or board.owner_id == user
-                if not is_member:
+                if not is_member_or_owner(board, user.pk, request):
                     raise serializers.ValidationError({f'{field}_id': 'User must be member or owner of the board.'})
         return attrs
 
@@ -231,3 +230,111 @@ class CommentSerializer(serializers.ModelSerializer):
     def get_author(self, obj):
         """Return the author's full name (fallback to username can be handled outside if needed)."""
         return obj.author.get_full_name()
+
+
+class BoardChangeSerializer(serializers.Serializer):
+    """
+    One collapsed change log entry. `data` is the current state of the object,
+    taken from context['objects'] (loaded in bulk by the view); null once deleted.
+    """
+    seq = serializers.IntegerField()
+    type = serializers.CharField(source='kind')
+    id = serializers.IntegerField(source='object_id')
+    task = serializers.IntegerField(source='task_id')
+    action = serializers.CharField()
+    data = serializers.SerializerMethodField()
+
+    def get_data(self, entry):
+        """Serialize tasks like the board detail and comments like the comment thread."""
+        obj = self.context['objects'].get((entry['kind'], entry['object_id']))
+        if obj is None or entry['action'] == BoardChange.DELETED:
+            return None
+        if entry['kind'] == BoardChange.TASK:
+            return TaskNestedSerializer(obj).data
+        return CommentSerializer(obj).data
+
+
+class BulkTaskCreateItemSerializer(serializers.Serializer):
+    """
+    One task to create in a bulk request. Relations are plain ids here;
+    boards and users are checked for the whole batch at once (see `kanban_app.bulk`).
+    """
+    board = serializers.IntegerField()
+    title = serializers.CharField(max_length=100)
+    description = serializers.CharField(required=False, allow_blank=True, default='')
+    status = serializers.ChoiceField(choices=Task._meta.get_field('status').choices, default='to-do')
+    priority = serializers.ChoiceField(choices=Task._meta.get_field('priority').choices, default='medium')
+    assignee_id = serializers.IntegerField(required=False, allow_null=True)
+    reviewer_id = serializers.IntegerField(required=False, allow_null=True)
+    due_date = serializers.DateField(required=False, allow_null=True)
+
+
+class BulkTaskUpdateItemSerializer(serializers.Serializer):
+    """
+    One task update in a bulk request: `id` plus any of the mutable workflow fields.
+    """
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=Task._meta.get_field('status').choices, required=False)
+    priority = serializers.ChoiceField(choices=Task._meta.get_field('priority').choices, required=False)
+    assignee_id = serializers.IntegerField(required=False, allow_null=True)
+    reviewer_id = serializers.IntegerField(required=False, allow_null=True)
+    due_date = serializers.DateField(required=False, allow_null=True)
+
+
+class BulkTaskSerializer(serializers.Serializer):
+    """
+    Envelope of a bulk task request. `atomic` (default true) rejects the whole
+    batch if any item is invalid; otherwise valid items are applied and
+    invalid ones reported.
+    """
+    atomic = serializers.BooleanField(default=True)
+    create = serializers.ListField(child=serializers.DictField(), required=False, default=list)
+    update = serializers.ListField(child=serializers.DictField(), required=False, default=list)
+    delete = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+
+    def validate(self, attrs):
+        total = len(attrs['create']) + len(attrs['update']) + len(attrs['delete'])
+        limit = settings.KANBAN_BULK_MAX_ITEMS
+        if total == 0:
+            raise serializers.ValidationError('Provide at least one of "create", "update" or "delete".')
+        if total > limit:
+            raise serializers.ValidationError(f'At most {limit} items per request.')
+        return attrs
+
+
+class ImportUploadSerializer(serializers.Serializer):
+    """
+    Upload for POST /api/imports/: the file, its format (from the file name
+    if omitted) and, for CSV, the board to import tasks into.
+    """
+    file = serializers.FileField()
+    format = serializers.ChoiceField(choices=[ImportJob.NDJSON, ImportJob.CSV], required=False)
+    board = serializers.PrimaryKeyRelatedField(queryset=Board.objects.all(), required=False)
+
+    def validate(self, attrs):
+        if 'format' not in attrs:
+            name = attrs['file'].name.lower().removesuffix('.gz')
+            attrs['format'] = ImportJob.CSV if name.endswith('.csv') else ImportJob.NDJSON
+        if attrs['format'] == ImportJob.CSV and 'board' not in attrs:
+            raise serializers.ValidationError({'board': ['Required for CSV imports.']})
+        board = attrs.get('board')
+        if board and not is_member_or_owner(board, self.context['request'].user.pk, self.context['request']):
+            raise serializers.ValidationError({'board': ['Board not found or not accessible.']})
+        return attrs
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    """Import job progress; `rows_per_second` is measured over the committed chunks."""
+    rows_per_second = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ImportJob
+        fields = [
+            'id', 'format', 'status', 'board', 'position', 'boards_created', 'tasks_created',
+            'comments_created', 'rows_skipped', 'errors', 'seconds', 'rows_per_second',
+            'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+
+    def get_rows_per_second(self, obj):
+        return round(obj.position / obj.seconds) if obj.seconds else None
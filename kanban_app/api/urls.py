@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework import routers
 from rest_framework_nested import routers as nested_routers
@@ -6,13 +7,16 @@ from .views import (
     TaskViewSet,
     CommentsViewSet,
     AssignedTaskList,
-    ReviewingTaskList
+    ReviewingTaskList,
+    TaskSearchView,
+    ImportJobViewSet
 )
 
 # Main router for boards and tasks
 router = routers.SimpleRouter()
 router.register(r'boards', BoardViewSet)
 router.register(r'tasks', TaskViewSet)
+router.register(r'imports', ImportJobViewSet, basename='imports')
 
 # Nested router for task comments
 tasks_router = nested_routers.NestedSimpleRouter(
@@ -23,8 +27,31 @@ urlpatterns = [
     # Custom task views for assignee and reviewer
     path('tasks/assigned-to-me/', AssignedTaskList.as_view(), name='assigned-tasks'),
     path('tasks/reviewing/', ReviewingTaskList.as_view(), name='reviewing-tasks'),
+    path('tasks/search/', TaskSearchView.as_view(), name='task-search'),
 
     # Standard routes from routers
     path('', include(router.urls)),
     path('', include(tasks_router.urls)),
 ]
+
+if settings.KANBAN_ASYNC_READS:
+    from . import async_views
+
+    # Same URLs and names as above; GET/HEAD served by the async read views (see async_views).
+    urlpatterns = [
+        path('boards/', async_views.read_async(
+            async_views.BoardListReadView.as_view(),
+            BoardViewSet.as_view({'get': 'list', 'post': 'create'})), name='board-list'),
+        path('boards/<int:pk>/', async_views.read_async(
+            async_views.BoardDetailReadView.as_view(),
+            BoardViewSet.as_view({'get': 'retrieve', 'put': 'update', 'patch': 'partial_update',
+                                  'delete': 'destroy'})), name='board-detail'),
+        path('tasks/assigned-to-me/', async_views.read_async(
+            async_views.AssignedTaskReadView.as_view(), AssignedTaskList.as_view()), name='assigned-tasks'),
+        path('tasks/reviewing/', async_views.read_async(
+            async_views.ReviewingTaskReadView.as_view(), ReviewingTaskList.as_view()), name='reviewing-tasks'),
+        path('tasks/<int:task_pk>/comments/', async_views.read_async(
+            async_views.CommentListReadView.as_view(),
+            CommentsViewSet.as_view({'get': 'list', 'post': 'create'})), name='task-comments-list'),
+        *urlpatterns,
+    ]
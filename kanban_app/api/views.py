@@ -1,8 +1,26 @@
-from rest_framework import generics, status, viewsets
+import csv
+import gzip
+import zlib
+
+from rest_framework import generics, mixins, status, viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from django.conf import settings
+from django.db.models import prefetch_related_objects
+from django.db import DatabaseError, transaction
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from kanban_app.models import Board, Task, Comment
+from kanban_app.bulk import BulkTaskOperation
+from kanban_app.changes import changes_since
+from kanban_app.counters import COUNTER_FIELDS
+from kanban_app.export import aiterate, buffered, export_lines, gzip_stream
+from kanban_app.imports import Importer, read_rows
+from kanban_app.models import Board, BoardChange, Task, Comment, ImportJob
+from kanban_app.response_cache import get_board_detail, set_board_detail
+from kanban_app.search import search_tasks
 from .serializers import (
     BoardSerializer,
     BoardDetailSerializer,
@@ -10,8 +28,16 @@ from .serializers import (
     BoardPartialUpdateSerializer,
     TaskSerializer,
     TaskPartialUpdateSerializer,
+    BulkTaskSerializer,
+    BoardChangeSerializer,
+    ImportUploadSerializer,
+    ImportJobSerializer,
     CommentSerializer
 )
+from . import lean
+from .filters import TaskFilter, TaskOrderingFilter, requested_fields, sparse_queryset
+from .conditional import list_etag, list_stamp, make_etag, not_modified, set_validators
+from .pagination import IdCursorPagination, CommentCursorPagination
 from .permissions import (
     IsBoardOwnerOrMember,
     IsTaskOwnerOrBoardMember,
@@ -19,6 +45,60 @@ from .permissions import (
 )
 
 
+# Truncated or corrupt uploads (BadGzipFile is an OSError, so it is listed before it is caught as one).
+UNREADABLE_INPUT = (UnicodeDecodeError, csv.Error, EOFError, gzip.BadGzipFile, zlib.error)
+
+
+def int_query_param(request, name, default):
+    """Non-negative integer query parameter, or 400."""
+    value = request.query_params.get(name)
+    if value is None:
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        value = -1
+    if value < 0:
+        raise ValidationError({name: ['Must be a non-negative integer.']})
+    return value
+
+
+class TaskListMixin:
+    """
+    Filters, `?ordering=` and `?fields=` for task lists (see `api/filters.py`).
+    With `fields`, only the matching columns are loaded and serialized.
+    With `KANBAN_LEAN_READS`, pages are built from `.values()` rows (see `api/lean.py`).
+    """
+    filter_backends = [TaskFilter, TaskOrderingFilter]
+
+    def filter_queryset(self, queryset):
+        """The parameters narrow lists only, never detail lookups."""
+        if getattr(self, 'action', 'list') != 'list':
+            return queryset
+        return super().filter_queryset(queryset)
+
+    def list(self, request, *args, **kwargs):
+        fields = requested_fields(request)
+        queryset = self.filter_queryset(self.get_queryset())
+        if settings.KANBAN_LEAN_READS:
+            return self.lean_list(queryset, fields)
+        if fields is not None:
+            ordering = TaskOrderingFilter().get_ordering(request, queryset, self)
+            queryset = sparse_queryset(queryset, fields, ordering)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True, fields=fields).data)
+        return Response(self.get_serializer(queryset, many=True, fields=fields).data)
+
+    def lean_list(self, queryset, fields):
+        ordering = TaskOrderingFilter().get_ordering(self.request, queryset, self)
+        queryset = lean.task_values(queryset, fields, ordering)
+        page = self.paginate_queryset(queryset)
+        rows = list(queryset) if page is None else page
+        data = lean.task_data(rows, lean.users_by_id(lean.user_ids(rows)), fields)
+        return Response(data) if page is None else self.get_paginated_response(data)
+
+
 class BoardViewSet(viewsets.ModelViewSet):
     """
     Handles CRUD operations for Kanban boards.
@@ -26,6 +106,7 @@ class BoardViewSet(viewsets.ModelViewSet):
     queryset = Board.objects.all()
     serializer_class = BoardSerializer
     permission_classes = [IsAuthenticated, IsBoardOwnerOrMember]
+    pagination_class = IdCursorPagination
 
     detail_serializer_class = BoardDetailSerializer
     partial_update_serializer_class = BoardPartialUpdateSerializer
@@ -36,10 +117,7 @@ class BoardViewSet(viewsets.ModelViewSet):
         Return boards where the current user is either owner or member.
         Using OR + distinct() avoids backend-specific UNION quirks.
         """
-        user = self.request.user
-        qs_owner  = Board.objects.filter(owner_id=user)
-        qs_member = Board.objects.filter(members=user)
-        return (qs_owner | qs_member).distinct()
+        return Board.objects.visible_to(self.request.user)
 
     def get_object(self):
         """
@@ -49,6 +127,95 @@ class BoardViewSet(viewsets.ModelViewSet):
         self.check_object_permissions(self.request, obj)
         return obj
 
+    def list(self, request, *args, **kwargs):
+        """
+        Lists the user's boards; answers 304 if none of them changed since the client's ETag.
+        """
+        stamp = self.get_queryset().aggregate(**list_stamp())
+        etag = list_etag('boards', request.user.pk, stamp, request)
+        response = not_modified(request, etag)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        return set_validators(response, etag)
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Returns the nested board. The board version is checked against the
+        client's validators, then against the shared payload cache, before
+        members and tasks are loaded.
+        """
+        board = self.get_object()
+        etag = make_etag('board', board.pk, board.version)
+        response = not_modified(request, etag, board.updated_at)
+        if response is None:
+            data = get_board_detail(board)
+            if data is None and settings.KANBAN_LEAN_READS:
+                data = lean.board_detail_data(board)
+                set_board_detail(board, data)
+            elif data is None:
+                prefetch_related_objects([board], *BoardDetailSerializer.get_prefetches())
+                data = self.get_serializer(board).data
+                set_board_detail(board, data)
+            response = Response(data)
+        return set_validators(response, etag, board.updated_at)
+
+    @action(detail=True, methods=['get'])
+    def export(self, request, pk=None):
+        """
+        Streams the board with all tasks and comments as NDJSON (see
+        `kanban_app.export`); `?gzip=1` compresses the stream. Served over
+        ASGI, the stream is async so chunks are still sent as they are read.
+        """
+        board = self.get_object()
+        if request.query_params.get('gzip') in ('1', 'true'):
+            content, content_type, filename = gzip_stream(export_lines(board)), 'application/gzip', 'ndjson.gz'
+        else:
+            content, content_type, filename = buffered(export_lines(board)), 'application/x-ndjson', 'ndjson'
+        if isinstance(request._request, ASGIRequest):
+            content = aiterate(content)
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="board-{board.pk}.{filename}"'
+        return response
+
+    @action(detail=True, methods=['get'])
+    def changes(self, request, pk=None):
+        """
+        Task and comment changes on the board after `?since=<cursor>`, one entry
+        per object with its current data. Without a cursor, or with one older
+        than the compacted log, answers `reset: true` with the current cursor;
+        the client reloads the board and continues from there.
+        """
+        board = self.get_object()
+        since = int_query_param(request, 'since', None)
+        limit = min(int_query_param(request, 'limit', settings.KANBAN_CHANGES_LIMIT), settings.KANBAN_CHANGES_LIMIT)
+        if since is None or since < board.change_log_start:
+            return Response({'cursor': board.version, 'reset': True, 'has_more': False, 'changes': []})
+
+        entries, cursor, has_more = changes_since(board, since, max(limit, 1))
+        objects = self.get_changed_objects(board, entries)
+        for entry in entries:
+            if (entry['kind'], entry['object_id']) not in objects:
+                entry['action'] = BoardChange.DELETED
+        serializer = BoardChangeSerializer(entries, many=True, context={'objects': objects})
+        return Response({'cursor': cursor, 'reset': False, 'has_more': has_more, 'changes': serializer.data})
+
+    def get_changed_objects(self, board, entries):
+        """
+        Current tasks and comments named by the entries, keyed by (kind, id),
+        in one query per kind. Objects no longer on this board are left out.
+        """
+        ids = {BoardChange.TASK: [], BoardChange.COMMENT: []}
+        for entry in entries:
+            ids[entry['kind']].append(entry['object_id'])
+        objects = {}
+        if ids[BoardChange.TASK]:
+            tasks = Task.objects.filter(pk__in=ids[BoardChange.TASK], board=board).select_related('assignee', 'reviewer')
+            objects.update(((BoardChange.TASK, task.pk), task) for task in tasks)
+        if ids[BoardChange.COMMENT]:
+            comments = Comment.objects.filter(pk__in=ids[BoardChange.COMMENT], task__board=board).select_related('author')
+            objects.update(((BoardChange.COMMENT, comment.pk), comment) for comment in comments)
+        return objects
+
     def get_serializer_class(self):
         """
         Returns the appropriate serializer depending on the action.
@@ -67,20 +234,39 @@ class BoardViewSet(viewsets.ModelViewSet):
         """
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        board = serializer.save(owner_id=request.user)
+        with transaction.atomic():
+            board = serializer.save(owner_id=request.user)
+        board.refresh_from_db(fields=COUNTER_FIELDS)
         output = BoardSerializer(board, context={'request': request})
         return Response(output.data, status=status.HTTP_201_CREATED)
 
+    def perform_update(self, serializer):
+        """
+        Saves title/member changes together with the member counter update.
+        """
+        with transaction.atomic():
+            serializer.save()
+
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(TaskListMixin, viewsets.ModelViewSet):
     """
     Handles CRUD operations for tasks.
     """
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated, IsTaskOwnerOrBoardMember]
+    pagination_class = IdCursorPagination
     partial_update_serializer_class = TaskPartialUpdateSerializer
 
+    def get_queryset(self):
+        """
+        The list holds tasks of the user's boards only; detail lookups keep
+        all tasks so IsTaskOwnerOrBoardMember answers 403 rather than 404.
+        """
+        if self.action == 'list':
+            return Task.objects.filter(board__in=Board.objects.visible_to(self.request.user))
+        return super().get_queryset()
+
     def get_serializer_class(self):
         """
         Returns the appropriate serializer depending on the action.
@@ -89,31 +275,103 @@ class TaskViewSet(viewsets.ModelViewSet):
             return self.partial_update_serializer_class
         return super().get_serializer_class()
 
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Returns the task, or 304 if its version matches the client's validators.
+        """
+        task = self.get_object()
+        etag = make_etag('task', task.pk, task.version)
+        response = not_modified(request, etag, task.updated_at)
+        if response is None:
+            response = Response(self.get_serializer(task).data)
+        return set_validators(response, etag, task.updated_at)
+
     def perform_create(self, serializer):
         """
         Saves the task with the current user as the creator.
+        Board counters are updated in the same transaction.
+        """
+        with transaction.atomic():
+            serializer.save(created_by=self.request.user)
+
+    def perform_update(self, serializer):
+        """
+        Saves the task and moves it between board counters atomically.
+        The row is reloaded under a lock, so concurrent updates move the
+        counters from the task's current status/priority, not a stale one.
+        """
+        with transaction.atomic():
+            serializer.instance = Task.objects.select_for_update().get(pk=serializer.instance.pk)
+            serializer.save()
+
+    def perform_destroy(self, instance):
+        """
+        Deletes the task and decrements its board counters atomically.
+        """
+        with transaction.atomic():
+            instance.delete()
+
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated],
+            serializer_class=BulkTaskSerializer)
+    def bulk(self, request):
         """
-        serializer.save(created_by=self.request.user)
+        Creates, updates and deletes many tasks in one transaction.
+        Access is checked per item against the whole batch (see `kanban_app.bulk`).
+        Atomic requests with invalid items return 400 and write nothing.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result, has_errors = BulkTaskOperation(request, serializer.validated_data).run()
+        failed = has_errors and serializer.validated_data['atomic']
+        return Response(result, status=status.HTTP_400_BAD_REQUEST if failed else status.HTTP_200_OK)
 
 
-class AssignedTaskList(generics.ListAPIView):
+class AssignedTaskList(TaskListMixin, generics.ListAPIView):
     """
     Lists all tasks assigned to the current user.
     """
     serializer_class = TaskSerializer
+    pagination_class = IdCursorPagination
 
     def get_queryset(self):
-        return Task.objects.filter(assignee=self.request.user)
+        return Task.objects.filter(assignee=self.request.user).select_related('assignee', 'reviewer')
 
 
-class ReviewingTaskList(generics.ListAPIView):
+class ReviewingTaskList(TaskListMixin, generics.ListAPIView):
     """
     Lists all tasks where the current user is reviewer.
     """
     serializer_class = TaskSerializer
+    pagination_class = IdCursorPagination
 
     def get_queryset(self):
-        return Task.objects.filter(reviewer=self.request.user)
+        return Task.objects.filter(reviewer=self.request.user).select_related('assignee', 'reviewer')
+
+
+class TaskSearchView(generics.GenericAPIView):
+    """
+    Full-text search over title, description and comments of the tasks on
+    the user's boards (optionally one `?board=`), best match first.
+    """
+    serializer_class = TaskSerializer
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q': ['This field is required.']})
+        limit = min(int_query_param(request, 'limit', settings.KANBAN_SEARCH_LIMIT), settings.KANBAN_SEARCH_MAX_LIMIT)
+        boards = Board.objects.visible_to(request.user)
+        board_id = int_query_param(request, 'board', None)
+        if board_id is not None:
+            boards = boards.filter(pk=board_id)
+
+        hits = search_tasks(query, boards.values_list('pk', flat=True), max(limit, 1))
+        tasks = Task.objects.select_related('assignee', 'reviewer').in_bulk([task_id for task_id, _ in hits])
+        results = [
+            {**self.get_serializer(tasks[task_id]).data, 'score': round(score, 4)}
+            for task_id, score in hits if task_id in tasks
+        ]
+        return Response({'count': len(results), 'results': results})
 
 
 class CommentsViewSet(viewsets.ModelViewSet):
@@ -123,23 +381,92 @@ class CommentsViewSet(viewsets.ModelViewSet):
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticated, IsCommentOwnerOrBoardMember]
+    pagination_class = CommentCursorPagination
 
-    def _get_task(self):
+    def get_task(self):
         """
-        Resolve task from nested URL, or raise 404 early.
+        Resolve task (with its board) from nested URL, or raise 404 early.
+        Loaded once per request and shared with IsCommentOwnerOrBoardMember.
         """
-        return get_object_or_404(Task, pk=self.kwargs['task_pk'])
+        if not hasattr(self, '_task'):
+            self._task = get_object_or_404(
+                Task.objects.select_related('board'), pk=self.kwargs['task_pk'])
+        return self._task
 
     def get_queryset(self):
         """
-        Return all comments for the given task. Missing task → 404.
+        Return all comments for the given task, authors joined. Missing task → 404.
         """
-        task = self._get_task()
-        return Comment.objects.filter(task=task)
+        task = self.get_task()
+        return Comment.objects.filter(task=task).select_related('author')
+
+    def list(self, request, *args, **kwargs):
+        """
+        Lists the thread; answers 304 from the task version (already loaded
+        by the permission check) without querying comments.
+        """
+        task = self.get_task()
+        etag = make_etag('comments', task.pk, task.version, request=request)
+        response = not_modified(request, etag, task.updated_at)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        return set_validators(response, etag, task.updated_at)
 
     def perform_create(self, serializer):
         """
         Create a comment bound to the given task and current user.
+        Counted on the task in the same transaction.
+        """
+        task = self.get_task()
+        with transaction.atomic():
+            serializer.save(task=task, author=self.request.user)
+
+    def perform_destroy(self, instance):
+        """
+        Delete the comment and uncount it on its task atomically.
+        """
+        with transaction.atomic():
+            instance.delete()
+
+
+class ImportJobViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """
+    Bulk imports of the current user (see `kanban_app.imports`). POST uploads
+    an NDJSON or CSV file (optionally gzipped) and runs the import in the
+    request; `resume` continues a failed job from its last committed chunk.
+    """
+    serializer_class = ImportJobSerializer
+    pagination_class = IdCursorPagination
+
+    def get_queryset(self):
+        return ImportJob.objects.filter(created_by=self.request.user)
+
+    def create(self, request):
+        upload = ImportUploadSerializer(data=request.data, context={'request': request})
+        upload.is_valid(raise_exception=True)
+        job = ImportJob.objects.create(
+            created_by=request.user, format=upload.validated_data['format'], board=upload.validated_data.get('board'))
+        return self.run_import(job, upload.validated_data['file'], status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['post'])
+    def resume(self, request, pk=None):
+        """Re-upload the same file to continue after the last committed chunk."""
+        job = self.get_object()
+        if job.status == ImportJob.DONE:
+            raise ValidationError({'status': ['This import has already finished.']})
+        if 'file' not in request.FILES:
+            raise ValidationError({'file': ['No file was submitted.']})
+        return self.run_import(job, request.FILES['file'], status.HTTP_200_OK)
+
+    def run_import(self, job, upload, status_code):
+        """
+        Unreadable input (400) and database or I/O errors (500) leave the job
+        `failed` with the error listed; the response body is the job either way.
         """
-        task = self._get_task()
-        serializer.save(task=task, author=self.request.user)
+        try:
+            Importer(job).run(read_rows(upload.file, job.format))
+        except UNREADABLE_INPUT:
+            status_code = status.HTTP_400_BAD_REQUEST
+        except (DatabaseError, OSError):
+            status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+        return Response(self.get_serializer(job).data, status=status_code)
@@ -0,0 +1,119 @@
+"""
+ASGI WebSocket endpoint that pushes board events to members:
+
+    ws(s)://<host>/ws/boards/<board_id>/?token=<auth token>
+
+The token is the DRF auth token used by the REST API (browsers cannot set
+headers on WebSocket requests, so it is read from the query string; an
+`Authorization: Token <key>` header works as well). Events are JSON texts,
+see `kanban_app.realtime`. Clients that receive `resync` re-read the change
+feed from their last cursor.
+"""
+import asyncio
+import re
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from rest_framework.exceptions import AuthenticationFailed
+from auth_app.api.authentication import CachedTokenAuthentication
+from kanban_app.membership import is_member_or_owner
+from kanban_app.models import Board
+from kanban_app.realtime import broker
+
+PATH = re.compile(r'^/ws/boards/(?P<board_id>\d+)/$')
+
+CLOSE_NORMAL = 1000
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_FORBIDDEN = 4403
+CLOSE_NOT_FOUND = 4404
+
+
+def get_token(scope):
+    """Token key from `?token=` or an `Authorization: Token <key>` header."""
+    query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+    if query.get('token'):
+        return query['token'][0]
+    for name, value in scope.get('headers', []):
+        if name == b'authorization':
+            parts = value.decode('latin-1').split()
+            if len(parts) == 2 and parts[0].lower() == 'token':
+                return parts[1]
+    return None
+
+
+def get_board(board_id):
+    return Board.objects.only('id', 'owner_id').filter(pk=board_id).first()
+
+
+def may_read(user_id, board_id):
+    """True if the board exists and the user owns it or is a member."""
+    board = get_board(board_id)
+    return board is not None and is_member_or_owner(board, user_id)
+
+
+def authorize(key, board_id):
+    """Return (user_id, None) if the token may read the board, else (None, close code)."""
+    if not key:
+        return None, CLOSE_UNAUTHORIZED
+    try:
+        user, _ = CachedTokenAuthentication().authenticate_credentials(key)
+    except AuthenticationFailed:
+        return None, CLOSE_UNAUTHORIZED
+    board = get_board(board_id)
+    if board is None:
+        return None, CLOSE_NOT_FOUND
+    if not is_member_or_owner(board, user.pk):
+        return None, CLOSE_FORBIDDEN
+    return user.pk, None
+
+
+async def board_socket(scope, receive, send):
+    """ASGI application for `websocket` scopes."""
+    message = await receive()
+    if message['type'] != 'websocket.connect':
+        return
+    match = PATH.match(scope['path'])
+    if match is None:
+        await send({'type': 'websocket.close', 'code': CLOSE_NOT_FOUND})
+        return
+    board_id = int(match['board_id'])
+    user_id, close_code = await sync_to_async(authorize)(get_token(scope), board_id)
+    if close_code is not None:
+        await send({'type': 'websocket.close', 'code': close_code})
+        return
+
+    await send({'type': 'websocket.accept'})
+    subscriber = broker.subscribe(board_id)
+    try:
+        await _relay(subscriber, user_id, receive, send)
+    finally:
+        broker.unsubscribe(subscriber)
+
+
+async def _relay(subscriber, user_id, receive, send):
+    """
+    Forward board events until the client disconnects. Membership events
+    re-check access; board deletion ends the stream.
+    """
+    reader = asyncio.ensure_future(_read_until_disconnect(subscriber, receive))
+    try:
+        while True:
+            event_type, text = await subscriber.queue.get()
+            if event_type is None:
+                return
+            if event_type == 'members' and not await sync_to_async(may_read)(user_id, subscriber.board_id):
+                await send({'type': 'websocket.close', 'code': CLOSE_FORBIDDEN})
+                return
+            await send({'type': 'websocket.send', 'text': text})
+            if event_type == 'board_deleted':
+                await send({'type': 'websocket.close', 'code': CLOSE_NORMAL})
+                return
+    finally:
+        reader.cancel()
+
+
+async def _read_until_disconnect(subscriber, receive):
+    """Client frames are ignored; a disconnect stops the relay."""
+    while (await receive())['type'] != 'websocket.disconnect':
+        pass
+    subscriber.stop()
@@ -0,0 +1,197 @@
+"""
+Bulk create/update/delete of tasks in one request and one transaction.
+
+Items are validated field-by-field with the bulk item serializers, then
+boards, tasks and memberships for the whole batch are loaded with a fixed
+number of set-based queries. Writes use bulk_create/bulk_update, so the
+post_save handlers do not run; board counters are adjusted here with one
+F() update per board and `tasks_bulk_written` is sent for other listeners.
+Deletes are one queryset delete; its post_delete work is grouped per board
+(see `signals.DeletionBatch`).
+"""
+from django.db import transaction
+from kanban_app import counters, versions
+from kanban_app.membership import get_member_ids_many
+from kanban_app.models import Board, Task
+from kanban_app.signals import tasks_bulk_written
+from kanban_app.api.serializers import BulkTaskCreateItemSerializer, BulkTaskUpdateItemSerializer
+
+UPDATABLE_FIELDS = ('status', 'priority', 'assignee_id', 'reviewer_id', 'due_date')
+NOT_MEMBER = 'User must be member or owner of the board.'
+NOT_FOUND = 'Task not found.'
+
+
+class BulkTaskOperation:
+    """
+    Validates and applies one bulk task request for `request.user`.
+    Call `run()`; it returns the result payload and whether any item failed.
+    """
+
+    def __init__(self, request, data):
+        self.request = request
+        self.user_id = request.user.pk
+        self.atomic = data['atomic']
+        self.create_items = data['create']
+        self.update_items = data['update']
+        self.delete_ids = data['delete']
+        self.errors = []
+
+    def add_error(self, op, index, errors):
+        self.errors.append({'op': op, 'index': index, 'errors': errors})
+
+    def run(self):
+        with transaction.atomic():
+            creates = self.validate_fields(self.create_items, BulkTaskCreateItemSerializer, 'create')
+            updates = self.validate_fields(self.update_items, BulkTaskUpdateItemSerializer, 'update')
+            self.load(creates, updates)
+            creates = self.check_creates(creates)
+            updates = self.check_updates(updates)
+            deletes = self.check_deletes()
+            if self.errors and self.atomic:
+                return {'created': [], 'updated': [], 'deleted': [], 'errors': self.errors}, True
+            result = {
+                'created': self.write_creates(creates),
+                'updated': self.write_updates(updates),
+                'deleted': self.write_deletes(deletes),
+                'errors': self.errors,
+            }
+        return result, bool(self.errors)
+
+    def validate_fields(self, items, serializer_class, op):
+        """Field-level validation without queries; returns [(index, validated_data)]."""
+        valid = []
+        for index, item in enumerate(items):
+            serializer = serializer_class(data=item)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                self.add_error(op, index, serializer.errors)
+        return valid
+
+    def load(self, creates, updates):
+        """Load every referenced task, board and membership set in three queries at most."""
+        task_ids = {data['id'] for _, data in updates} | set(self.delete_ids)
+        self.tasks = Task.objects.select_for_update().in_bulk(task_ids) if task_ids else {}
+        board_ids = {data['board'] for _, data in creates} | {task.board_id for task in self.tasks.values()}
+        self.boards = Board.objects.only('id', 'owner_id').in_bulk(board_ids) if board_ids else {}
+        self.members = get_member_ids_many(list(self.boards), self.request)
+
+    def is_member_or_owner(self, board, user_id):
+        return user_id is not None and (
+            board.owner_id_id == user_id or user_id in self.members.get(board.pk, ()))
+
+    def user_errors(self, board, data):
+        """Membership errors for assignee_id/reviewer_id, if set."""
+        errors = {}
+        for field in ('assignee_id', 'reviewer_id'):
+            user_id = data.get(field)
+            if user_id is not None and not self.is_member_or_owner(board, user_id):
+                errors[field] = [NOT_MEMBER]
+        return errors
+
+    def visible_task(self, task_id):
+        """The task if it exists and the requester may see it, else None."""
+        task = self.tasks.get(task_id)
+        if task is None or not self.is_member_or_owner(self.boards[task.board_id], self.user_id):
+            return None
+        return task
+
+    def check_creates(self, creates):
+        valid = []
+        for index, data in creates:
+            board = self.boards.get(data['board'])
+            if board is None or not self.is_member_or_owner(board, self.user_id):
+                self.add_error('create', index, {'board': ['Board not found or not accessible.']})
+                continue
+            errors = self.user_errors(board, data)
+            if errors:
+                self.add_error('create', index, errors)
+                continue
+            valid.append(Task(
+                board_id=board.pk,
+                created_by_id=self.user_id,
+                title=data['title'],
+                description=data['description'],
+                status=data['status'],
+                priority=data['priority'],
+                assignee_id=data.get('assignee_id'),
+                reviewer_id=data.get('reviewer_id'),
+                due_date=data.get('due_date'),
+            ))
+        return valid
+
+    def check_updates(self, updates):
+        valid = []
+        seen = set(self.delete_ids)
+        for index, data in updates:
+            task = self.visible_task(data['id'])
+            if task is None:
+                self.add_error('update', index, {'id': [NOT_FOUND]})
+                continue
+            if task.pk in seen:
+                self.add_error('update', index, {'id': ['Task appears more than once in this request.']})
+                continue
+            seen.add(task.pk)
+            errors = self.user_errors(self.boards[task.board_id], data)
+            if errors:
+                self.add_error('update', index, errors)
+                continue
+            changes = {field: data[field] for field in UPDATABLE_FIELDS if field in data}
+            valid.append((task, changes))
+        return valid
+
+    def check_deletes(self):
+        valid = []
+        for index, task_id in enumerate(self.delete_ids):
+            task = self.visible_task(task_id)
+            if task is None:
+                self.add_error('delete', index, {'id': [NOT_FOUND]})
+                continue
+            if task_id in valid:
+                continue
+            if task.created_by_id != self.user_id and self.boards[task.board_id].owner_id_id != self.user_id:
+                self.add_error('delete', index, {'id': ['Only the task creator or board owner may delete it.']})
+                continue
+            valid.append(task_id)
+        return valid
+
+    def write_creates(self, tasks):
+        if not tasks:
+            return []
+        created = Task.objects.bulk_create(tasks, batch_size=500)
+        deltas = {}
+        for task in created:
+            deltas[task.board_id] = counters.merge_deltas(
+                deltas.get(task.board_id, {}), counters.task_deltas(task.status, task.priority, 1))
+        for board_id, board_deltas in deltas.items():
+            counters.apply_deltas(board_id, board_deltas)
+        tasks_bulk_written.send(sender=Task, created=created, updated=[])
+        return [task.pk for task in created]
+
+    def write_updates(self, updates):
+        if not updates:
+            return []
+        deltas = {}
+        fields = set()
+        tasks = []
+        for task, changes in updates:
+            removed = counters.task_deltas(task.status, task.priority, -1)
+            for field, value in changes.items():
+                setattr(task, field, value)
+            added = counters.task_deltas(task.status, task.priority, 1)
+            deltas[task.board_id] = counters.merge_deltas(deltas.get(task.board_id, {}), removed, added)
+            fields.update(changes)
+            tasks.append(task)
+        if fields:
+            Task.objects.bulk_update(tasks, sorted(fields), batch_size=500)
+            versions.touch_tasks([task.pk for task in tasks])
+        for board_id, board_deltas in deltas.items():
+            counters.apply_deltas(board_id, board_deltas)
+        tasks_bulk_written.send(sender=Task, created=[], updated=tasks)
+        return [task.pk for task in tasks]
+
+    def write_deletes(self, task_ids):
+        """One queryset delete; counters, change log and search follow once per board."""
+        if task_ids:
+            Task.objects.filter(pk__in=task_ids).delete()
+        return task_ids
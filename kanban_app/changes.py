@@ -0,0 +1,147 @@
+"""
+Per-board change log behind the incremental change feed.
+
+Task and comment writes append a `BoardChange` whose `seq` is the board
+version after the write. The handlers in `kanban_app.signals` run after the
+counter updates that bump the version, inside the same transaction, so the
+row lock on the board orders concurrent writers and `seq` only ever grows.
+Readers ask for everything after a cursor; entries older than the retention
+window are compacted and `Board.change_log_start` records how far.
+New entries are also pushed to WebSocket subscribers after commit
+(see `kanban_app.realtime`).
+"""
+from django.db import transaction
+from django.db.models import Max
+from kanban_app.models import Board, BoardChange
+from kanban_app.realtime import changes_event, publish_after_commit
+
+ENTRY_FIELDS = ('seq', 'kind', 'object_id', 'task_id', 'action')
+
+
+def _board_seq(board_id):
+    return Board.objects.filter(pk=board_id).values_list('version', flat=True).first()
+
+
+def _publish(changes):
+    """Push the entries of one board to its subscribers once committed."""
+    entries = [
+        {'seq': change.seq, 'type': change.kind, 'id': change.object_id,
+         'task': change.task_id, 'action': change.action}
+        for change in changes
+    ]
+    publish_after_commit(changes[0].board_id, changes_event(entries))
+
+
+def _create(board_id, seq, kind, object_id, task_id, action):
+    change = BoardChange.objects.create(
+        board_id=board_id, seq=seq, kind=kind, object_id=object_id, task_id=task_id, action=action)
+    _publish([change])
+
+
+def record(board_id, kind, object_id, task_id, action):
+    """Append one entry at the board's current version. Boards being deleted are skipped."""
+    seq = _board_seq(board_id)
+    if seq is not None:
+        _create(board_id, seq, kind, object_id, task_id, action)
+
+
+def task_saved(task, created, old_board_id=None):
+    """Record a task write; a task moved to another board leaves the old one and appears on the new one."""
+    if created:
+        record(task.board_id, BoardChange.TASK, task.pk, task.pk, BoardChange.CREATED)
+    elif old_board_id is not None and old_board_id != task.board_id:
+        record(old_board_id, BoardChange.TASK, task.pk, task.pk, BoardChange.DELETED)
+        record(task.board_id, BoardChange.TASK, task.pk, task.pk, BoardChange.CREATED)
+    else:
+        record(task.board_id, BoardChange.TASK, task.pk, task.pk, BoardChange.UPDATED)
+
+
+def _deleted(board_id, seq, kind, objects):
+    """One insert for several deletions, all at `seq`; `objects` are (object_id, task_id) pairs."""
+    changes = BoardChange.objects.bulk_create([
+        BoardChange(board_id=board_id, seq=seq, kind=kind, object_id=object_id, task_id=task_id,
+                    action=BoardChange.DELETED)
+        for object_id, task_id in objects
+    ], batch_size=500)
+    _publish(changes)
+
+
+def tasks_deleted(board_id, task_ids):
+    """Record the deletion of several tasks of one board. Boards being deleted are skipped."""
+    seq = _board_seq(board_id)
+    if seq is not None and task_ids:
+        _deleted(board_id, seq, BoardChange.TASK, [(task_id, task_id) for task_id in task_ids])
+
+
+def comment_written(comment, action):
+    """Record a comment write on the board of its task (one query to find board and seq)."""
+    row = Board.objects.filter(tasks=comment.task_id).values_list('pk', 'version').first()
+    if row is not None:
+        _create(row[0], row[1], BoardChange.COMMENT, comment.pk, comment.task_id, action)
+
+
+def comments_deleted(task_id, comment_ids):
+    """Record the deletion of several comments of one task."""
+    row = Board.objects.filter(tasks=task_id).values_list('pk', 'version').first()
+    if row is not None and comment_ids:
+        _deleted(row[0], row[1], BoardChange.COMMENT, [(comment_id, task_id) for comment_id in comment_ids])
+
+
+def tasks_written(created, updated):
+    """Record bulk task writes with one version read and one insert for the whole batch."""
+    tasks = [(task, BoardChange.CREATED) for task in created] + [(task, BoardChange.UPDATED) for task in updated]
+    if not tasks:
+        return
+    seqs = dict(Board.objects.filter(pk__in={task.board_id for task, _ in tasks}).values_list('pk', 'version'))
+    created = BoardChange.objects.bulk_create([
+        BoardChange(board_id=task.board_id, seq=seqs[task.board_id], kind=BoardChange.TASK,
+                    object_id=task.pk, task_id=task.pk, action=action)
+        for task, action in tasks
+    ], batch_size=500)
+    by_board = {}
+    for change in created:
+        by_board.setdefault(change.board_id, []).append(change)
+    for changes in by_board.values():
+        _publish(changes)
+
+
+def changes_since(board, since, limit):
+    """
+    Return (entries, cursor, has_more) for the board after `since`.
+
+    Entries are collapsed to one per object: the latest action wins, except
+    that an object created and then updated inside the window stays
+    `created`. Entries sharing a seq (one bulk write) are never split
+    across pages, so a page may exceed `limit` by the rest of that group.
+    """
+    entries = BoardChange.objects.filter(board=board).order_by('seq', 'id').values(*ENTRY_FIELDS)
+    rows = list(entries.filter(seq__gt=since)[:limit + 1])
+    has_more = len(rows) > limit
+    if has_more:
+        last_seq = rows[limit - 1]['seq']
+        rows = [row for row in rows[:limit] if row['seq'] != last_seq] + list(entries.filter(seq=last_seq))
+    collapsed = {}
+    for row in rows:
+        previous = collapsed.pop((row['kind'], row['object_id']), None)
+        if previous and previous['action'] == BoardChange.CREATED and row['action'] == BoardChange.UPDATED:
+            row['action'] = BoardChange.CREATED
+        collapsed[(row['kind'], row['object_id'])] = row
+    cursor = rows[-1]['seq'] if rows else since
+    return list(collapsed.values()), cursor, has_more
+
+
+def compact(before):
+    """
+    Delete entries created before `before`, raising each board's
+    `change_log_start` past them, and drop entries of deleted boards.
+    Returns the number of deleted entries.
+    """
+    floors = (BoardChange.objects.filter(created_at__lt=before).order_by()
+              .values('board').annotate(seq=Max('seq')).values_list('board', 'seq'))
+    deleted = 0
+    for board_id, seq in floors:
+        with transaction.atomic():
+            Board.objects.filter(pk=board_id, change_log_start__lt=seq).update(change_log_start=seq)
+            deleted += BoardChange.objects.filter(board_id=board_id, seq__lte=seq).delete()[0]
+    deleted += BoardChange.objects.exclude(board_id__in=Board.objects.values('pk')).delete()[0]
+    return deleted
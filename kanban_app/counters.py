@@ -0,0 +1,159 @@
+"""
+Maintenance of the denormalized Board counters and Task.comments_count.
+
+Task, comment and membership changes are turned into single UPDATE statements with
+F() expressions, so concurrent writers never lose increments. The same UPDATE
+also bumps the version stamp of the row (see `kanban_app.versions`). The signal
+handlers in `kanban_app.signals` call into this module; bulk write paths
+that bypass signals call `rebuild_board_counters()` / `rebuild_comment_counts()`
+for the rows they touch.
+"""
+from django.db.models import F, IntegerField, OuterRef, Subquery, Count
+from django.db.models.functions import Coalesce, Greatest
+from kanban_app.models import Board, Task, Comment, STATUS_COUNTERS, PRIORITY_COUNTERS
+from kanban_app.versions import touch, touch_board_of_task, touch_boards
+
+TASK_COUNTER_FIELDS = ['ticket_count', *STATUS_COUNTERS.values(), *PRIORITY_COUNTERS.values()]
+COUNTER_FIELDS = ['member_count', *TASK_COUNTER_FIELDS]
+
+
+def apply_deltas(board_id, deltas):
+    """
+    Add the given per-field deltas to one board and bump its version in a single UPDATE.
+    Zero deltas are dropped; the version is bumped even if all of them cancel out.
+    """
+    changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    Board.objects.filter(pk=board_id).update(**changes, **touch())
+
+
+def task_deltas(status, priority, sign):
+    """Return the counter deltas for adding (sign=1) or removing (sign=-1) one task."""
+    deltas = {'ticket_count': sign}
+    if status in STATUS_COUNTERS:
+        deltas[STATUS_COUNTERS[status]] = sign
+    if priority in PRIORITY_COUNTERS:
+        deltas[PRIORITY_COUNTERS[priority]] = sign
+    return deltas
+
+
+def merge_deltas(*parts):
+    """Sum several delta dicts field by field."""
+    merged = {}
+    for part in parts:
+        for field, delta in part.items():
+            merged[field] = merged.get(field, 0) + delta
+    return merged
+
+
+def task_created(task):
+    apply_deltas(task.board_id, task_deltas(task.status, task.priority, 1))
+
+
+def tasks_deleted(board_id, tasks):
+    """Remove several deleted tasks of one board from its counters in one UPDATE."""
+    apply_deltas(board_id, merge_deltas(*(task_deltas(task.status, task.priority, -1) for task in tasks)))
+
+
+def task_updated(task, loaded_values):
+    """
+    Move a saved task between counters based on the values it was loaded with
+    (`board_id`, `status` and `priority`, see `signals.remember_task_values`).
+    """
+    old_board = loaded_values['board_id']
+    removed = task_deltas(loaded_values['status'], loaded_values['priority'], -1)
+    added = task_deltas(task.status, task.priority, 1)
+    if old_board == task.board_id:
+        apply_deltas(task.board_id, merge_deltas(removed, added))
+    else:
+        apply_deltas(old_board, removed)
+        apply_deltas(task.board_id, added)
+
+
+def members_added(board_ids, count=1):
+    """Increment member_count of the given boards by `count` new members each."""
+    Board.objects.filter(pk__in=board_ids).update(member_count=F('member_count') + count, **touch())
+
+
+def recount_members(board_ids=None):
+    """Recompute member_count from the membership table (and bump versions) in one UPDATE."""
+    member_count = Board.members.through.objects.filter(
+        board=OuterRef('pk')
+    ).order_by().values('board').annotate(c=Count('*')).values('c')
+    boards = Board.objects.all() if board_ids is None else Board.objects.filter(pk__in=board_ids)
+    boards.update(member_count=Coalesce(Subquery(member_count, output_field=IntegerField()), 0), **touch())
+
+
+def find_counter_drift(board_ids=None, fields=COUNTER_FIELDS):
+    """
+    Compare stored counters with values computed from the source tables.
+    Returns a list of (board, {field: (stored, computed)}) for boards that drifted.
+    """
+    boards = Board.objects.with_computed_counters()
+    if board_ids is not None:
+        boards = boards.filter(pk__in=board_ids)
+    drift = []
+    for board in boards:
+        diff = {
+            field: (getattr(board, field), getattr(board, f'computed_{field}'))
+            for field in fields
+            if getattr(board, field) != getattr(board, f'computed_{field}')
+        }
+        if diff:
+            drift.append((board, diff))
+    return drift
+
+
+def rebuild_board_counters(board_ids=None, fields=COUNTER_FIELDS):
+    """
+    Overwrite stored counters with freshly computed values.
+    Only boards that drifted are written. Returns the drift that was repaired.
+    """
+    drift = find_counter_drift(board_ids, fields)
+    for board, diff in drift:
+        for field, (_, computed) in diff.items():
+            setattr(board, field, computed)
+    if drift:
+        Board.objects.bulk_update([board for board, _ in drift], fields, batch_size=500)
+        touch_boards([board.pk for board, _ in drift])
+    return drift
+
+
+def comment_created(comment):
+    Task.objects.filter(pk=comment.task_id).update(comments_count=F('comments_count') + 1, **touch())
+    touch_board_of_task(comment.task_id)
+
+
+def comments_deleted(task_id, count=1):
+    # Clamped: a drifted counter must not fail the delete (`rebuild_counters` repairs it).
+    Task.objects.filter(pk=task_id).update(comments_count=Greatest(F('comments_count') - count, 0), **touch())
+    touch_board_of_task(task_id)
+
+
+def find_comment_count_drift(board_ids=None):
+    """
+    Return tasks whose stored comments_count differs from the comment table,
+    annotated with `computed_comments_count`.
+    """
+    tasks = Task.objects.all() if board_ids is None else Task.objects.filter(board_id__in=board_ids)
+    return list(
+        tasks.annotate(computed_comments_count=Count('comments'))
+        .exclude(comments_count=F('computed_comments_count'))
+        .only('id', 'comments_count')
+    )
+
+
+def rebuild_comment_counts(task_ids=None, board_ids=None):
+    """
+    Recompute comments_count from the comment table in one UPDATE.
+    Limited to the given tasks and/or boards; everything when both are None.
+    """
+    comment_count = Comment.objects.filter(
+        task=OuterRef('pk')
+    ).order_by().values('task').annotate(c=Count('*')).values('c')
+    tasks = Task.objects.all()
+    if task_ids is not None:
+        tasks = tasks.filter(pk__in=task_ids)
+    if board_ids is not None:
+        tasks = tasks.filter(board_id__in=board_ids)
+    return tasks.update(
+        comments_count=Coalesce(Subquery(comment_count, output_field=IntegerField()), 0), **touch())
@@ -0,0 +1,109 @@
+"""
+Streaming NDJSON export of a board with all its tasks and comments.
+
+One JSON object per line, in this order:
+
+    {"type": "board", "id": 1, "title": ..., "owner": "a@x.io", "members": [...]}
+    {"type": "task", "id": 7, "title": ..., "assignee": "b@x.io", ...}
+    {"type": "comment", "id": 3, "task": 7, "author": "b@x.io", "content": ..., ...}
+
+Users are referenced by email so exports can be imported into another
+database. Tasks and comments are read with `.values().iterator()` in
+chunks of `KANBAN_EXPORT_CHUNK_SIZE` rows (server-side cursors where the
+database has them), so memory stays flat however large the board is.
+Under ASGI the stream is wrapped in `aiterate()`: Django would otherwise
+collect a sync iterator into a list before sending the first byte.
+"""
+import zlib
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from kanban_app.models import Task, Comment
+
+TASK_COLUMNS = {
+    'id': 'id',
+    'title': 'title',
+    'description': 'description',
+    'status': 'status',
+    'priority': 'priority',
+    'due_date': 'due_date',
+    'created_by': 'created_by__email',
+    'assignee': 'assignee__email',
+    'reviewer': 'reviewer__email',
+    'updated_at': 'updated_at',
+}
+COMMENT_COLUMNS = {
+    'id': 'id',
+    'task': 'task_id',
+    'author': 'author__email',
+    'content': 'content',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+}
+BUFFER_SIZE = 64 * 1024
+_END = object()
+
+_encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def _line(obj):
+    return (_encoder.encode(obj) + '\n').encode()
+
+
+def _rows(queryset, columns, kind, chunk_size):
+    names = list(columns)
+    for values in queryset.values_list(*columns.values()).iterator(chunk_size=chunk_size):
+        yield _line({'type': kind, **dict(zip(names, values))})
+
+
+def export_lines(board, chunk_size=None):
+    """Yield the board export as encoded NDJSON lines."""
+    chunk_size = chunk_size or settings.KANBAN_EXPORT_CHUNK_SIZE
+    yield _line({
+        'type': 'board',
+        'id': board.pk,
+        'title': board.title,
+        'owner': board.owner_id.email,
+        'members': list(board.members.order_by('pk').values_list('email', flat=True)),
+    })
+    tasks = Task.objects.filter(board=board).order_by('pk')
+    yield from _rows(tasks, TASK_COLUMNS, 'task', chunk_size)
+    comments = Comment.objects.filter(task__board=board).order_by('task_id', 'pk')
+    yield from _rows(comments, COMMENT_COLUMNS, 'comment', chunk_size)
+
+
+def buffered(chunks, size=BUFFER_SIZE):
+    """Join small lines into writes of about `size` bytes."""
+    buffer = []
+    length = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            yield b''.join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def gzip_stream(chunks):
+    """Gzip a byte stream incrementally (gzip container, not raw deflate)."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in buffered(chunks):
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+async def aiterate(chunks):
+    """
+    Async iterator over a sync byte stream, one chunk per `sync_to_async`
+    call. Thread-sensitive, so every chunk is read on the same thread and
+    open database cursors stay usable.
+    """
+    chunks = iter(chunks)
+    next_chunk = sync_to_async(next)
+    while (chunk := await next_chunk(chunks, _END)) is not _END:
+        yield chunk
@@ -0,0 +1,155 @@
+import asyncio
+import io
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework.authtoken.models import Token
+from kanban_app.models import Board, Task, Comment
+
+HOST = 'localhost'
+MODES = ['wsgi', 'asgi-sync', 'asgi-async']
+
+
+class Command(BaseCommand):
+    """
+    Compares the read endpoints under WSGI (`core.wsgi`), ASGI with the sync
+    DRF views, and ASGI with the async read views (`KANBAN_ASYNC_READS`).
+    Each deployment runs in its own process on an identically seeded scratch
+    database and is driven in-process: WSGI by a thread pool (like a threaded
+    WSGI server), ASGI by concurrent tasks on one event loop (like one ASGI
+    worker). Network and server overhead are not included.
+    """
+    help = 'Compare req/s and p99 latency of the hot read endpoints under WSGI and ASGI (sync/async views).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2_000)
+        parser.add_argument('--concurrency', type=int, default=32)
+        parser.add_argument('--boards', type=int, default=20)
+        parser.add_argument('--tasks-per-board', type=int, default=40)
+        parser.add_argument('--mode', choices=MODES, help='Run a single deployment (used internally).')
+
+    def handle(self, *args, **options):
+        if options['mode']:
+            self.run_mode(options)
+            return
+        results = {mode: self.spawn(mode, options) for mode in MODES}
+        self.stdout.write(f"{options['requests']} requests, concurrency {options['concurrency']}")
+        self.stdout.write(f"{'':12}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+        for mode, result in results.items():
+            self.stdout.write(
+                f"{mode:12}{result['rps']:>10.0f}{result['p50']:>10.2f}{result['p99']:>10.2f}{result['errors']:>8}")
+
+    def spawn(self, mode, options):
+        """Run one deployment in a fresh process so the URLconf matches `KANBAN_ASYNC_READS`."""
+        env = {**os.environ, 'KANBAN_ASYNC_READS': '1' if mode == 'asgi-async' else '0'}
+        command = [sys.executable, sys.argv[0], 'bench_asgi', '--mode', mode]
+        for name in ('requests', 'concurrency', 'boards', 'tasks_per_board'):
+            command += [f"--{name.replace('_', '-')}", str(options[name])]
+        completed = subprocess.run(command, env=env, capture_output=True, text=True)
+        if completed.returncode:
+            raise CommandError(f'{mode} run failed:\n{completed.stderr}')
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+
+    def run_mode(self, options):
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            token, paths = self.seed(options)
+            requests = [random.Random(i).choice(paths) for i in range(options['requests'])]
+            if options['mode'] == 'wsgi':
+                latencies, errors, seconds = self.drive_wsgi(requests, token, options['concurrency'])
+            else:
+                latencies, errors, seconds = asyncio.run(self.drive_asgi(requests, token, options['concurrency']))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+        latencies.sort()
+        self.stdout.write(json.dumps({
+            'rps': len(latencies) / seconds,
+            'p50': statistics.median(latencies) * 1000,
+            'p99': latencies[int(len(latencies) * 0.99) - 1] * 1000,
+            'errors': errors,
+        }))
+
+    def seed(self, options):
+        """One user who is member of every board, assignee/reviewer of tasks and author of comments."""
+        user = User.objects.create_user(username='bench@example.com', email='bench@example.com')
+        other = User.objects.create_user(username='other@example.com', email='other@example.com')
+        token = Token.objects.create(user=user).key
+        boards = Board.objects.bulk_create(
+            [Board(title=f'Board {i}', owner_id=other) for i in range(options['boards'])])
+        Board.members.through.objects.bulk_create(
+            [Board.members.through(board_id=board.pk, user_id=user.pk) for board in boards])
+        tasks = Task.objects.bulk_create([
+            Task(title=f'Task {i}', board=board, created_by=other,
+                 assignee=user if i % 2 else other, reviewer=user if i % 3 else other)
+            for board in boards for i in range(options['tasks_per_board'])
+        ])
+        Comment.objects.bulk_create(
+            [Comment(task=task, author=user, content='Comment') for task in tasks[:200] for _ in range(3)])
+        paths = ['/api/boards/', '/api/tasks/assigned-to-me/', '/api/tasks/reviewing/']
+        paths += [f'/api/boards/{board.pk}/' for board in boards[:5]]
+        paths += [f'/api/tasks/{task.pk}/comments/' for task in tasks[:5]]
+        return token, paths
+
+    def drive_wsgi(self, paths, token, concurrency):
+        from core.wsgi import application
+
+        def call(path):
+            environ = {
+                'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '', 'SCRIPT_NAME': '',
+                'SERVER_NAME': HOST, 'SERVER_PORT': '80', 'HTTP_HOST': HOST, 'SERVER_PROTOCOL': 'HTTP/1.1',
+                'HTTP_AUTHORIZATION': f'Token {token}', 'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr,
+                'wsgi.url_scheme': 'http', 'wsgi.multithread': True, 'wsgi.multiprocess': False,
+            }
+            status = []
+            started = time.perf_counter()
+            body = application(environ, lambda s, headers, exc_info=None: status.append(s))
+            b''.join(body)
+            body.close()
+            return time.perf_counter() - started, not status[0].startswith('200')
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            results = list(pool.map(call, paths))
+        return [latency for latency, _ in results], sum(error for _, error in results), time.perf_counter() - started
+
+    async def drive_asgi(self, paths, token, concurrency):
+        from core.asgi import application
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call(path):
+            scope = {
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+                'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': b'', 'root_path': '',
+                'headers': [(b'host', HOST.encode()), (b'authorization', f'Token {token}'.encode())],
+                'client': ('127.0.0.1', 50000), 'server': (HOST, 80),
+            }
+            messages = iter([{'type': 'http.request', 'body': b'', 'more_body': False}])
+            status = []
+
+            async def receive():
+                message = next(messages, None)
+                if message is None:
+                    await asyncio.Future()
+                return message
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    status.append(message['status'])
+
+            async with semaphore:
+                started = time.perf_counter()
+                await application(scope, receive, send)
+                return time.perf_counter() - started, status[0] != 200
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(call(path) for path in paths))
+        return [latency for latency, _ in results], sum(error for _, error in results), time.perf_counter() - started
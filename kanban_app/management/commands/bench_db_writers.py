@@ -0,0 +1,130 @@
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, transaction
+from kanban_app.counters import rebuild_board_counters
+from kanban_app.models import Board, Task
+
+STATUSES = ['to-do', 'in-progress', 'review', 'done']
+PRIORITIES = ['low', 'medium', 'high']
+
+
+class Command(BaseCommand):
+    """
+    Concurrent task updates against a scratch copy of the configured
+    database, shaped like PATCH /api/tasks/{id}/: load the task and save it
+    in a transaction, with all counter, version and change log signals.
+    On SQLite it compares the plain configuration with the tuned one
+    (DB_SQLITE_TUNED); on PostgreSQL it runs the configured profile.
+    """
+    help = 'Measure writes/s, latency and lock errors with concurrent task writers.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=16)
+        parser.add_argument('--seconds', type=float, default=10)
+        parser.add_argument('--boards', type=int, default=10)
+        parser.add_argument('--tasks-per-board', type=int, default=50)
+        parser.add_argument('--mode', help='Run a single profile in this process (used internally).')
+
+    def handle(self, *args, **options):
+        if options['mode']:
+            self.run_mode(options)
+            return
+        if connection.vendor == 'sqlite':
+            modes = {'sqlite-default': {'DB_SQLITE_TUNED': '0'}, 'sqlite-tuned': {'DB_SQLITE_TUNED': '1'}}
+        else:
+            modes = {connection.vendor: {}}
+        results = {mode: self.spawn(mode, env, options) for mode, env in modes.items()}
+        self.stdout.write(f"{options['writers']} writers for {options['seconds']}s")
+        self.stdout.write(f"{'':16}{'writes/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'locked':>8}")
+        for mode, result in results.items():
+            self.stdout.write(f"{mode:16}{result['wps']:>10.0f}{result['p50']:>10.2f}"
+                              f"{result['p99']:>10.2f}{result['errors']:>8}")
+
+    def spawn(self, mode, env, options):
+        """One process per profile, since DATABASES is read from the environment at startup."""
+        command = [sys.executable, sys.argv[0], 'bench_db_writers', '--mode', mode]
+        for name in ('writers', 'seconds', 'boards', 'tasks_per_board'):
+            command += [f"--{name.replace('_', '-')}", str(options[name])]
+        completed = subprocess.run(command, env={**os.environ, **env}, capture_output=True, text=True)
+        if completed.returncode:
+            raise CommandError(f'{mode} run failed:\n{completed.stderr}')
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+
+    def run_mode(self, options):
+        with tempfile.TemporaryDirectory() as directory:
+            if connection.vendor == 'sqlite':
+                # A file, not the shared in-memory test database, so locking behaves as in production.
+                connection.settings_dict['TEST']['NAME'] = os.path.join(directory, 'bench.sqlite3')
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+            try:
+                task_ids = self.seed(options)
+                connection.close()
+                latencies, errors = self.drive(task_ids, options['writers'], options['seconds'])
+            finally:
+                connection.close()
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+        latencies.sort()
+        self.stdout.write(json.dumps({
+            'wps': len(latencies) / options['seconds'],
+            'p50': statistics.median(latencies) * 1000 if latencies else 0,
+            'p99': latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000 if latencies else 0,
+            'errors': errors,
+        }))
+
+    def seed(self, options):
+        owner = User.objects.create_user(username='bench@example.com', email='bench@example.com')
+        boards = [Board.objects.create(title=f'Board {i}', owner_id=owner) for i in range(options['boards'])]
+        tasks = Task.objects.bulk_create([
+            Task(title=f'Task {i}', board=board, created_by=owner)
+            for board in boards for i in range(options['tasks_per_board'])
+        ])
+        rebuild_board_counters()
+        return [task.pk for task in tasks]
+
+    def drive(self, task_ids, writers, seconds):
+        latencies, errors, failures = [], [0], []
+        lock = threading.Lock()
+        deadline = time.perf_counter() + seconds
+
+        def write(seed):
+            rng = random.Random(seed)
+            own = []
+            try:
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        with transaction.atomic():
+                            task = Task.objects.get(pk=rng.choice(task_ids))
+                            task.status = rng.choice(STATUSES)
+                            task.priority = rng.choice(PRIORITIES)
+                            task.save()
+                    except OperationalError:
+                        with lock:
+                            errors[0] += 1
+                        continue
+                    own.append(time.perf_counter() - started)
+            except Exception as exc:
+                failures.append(exc)
+            finally:
+                connection.close()
+            with lock:
+                latencies.extend(own)
+
+        threads = [threading.Thread(target=write, args=(i,)) for i in range(writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if failures:
+            raise CommandError(f'A writer failed: {failures[0]!r}')
+        return latencies, errors[0]
@@ -0,0 +1,158 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from kanban_app.models import Board, Task, Comment
+
+EMAIL_INDEX = 'auth_user_email_idx'
+STATUSES = ['to-do', 'in-progress', 'review', 'done']
+PRIORITIES = ['low', 'medium', 'high']
+
+
+class Command(BaseCommand):
+    """
+    Benchmarks the kanban access-pattern indexes on a scratch test database.
+    Seeds synthetic data, then reports EXPLAIN plans and median latency
+    for each hot query with the indexes dropped ("before") and restored ("after").
+    """
+    help = 'Compare EXPLAIN plans and latency of hot queries with and without the composite indexes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=1_000_000)
+        parser.add_argument('--boards', type=int, default=2_000)
+        parser.add_argument('--users', type=int, default=5_000)
+        parser.add_argument('--comments-per-task', type=float, default=0.5)
+        parser.add_argument('--repeat', type=int, default=50, help='Samples per query and phase.')
+        parser.add_argument('--batch-size', type=int, default=10_000)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.seed(options)
+            self.rows = {}
+            self.drop_indexes()
+            self.run_phase('before', options['repeat'])
+            self.create_indexes()
+            self.run_phase('after', options['repeat'])
+            self.report()
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def seed(self, options):
+        """Bulk-insert users, boards, memberships, tasks and comments."""
+        batch = options['batch_size']
+        started = time.perf_counter()
+        User.objects.bulk_create(
+            [User(username=f'user{i}@example.com', email=f'user{i}@example.com')
+             for i in range(options['users'])], batch_size=batch)
+        self.user_ids = list(User.objects.values_list('id', flat=True))
+        self.emails = list(User.objects.values_list('email', flat=True))
+
+        Board.objects.bulk_create(
+            [Board(title=f'Board {i}', owner_id_id=self.rng.choice(self.user_ids))
+             for i in range(options['boards'])], batch_size=batch)
+        self.board_ids = list(Board.objects.values_list('id', flat=True))
+        Membership = Board.members.through
+        Membership.objects.bulk_create(
+            [Membership(board_id=board_id, user_id=user_id)
+             for board_id in self.board_ids
+             for user_id in self.rng.sample(self.user_ids, 8)],
+            batch_size=batch, ignore_conflicts=True)
+
+        remaining = options['tasks']
+        while remaining > 0:
+            size = min(batch, remaining)
+            Task.objects.bulk_create([self.make_task() for _ in range(size)], batch_size=batch)
+            remaining -= size
+        self.task_ids = list(Task.objects.values_list('id', flat=True))
+
+        total_comments = int(len(self.task_ids) * options['comments_per_task'])
+        remaining = total_comments
+        while remaining > 0:
+            size = min(batch, remaining)
+            Comment.objects.bulk_create(
+                [Comment(task_id=self.rng.choice(self.task_ids),
+                         author_id=self.rng.choice(self.user_ids), content='Benchmark comment')
+                 for _ in range(size)], batch_size=batch)
+            remaining -= size
+        self.stdout.write(
+            f'Seeded {len(self.user_ids)} users, {len(self.board_ids)} boards, '
+            f'{len(self.task_ids)} tasks, {total_comments} comments '
+            f'in {time.perf_counter() - started:.1f}s ({connection.vendor})')
+
+    def make_task(self):
+        rng = self.rng
+        return Task(
+            title='Benchmark task',
+            board_id=rng.choice(self.board_ids),
+            created_by_id=rng.choice(self.user_ids),
+            assignee_id=rng.choice(self.user_ids),
+            reviewer_id=rng.choice(self.user_ids),
+            status=rng.choice(STATUSES),
+            priority=rng.choice(PRIORITIES),
+            due_date=None if rng.random() < 0.3 else f'2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+        )
+
+    def queries(self):
+        """
+        Hot queries of the API, each as (label, factory returning a fresh queryset).
+        Counter queries select only the key so they can be answered from the index.
+        """
+        rng = self.rng
+        return [
+            ('board counter (board, status)',
+             lambda: Task.objects.filter(board_id=rng.choice(self.board_ids), status='to-do').values('pk')),
+            ('board counter (board, priority)',
+             lambda: Task.objects.filter(board_id=rng.choice(self.board_ids), priority='high').values('pk')),
+            ('assigned-to-me by due date (assignee, due_date)',
+             lambda: Task.objects.filter(assignee_id=rng.choice(self.user_ids)).order_by('due_date')[:50]),
+            ('reviewing in review (reviewer, status)',
+             lambda: Task.objects.filter(reviewer_id=rng.choice(self.user_ids), status='review')[:50]),
+            ('comment thread (task, created_at)',
+             lambda: Comment.objects.filter(task_id=rng.choice(self.task_ids)).order_by('created_at', 'id')[:50]),
+            ('user by email',
+             lambda: User.objects.filter(email=rng.choice(self.emails))),
+        ]
+
+    def run_phase(self, phase, repeat):
+        """Record plan and median latency of every query for one phase."""
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        for label, factory in self.queries():
+            plan = factory().explain()
+            samples = []
+            for _ in range(repeat):
+                queryset = factory()
+                started = time.perf_counter()
+                list(queryset)
+                samples.append((time.perf_counter() - started) * 1000)
+            self.rows.setdefault(label, {})[phase] = (plan, statistics.median(samples))
+
+    def drop_indexes(self):
+        with connection.schema_editor() as editor:
+            for model in (Task, Comment):
+                for index in model._meta.indexes:
+                    editor.remove_index(model, index)
+            editor.execute(f'DROP INDEX IF EXISTS {EMAIL_INDEX}')
+
+    def create_indexes(self):
+        with connection.schema_editor() as editor:
+            for model in (Task, Comment):
+                for index in model._meta.indexes:
+                    editor.add_index(model, index)
+            editor.execute(f'CREATE INDEX IF NOT EXISTS {EMAIL_INDEX} ON auth_user (email)')
+
+    def report(self):
+        for label, phases in self.rows.items():
+            before_plan, before_ms = phases['before']
+            after_plan, after_ms = phases['after']
+            self.stdout.write(self.style.MIGRATE_HEADING(f'\n{label}'))
+            self.stdout.write(f'  before: {before_ms:8.3f} ms  | {before_plan}')
+            self.stdout.write(f'  after:  {after_ms:8.3f} ms  | {after_plan}')
+            speedup = before_ms / after_ms if after_ms else float('inf')
+            self.stdout.write(self.style.SUCCESS(f'  speedup: {speedup:.1f}x'))
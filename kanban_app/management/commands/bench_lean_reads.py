@@ -0,0 +1,98 @@
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+from kanban_app.api.renderers import FastJSONRenderer, orjson
+from kanban_app.api.views import AssignedTaskList, BoardViewSet
+from kanban_app.models import Task
+from kanban_app.seeding import Seeder
+
+
+class Command(BaseCommand):
+    """
+    CPU per row of assigned-to-me (one page of `KANBAN_MAX_PAGE_SIZE`) and
+    of the largest board's detail, built by the serializers and by the lean
+    read path (`KANBAN_LEAN_READS`), and rendered by DRF's JSONRenderer and
+    by FastJSONRenderer. Runs the DRF views in-process on a scratch test
+    database seeded by `kanban_app.seeding`; the board detail cache is off.
+    """
+    help = 'Compare CPU per row of the serializer and lean read paths, and of the JSON renderers.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=20_000)
+        parser.add_argument('--boards', type=int, default=20)
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--repeat', type=int, default=7, help='Samples per measurement (median is reported).')
+
+    def handle(self, *args, **options):
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            seeder = Seeder(users=options['users'], boards=options['boards'], tasks=options['tasks'], comments=0,
+                            maintain=False, log=self.stdout.write).run()
+            self.repeat = options['repeat']
+            assignee = (Task.objects.exclude(assignee=None).values('assignee')
+                        .annotate(tasks=Count('id')).order_by('-tasks')[0]['assignee'])
+            board_id = seeder.board_ids[0]
+            endpoints = [
+                ('assigned-to-me', AssignedTaskList.as_view(), '/api/tasks/assigned-to-me/?page_size=500', {},
+                 assignee, lambda data: len(data['results'])),
+                ('board detail', BoardViewSet.as_view({'get': 'retrieve'}), f'/api/boards/{board_id}/',
+                 {'pk': board_id}, seeder.people[board_id][0], lambda data: len(data['tasks'])),
+            ]
+            with override_settings(KANBAN_BOARD_DETAIL_CACHE_TTL=0, ALLOWED_HOSTS=['testserver']):
+                for endpoint in endpoints:
+                    self.compare(*endpoint)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def compare(self, label, view, path, kwargs, user_id, count_rows):
+        user = User.objects.get(pk=user_id)
+        request_factory = APIRequestFactory()
+
+        def build(lean):
+            request = request_factory.get(path)
+            force_authenticate(request, user)
+            with override_settings(KANBAN_LEAN_READS=lean):
+                cache.clear()
+                response = view(request, **kwargs)
+            if response.status_code != 200:
+                raise CommandError(f'{label}: status {response.status_code}')
+            return response.data
+
+        serializer_data, lean_data = build(False), build(True)
+        rows = count_rows(lean_data)
+        if JSONRenderer().render(serializer_data) != FastJSONRenderer().render(lean_data):
+            raise CommandError(f'{label}: lean output differs from the serializer output.')
+
+        results = {
+            'serializers': self.cpu(lambda: build(False)),
+            'lean': self.cpu(lambda: build(True)),
+            'JSONRenderer': self.cpu(lambda: JSONRenderer().render(lean_data)),
+            'FastJSONRenderer': self.cpu(lambda: FastJSONRenderer().render(lean_data)),
+        }
+        self.stdout.write(self.style.MIGRATE_HEADING(f'\n{label}: {rows} tasks'))
+        self.stdout.write(f"{'':18}{'ms':>9}{'us/row':>9}")
+        for name, seconds in results.items():
+            self.stdout.write(f'{name:18}{seconds * 1000:>9.2f}{seconds / rows * 1e6:>9.2f}')
+        build_speedup = results['serializers'] / results['lean']
+        total_speedup = ((results['serializers'] + results['JSONRenderer'])
+                         / (results['lean'] + results['FastJSONRenderer']))
+        renderer = 'orjson' if orjson else 'orjson not installed, same renderer'
+        self.stdout.write(self.style.SUCCESS(
+            f'build {build_speedup:.1f}x faster; build + render {total_speedup:.1f}x faster ({renderer})'))
+
+    def cpu(self, func):
+        """Median process CPU time of `func` (queries included, SQLite runs in-process)."""
+        samples = []
+        for _ in range(self.repeat):
+            started = time.process_time()
+            func()
+            samples.append(time.process_time() - started)
+        return statistics.median(samples)
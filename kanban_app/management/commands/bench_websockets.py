@@ -0,0 +1,116 @@
+import asyncio
+import gc
+import statistics
+import time
+import tracemalloc
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from rest_framework.authtoken.models import Token
+from kanban_app.api.websocket import board_socket
+from kanban_app.models import Board
+from kanban_app.realtime import broker
+
+
+class Connection:
+    """In-memory ASGI channel pair for one WebSocket client."""
+
+    def __init__(self, bench, path):
+        self.bench = bench
+        self.scope = {'type': 'websocket', 'path': path, 'query_string': f'token={bench.token}'.encode(),
+                      'headers': []}
+        self.inbox = asyncio.Queue()
+        self.inbox.put_nowait({'type': 'websocket.connect'})
+
+    async def receive(self):
+        return await self.inbox.get()
+
+    async def send(self, message):
+        if message['type'] == 'websocket.accept':
+            self.bench.accepted()
+        elif message['type'] == 'websocket.send':
+            self.bench.delivered()
+
+
+class Command(BaseCommand):
+    """
+    Measures idle WebSocket connections per worker, in-process: opens N
+    connections against the ASGI board socket (on a scratch test database),
+    reports memory per idle connection and broadcast fan-out latency.
+    Only the application side is measured; the ASGI server adds its own
+    per-socket buffers on top.
+    """
+    help = 'Open many idle board WebSocket connections in-process and measure memory and fan-out latency.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--connections', type=int, default=5_000)
+        parser.add_argument('--broadcasts', type=int, default=20)
+
+    def handle(self, *args, **options):
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            user = User.objects.create_user(username='bench@example.com', email='bench@example.com')
+            self.token = Token.objects.create(user=user).key
+            self.board_id = Board.objects.create(title='Bench', owner_id=user).pk
+            asyncio.run(self.run(options['connections'], options['broadcasts']))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def accepted(self):
+        self.pending -= 1
+        if not self.pending:
+            self.done.set()
+
+    def delivered(self):
+        self.pending -= 1
+        self.latencies.append(time.perf_counter() - self.published_at)
+        if not self.pending:
+            self.done.set()
+
+    async def wait_for(self, count):
+        self.pending = count
+        self.done = asyncio.Event()
+        return self.done
+
+    async def run(self, count, broadcasts):
+        path = f'/ws/boards/{self.board_id}/'
+        gc.collect()
+        tracemalloc.start()
+        baseline = tracemalloc.take_snapshot()
+
+        done = await self.wait_for(count)
+        started = time.perf_counter()
+        connections = [Connection(self, path) for _ in range(count)]
+        handlers = [asyncio.ensure_future(board_socket(c.scope, c.receive, c.send)) for c in connections]
+        await done.wait()
+        connect_seconds = time.perf_counter() - started
+
+        await asyncio.sleep(0)
+        gc.collect()
+        idle = tracemalloc.take_snapshot()
+        per_connection = sum(stat.size_diff for stat in idle.compare_to(baseline, 'filename')) / count
+        tracemalloc.stop()
+
+        broadcast_ms = []
+        loop = asyncio.get_running_loop()
+        for seq in range(broadcasts):
+            self.latencies = []
+            done = await self.wait_for(count)
+            self.published_at = time.perf_counter()
+            event = {'type': 'changes', 'cursor': seq, 'changes': []}
+            await loop.run_in_executor(None, broker.publish, self.board_id, event)
+            await done.wait()
+            broadcast_ms.append(max(self.latencies) * 1000)
+        delivery_ms = statistics.median(self.latencies) * 1000
+
+        for c in connections:
+            c.inbox.put_nowait({'type': 'websocket.disconnect', 'code': 1000})
+        await asyncio.gather(*handlers)
+
+        self.stdout.write(f'Connections:           {count}, accepted in {connect_seconds:.2f}s (under tracemalloc)')
+        self.stdout.write(f'Memory per idle conn:  {per_connection / 1024:.1f} KiB (incl. bench channels)')
+        self.stdout.write(f'Broadcast to all, p50: {statistics.median(broadcast_ms):.1f} ms')
+        self.stdout.write(f'Broadcast to all, max: {max(broadcast_ms):.1f} ms')
+        self.stdout.write(f'Median delivery:       {delivery_ms:.1f} ms (last broadcast)')
+        self.stdout.write(self.style.SUCCESS(f'Subscribers left after disconnect: {broker.subscriber_count()}'))
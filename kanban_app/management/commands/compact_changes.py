@@ -0,0 +1,23 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from kanban_app.changes import compact
+
+
+class Command(BaseCommand):
+    """
+    Compacts the board change logs: entries older than the retention window
+    are deleted and each board remembers how far its log was cut, so clients
+    with older cursors are told to reload the board.
+    """
+    help = 'Delete change feed entries older than the retention window.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.KANBAN_CHANGE_RETENTION_DAYS,
+                            help='Keep entries of the last N days (default: KANBAN_CHANGE_RETENTION_DAYS).')
+
+    def handle(self, *args, **options):
+        deleted = compact(timezone.now() - timedelta(days=options['days']))
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} change log entries.'))
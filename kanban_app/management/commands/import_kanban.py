@@ -0,0 +1,66 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from kanban_app.imports import Importer, read_rows
+from kanban_app.membership import is_member_or_owner
+from kanban_app.models import Board, ImportJob
+
+
+class Command(BaseCommand):
+    """
+    Imports boards, tasks and comments from NDJSON (the export format) or
+    tasks from CSV into a board, in chunked transactions. Prints rows/s per
+    chunk. A failed run prints its job id; rerun with `--resume ID` and the
+    same file to continue after the last committed chunk.
+    """
+    help = 'Bulk import boards/tasks/comments from NDJSON or tasks from CSV (optionally gzipped).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--user', help='Email of the importing user (owner of new boards).')
+        parser.add_argument('--format', choices=[ImportJob.NDJSON, ImportJob.CSV],
+                            help='Default: from the file extension.')
+        parser.add_argument('--board', type=int, help='Target board for CSV imports.')
+        parser.add_argument('--resume', type=int, metavar='JOB_ID', help='Continue a failed import job.')
+        parser.add_argument('--chunk-size', type=int, help='Rows per transaction (default: KANBAN_IMPORT_CHUNK_SIZE).')
+
+    def handle(self, *args, **options):
+        job = self.resume_job(options['resume']) if options['resume'] else self.create_job(options)
+        importer = Importer(job, options['chunk_size'], progress=self.report)
+        with open(options['path'], 'rb') as stream:
+            try:
+                importer.run(read_rows(stream, job.format))
+            except Exception as exc:
+                raise CommandError(f'Import #{job.pk} failed at row {job.position + 1}: {exc}\n'
+                                   f'Resume with --resume {job.pk}.')
+        rate = job.position / job.seconds if job.seconds else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'Import #{job.pk}: {job.position} rows in {job.seconds:.1f}s ({rate:.0f} rows/s); '
+            f'{job.boards_created} boards, {job.tasks_created} tasks, {job.comments_created} comments, '
+            f'{job.rows_skipped} rows skipped.'))
+        for error in job.errors:
+            self.stdout.write(f"  row {error['row']}: {error['error']}")
+
+    def create_job(self, options):
+        user = User.objects.filter(email=options['user']).first() if options['user'] else None
+        if user is None:
+            raise CommandError('--user must be the email of an existing user.')
+        path = options['path'].lower().removesuffix('.gz')
+        format = options['format'] or (ImportJob.CSV if path.endswith('.csv') else ImportJob.NDJSON)
+        board = None
+        if options['board'] is not None:
+            board = Board.objects.filter(pk=options['board']).first()
+            if board is None or not is_member_or_owner(board, user.pk):
+                raise CommandError(f"Board {options['board']} does not exist or {user.email} is not a member.")
+        elif format == ImportJob.CSV:
+            raise CommandError('--board is required for CSV imports.')
+        return ImportJob.objects.create(created_by=user, format=format, board=board)
+
+    def resume_job(self, job_id):
+        job = ImportJob.objects.filter(pk=job_id).first()
+        if job is None or job.status == ImportJob.DONE:
+            raise CommandError(f'Import #{job_id} does not exist or has finished.')
+        self.stdout.write(f'Resuming import #{job.pk} after row {job.position}.')
+        return job
+
+    def report(self, job, rows_per_second):
+        self.stdout.write(f'{job.position} rows, {rows_per_second:.0f} rows/s')
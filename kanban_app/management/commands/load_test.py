@@ -0,0 +1,271 @@
+import http.client
+import io
+import json
+import random
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+HOST = 'localhost'
+STATUSES = ['to-do', 'in-progress', 'review', 'done']
+MIX = {
+    'board_list': 20,
+    'board_detail': 15,
+    'task_patch': 20,
+    'comment_list': 25,
+    'comment_create': 15,
+    'login': 5,
+}
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, max(int(len(sorted_values) * fraction + 0.5) - 1, 0))]
+
+
+class HttpTransport:
+    """Keep-alive HTTP/1.1 against a running server, one connection per thread."""
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise CommandError('--url must look like http://host:port')
+        self.connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.address = (parts.hostname, parts.port)
+        self.prefix = parts.path.rstrip('/')
+        self.local = threading.local()
+
+    def request(self, method, path, body, headers):
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = self.local.connection = self.connection_class(*self.address, timeout=60)
+        try:
+            connection.request(method, self.prefix + path, body=body, headers=headers)
+            response = connection.getresponse()
+            return response.status, response.read()
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            self.local.connection = None
+            raise
+
+
+class WsgiTransport:
+    """In-process calls into `core.wsgi` against the configured database (no network or server overhead)."""
+
+    def __init__(self):
+        from core.wsgi import application
+        self.application = application
+
+    def request(self, method, path, body, headers):
+        path, _, query = path.partition('?')
+        body = body or b''
+        environ = {
+            'REQUEST_METHOD': method, 'PATH_INFO': path, 'QUERY_STRING': query, 'SCRIPT_NAME': '',
+            'SERVER_NAME': HOST, 'SERVER_PORT': '80', 'HTTP_HOST': HOST, 'SERVER_PROTOCOL': 'HTTP/1.1',
+            'CONTENT_LENGTH': str(len(body)), 'wsgi.input': io.BytesIO(body), 'wsgi.errors': sys.stderr,
+            'wsgi.url_scheme': 'http', 'wsgi.multithread': True, 'wsgi.multiprocess': False,
+        }
+        for name, value in headers.items():
+            key = name.upper().replace('-', '_')
+            environ[key if key == 'CONTENT_TYPE' else f'HTTP_{key}'] = value
+        status = []
+        response = self.application(environ, lambda s, response_headers, exc_info=None: status.append(s))
+        try:
+            content = b''.join(response)
+        finally:
+            response.close()
+        return int(status[0].split()[0]), content
+
+
+class Command(BaseCommand):
+    """
+    Drives the real endpoints with a weighted mix of requests from many
+    seeded users (see `seed_kanban`) and reports throughput and
+    p50/p95/p99 latency per endpoint. Without `--url` requests go through
+    the WSGI application in-process against the configured database; with
+    `--url` they go over HTTP to a running server. Writes are real: tasks
+    change status and comments are added. Each worker's request sequence is
+    fixed by `--seed`, so runs on the same dataset are comparable.
+    """
+    help = 'Load test board list/detail, task PATCH, comments and login; report req/s and p50/p95/p99.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help='Base URL of a running server, e.g. http://localhost:8000.')
+        parser.add_argument('--users', type=int, default=20, help='Seeded users to log in as ({prefix}0..N-1).')
+        parser.add_argument('--prefix', default='load')
+        parser.add_argument('--password', default='kanban-load-test')
+        parser.add_argument('--requests', type=int, default=2_000)
+        parser.add_argument('--duration', type=float, help='Run for this many seconds instead of --requests.')
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--mix', help='Weights as name=weight,... (default: %s).'
+                            % ','.join(f'{name}={weight}' for name, weight in MIX.items()))
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--json', metavar='PATH', help='Also write the results as JSON.')
+
+    def handle(self, *args, **options):
+        self.transport = HttpTransport(options['url']) if options['url'] else WsgiTransport()
+        self.mix = self.parse_mix(options['mix']) if options['mix'] else MIX
+        self.password = options['password']
+        self.sessions = self.log_in(options)
+        results, seconds = self.drive(options)
+        report = self.summarize(results, seconds)
+        self.print_report(report, options)
+        if options['json']:
+            with open(options['json'], 'w') as file:
+                json.dump(report, file, indent=2)
+
+    def parse_mix(self, value):
+        mix = {}
+        for item in value.split(','):
+            name, _, weight = item.partition('=')
+            if name not in MIX or not weight.isdigit():
+                raise CommandError(f'--mix: expected name=weight with a name from {", ".join(MIX)}.')
+            mix[name] = int(weight)
+        if not any(mix.values()):
+            raise CommandError('--mix: at least one weight must be positive.')
+        return mix
+
+    def call(self, method, path, token=None, data=None):
+        headers = {'Accept': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Token {token}'
+        body = None
+        if data is not None:
+            body = json.dumps(data).encode()
+            headers['Content-Type'] = 'application/json'
+        return self.transport.request(method, path, body, headers)
+
+    def log_in(self, options):
+        """Log in the seeded users and collect the boards and tasks each one can reach."""
+        sessions = []
+        for i in range(options['users']):
+            email = f"{options['prefix']}{i}@example.com"
+            status, body = self.call('POST', '/api/login/', data={'email': email, 'password': self.password})
+            if status != 200:
+                raise CommandError(f'Login as {email} failed ({status}); seed users with seed_kanban first.')
+            token = json.loads(body)['token']
+            boards = self.collect('/api/boards/?page_size=500', token)
+            tasks = [task for board in boards
+                     for task in self.collect(f'/api/tasks/?board={board}&fields=id&page_size=100', token)]
+            if boards:
+                sessions.append({'email': email, 'token': token, 'boards': boards, 'tasks': tasks})
+        if not any(session['tasks'] for session in sessions):
+            raise CommandError('None of the users can see any task; seed data with seed_kanban first.')
+        self.stdout.write(f'{len(sessions)} of {options["users"]} users have boards.')
+        return sessions
+
+    def collect(self, path, token):
+        """Ids from the first page of a paginated list."""
+        status, body = self.call('GET', path, token)
+        if status != 200:
+            raise CommandError(f'GET {path} failed ({status}).')
+        return [item['id'] for item in json.loads(body)['results']]
+
+    def request_for(self, name, rng):
+        """(method, path, token, data) of one operation for a random session."""
+        session = rng.choice(self.sessions)
+        token = session['token']
+        if name in ('task_patch', 'comment_list', 'comment_create') and not session['tasks']:
+            session = rng.choice([session for session in self.sessions if session['tasks']])
+            token = session['token']
+        if name == 'board_list':
+            return 'GET', '/api/boards/', token, None
+        if name == 'board_detail':
+            return 'GET', f"/api/boards/{rng.choice(session['boards'])}/", token, None
+        task_id = rng.choice(session['tasks']) if session['tasks'] else None
+        if name == 'task_patch':
+            return 'PATCH', f'/api/tasks/{task_id}/', token, {'status': rng.choice(STATUSES)}
+        if name == 'comment_list':
+            return 'GET', f'/api/tasks/{task_id}/comments/', token, None
+        if name == 'comment_create':
+            return 'POST', f'/api/tasks/{task_id}/comments/', token, {'content': f'Load test comment {rng.random()}'}
+        return 'POST', '/api/login/', None, {'email': session['email'], 'password': self.password}
+
+    def drive(self, options):
+        """Run workers until the request budget or the duration is used up; latencies per operation."""
+        names = list(self.mix)
+        weights = [self.mix[name] for name in names]
+        results = {name: {'latencies': [], 'errors': 0} for name in names}
+        lock = threading.Lock()
+        budget = [options['requests']]
+        failures = []
+        deadline = time.perf_counter() + options['duration'] if options['duration'] else None
+
+        def next_request():
+            if deadline is not None:
+                return time.perf_counter() < deadline
+            with lock:
+                budget[0] -= 1
+                return budget[0] >= 0
+
+        def work(worker):
+            rng = random.Random(options['seed'] * 1_000 + worker)
+            own = {name: ([], [0]) for name in names}
+            try:
+                while next_request():
+                    name = rng.choices(names, weights)[0]
+                    method, path, token, data = self.request_for(name, rng)
+                    started = time.perf_counter()
+                    try:
+                        status, _ = self.call(method, path, token, data)
+                        failed = status >= 400
+                    except (OSError, http.client.HTTPException):
+                        failed = True
+                    latencies, errors = own[name]
+                    if failed:
+                        errors[0] += 1
+                    else:
+                        latencies.append(time.perf_counter() - started)
+            except Exception as exc:
+                failures.append(exc)
+            finally:
+                if not options['url']:
+                    from django.db import connection
+                    connection.close()
+            with lock:
+                for name, (latencies, errors) in own.items():
+                    results[name]['latencies'] += latencies
+                    results[name]['errors'] += errors[0]
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(options['concurrency'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        seconds = time.perf_counter() - started
+        if failures:
+            raise CommandError(f'A worker failed: {failures[0]!r}')
+        return results, seconds
+
+    def summarize(self, results, seconds):
+        def stats(latencies, errors):
+            latencies = sorted(latencies)
+            return {
+                'requests': len(latencies) + errors,
+                'errors': errors,
+                'rps': (len(latencies) + errors) / seconds,
+                'p50': percentile(latencies, 0.50) * 1000,
+                'p95': percentile(latencies, 0.95) * 1000,
+                'p99': percentile(latencies, 0.99) * 1000,
+            }
+
+        endpoints = {name: stats(result['latencies'], result['errors']) for name, result in results.items()}
+        total = stats([latency for result in results.values() for latency in result['latencies']],
+                      sum(result['errors'] for result in results.values()))
+        return {'seconds': seconds, 'endpoints': endpoints, 'total': total}
+
+    def print_report(self, report, options):
+        target = options['url'] or 'in-process WSGI'
+        self.stdout.write(f"{report['total']['requests']} requests in {report['seconds']:.1f}s against {target}, "
+                          f"concurrency {options['concurrency']}")
+        self.stdout.write(f"{'':16}{'requests':>9}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+        rows = [*report['endpoints'].items(), ('total', report['total'])]
+        for name, row in rows:
+            self.stdout.write(f"{name:16}{row['requests']:>9}{row['rps']:>9.1f}{row['p50']:>9.2f}"
+                              f"{row['p95']:>9.2f}{row['p99']:>9.2f}{row['errors']:>8}")
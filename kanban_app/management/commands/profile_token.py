@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from core.profiling import HEADER, make_token
+
+
+class Command(BaseCommand):
+    """
+    Prints a signed value for the profiling header. Requests carrying it are
+    profiled (see `core.profiling`) until it expires after
+    KANBAN_PROFILE_TOKEN_MAX_AGE seconds.
+    """
+    help = f'Print a signed {HEADER} header value that makes requests get profiled.'
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'{HEADER}: {make_token()}')
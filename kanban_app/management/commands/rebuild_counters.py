@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+from kanban_app.counters import (
+    find_comment_count_drift,
+    find_counter_drift,
+    rebuild_board_counters,
+    rebuild_comment_counts,
+)
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds or verifies the denormalized counters against the source tables:
+    board task/member counters and Task.comments_count.
+    """
+    help = 'Recompute board counters and task comment counts; with --verify only report drift.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', type=int, action='append', dest='boards',
+                            help='Limit to this board id and its tasks (repeatable).')
+        parser.add_argument('--verify', action='store_true',
+                            help='Report drift without writing; exits non-zero if any is found.')
+
+    def handle(self, *args, **options):
+        boards = options['boards']
+        if options['verify']:
+            board_drift = find_counter_drift(boards)
+        else:
+            board_drift = rebuild_board_counters(boards)
+        task_drift = find_comment_count_drift(boards)
+        if task_drift and not options['verify']:
+            rebuild_comment_counts(task_ids=[task.pk for task in task_drift])
+
+        for board, diff in board_drift:
+            changes = ', '.join(f'{field} {stored}->{computed}' for field, (stored, computed) in diff.items())
+            self.stdout.write(f'Board {board.pk}: {changes}')
+        for task in task_drift:
+            self.stdout.write(
+                f'Task {task.pk}: comments_count {task.comments_count}->{task.computed_comments_count}')
+
+        if options['verify']:
+            if board_drift or task_drift:
+                raise CommandError(
+                    f'{len(board_drift)} board(s) and {len(task_drift)} task(s) have drifted counters.')
+            self.stdout.write(self.style.SUCCESS('Counters are consistent.'))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'Rebuilt counters of {len(board_drift)} board(s) and {len(task_drift)} task(s).'))
@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+from kanban_app.models import Task
+from kanban_app.search import get_backend, rebuild_index
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the task search index from the tasks and comments tables, e.g.
+    after raw SQL imports or restoring a database without the FTS5 table data.
+    """
+    help = 'Rebuild the full-text task search index.'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        rebuild_index()
+        self.stdout.write(self.style.SUCCESS(
+            f'Indexed {Task.objects.count()} tasks with {type(get_backend()).__name__} '
+            f'in {time.perf_counter() - started:.2f}s.'))
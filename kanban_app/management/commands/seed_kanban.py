@@ -0,0 +1,42 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from kanban_app.seeding import Seeder
+
+
+class Command(BaseCommand):
+    """
+    Fills the configured database with synthetic users, boards, memberships,
+    tasks and comments (see `kanban_app.seeding`). Board sizes are skewed: a
+    few huge boards and many small ones. Seeded users log in with
+    `{prefix}{i}@example.com` and `--password`, which is what `load_test` uses.
+    """
+    help = 'Seed users, boards, memberships, tasks and comments with realistic skew, using bulk inserts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1_000)
+        parser.add_argument('--boards', type=int, default=200)
+        parser.add_argument('--tasks', type=int, default=100_000)
+        parser.add_argument('--comments', type=int, default=200_000)
+        parser.add_argument('--skew', type=float, default=1.1,
+                            help='Zipf exponent of board sizes; 0 = all boards equal.')
+        parser.add_argument('--max-members', type=int, default=50, help='Members of the largest board.')
+        parser.add_argument('--password', default='kanban-load-test')
+        parser.add_argument('--prefix', default='load', help='Seeded emails are {prefix}{i}@example.com.')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5_000)
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['boards'] < 1:
+            raise CommandError('--users and --boards must be at least 1.')
+        prefix = options['prefix']
+        if User.objects.filter(email__startswith=prefix, email__endswith='@example.com').exists():
+            raise CommandError(f'Users {prefix}*@example.com already exist; pick another --prefix.')
+        seeder = Seeder(
+            users=options['users'], boards=options['boards'], tasks=options['tasks'],
+            comments=options['comments'], skew=options['skew'], max_members=options['max_members'],
+            password=options['password'], prefix=prefix, seed=options['seed'],
+            batch_size=options['batch_size'], log=self.stdout.write,
+        ).run()
+        sizes = sorted(seeder.tasks_per_board.values(), reverse=True)
+        self.stdout.write(self.style.SUCCESS(
+            f'Largest boards: {sizes[:5]} tasks; median board: {sizes[len(sizes) // 2]} tasks.'))
@@ -0,0 +1,142 @@
+"""
+Board membership lookups shared by permissions and serializers.
+
+Member ids of a board are cached per request (on the DRF request object)
+and across requests (in the default cache, under a per-board generation
+number). Membership changes bump the generation after commit, so entries
+filled from a pre-change read can never be served again.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from kanban_app.models import Board
+
+REQUEST_ATTR = '_kanban_member_ids'
+
+
+def _generation_key(board_id):
+    return f'kanban:board-members-gen:{board_id}'
+
+
+def _members_key(board_id, generation):
+    return f'kanban:board-members:{board_id}:{generation}'
+
+
+def _remember(request, member_ids_by_board):
+    if request is not None:
+        memo = getattr(request, REQUEST_ATTR, None)
+        if memo is None:
+            memo = {}
+            setattr(request, REQUEST_ATTR, memo)
+        memo.update(member_ids_by_board)
+
+
+def _memoized(request, board_id):
+    memo = getattr(request, REQUEST_ATTR, None) if request is not None else None
+    return memo.get(board_id) if memo else None
+
+
+def _member_rows(board_id):
+    return Board.members.through.objects.filter(board_id=board_id).values_list('user_id', flat=True)
+
+
+def get_member_ids(board_id, request=None):
+    """Return the frozenset of user ids that are members of the board."""
+    member_ids = _memoized(request, board_id)
+    if member_ids is not None:
+        return member_ids
+
+    generation = cache.get(_generation_key(board_id), 0)
+    key = _members_key(board_id, generation)
+    member_ids = cache.get(key)
+    if member_ids is None:
+        member_ids = frozenset(_member_rows(board_id))
+        cache.set(key, member_ids, settings.KANBAN_MEMBERSHIP_CACHE_TTL)
+    _remember(request, {board_id: member_ids})
+    return member_ids
+
+
+async def aget_member_ids(board_id, request=None):
+    """Async counterpart of `get_member_ids` for async views; shares its cache entries."""
+    member_ids = _memoized(request, board_id)
+    if member_ids is not None:
+        return member_ids
+
+    generation = await cache.aget(_generation_key(board_id), 0)
+    key = _members_key(board_id, generation)
+    member_ids = await cache.aget(key)
+    if member_ids is None:
+        member_ids = frozenset([user_id async for user_id in _member_rows(board_id)])
+        await cache.aset(key, member_ids, settings.KANBAN_MEMBERSHIP_CACHE_TTL)
+    _remember(request, {board_id: member_ids})
+    return member_ids
+
+
+def get_member_ids_many(board_ids, request=None):
+    """
+    Return {board_id: frozenset(member ids)} for several boards with at most
+    two cache round trips and one query for the boards that were not cached.
+    """
+    memo = getattr(request, REQUEST_ATTR, None) if request is not None else None
+    result = {board_id: memo[board_id] for board_id in board_ids if memo and board_id in memo}
+    pending = [board_id for board_id in set(board_ids) if board_id not in result]
+    if pending:
+        generations = cache.get_many([_generation_key(board_id) for board_id in pending])
+        keys = {
+            board_id: _members_key(board_id, generations.get(_generation_key(board_id), 0))
+            for board_id in pending
+        }
+        cached = cache.get_many(keys.values())
+        missing = []
+        for board_id, key in keys.items():
+            if key in cached:
+                result[board_id] = cached[key]
+            else:
+                missing.append(board_id)
+        if missing:
+            loaded = {board_id: set() for board_id in missing}
+            rows = Board.members.through.objects.filter(
+                board_id__in=missing).values_list('board_id', 'user_id')
+            for board_id, user_id in rows:
+                loaded[board_id].add(user_id)
+            fresh = {board_id: frozenset(user_ids) for board_id, user_ids in loaded.items()}
+            cache.set_many({keys[board_id]: ids for board_id, ids in fresh.items()},
+                           settings.KANBAN_MEMBERSHIP_CACHE_TTL)
+            result.update(fresh)
+
+    _remember(request, result)
+    return result
+
+
+def is_member_or_owner(board, user_id, request=None):
+    """True if the user (given by id) owns the board or is one of its members."""
+    if user_id is None:
+        return False
+    return board.owner_id_id == user_id or user_id in get_member_ids(board.pk, request)
+
+
+async def ais_member_or_owner(board, user_id, request=None):
+    """Async counterpart of `is_member_or_owner`."""
+    if user_id is None:
+        return False
+    return board.owner_id_id == user_id or user_id in await aget_member_ids(board.pk, request)
+
+
+def _bump(board_ids):
+    for board_id in board_ids:
+        key = _generation_key(board_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def invalidate_members(board_ids):
+    """
+    Bump the membership generation of the given boards.
+    The second bump after commit discards entries that concurrent requests
+    filled from the pre-commit state while the transaction was open.
+    """
+    board_ids = list(board_ids)
+    _bump(board_ids)
+    transaction.on_commit(lambda: _bump(board_ids))
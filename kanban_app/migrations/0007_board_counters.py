@@ -0,0 +1,99 @@
+# Generated by Django 5.2.3 on 2026-10-18 04:17
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+STATUS_COUNTERS = {
+    'to-do': 'tasks_to_do_count',
+    'in-progress': 'tasks_in_progress_count',
+    'review': 'tasks_review_count',
+    'done': 'tasks_done_count',
+}
+PRIORITY_COUNTERS = {
+    'low': 'tasks_low_prio_count',
+    'medium': 'tasks_medium_prio_count',
+    'high': 'tasks_high_prio_count',
+}
+
+
+def backfill_counters(apps, schema_editor):
+    """Compute the counters of existing boards from their tasks and members."""
+    Board = apps.get_model('kanban_app', 'Board')
+    Task = apps.get_model('kanban_app', 'Task')
+    Membership = Board.members.through
+    fields = ['member_count', 'ticket_count', *STATUS_COUNTERS.values(), *PRIORITY_COUNTERS.values()]
+
+    aggregates = {'ticket_count': Count('id')}
+    for status, field in STATUS_COUNTERS.items():
+        aggregates[field] = Count('id', filter=Q(status=status))
+    for priority, field in PRIORITY_COUNTERS.items():
+        aggregates[field] = Count('id', filter=Q(priority=priority))
+    task_counts = {
+        row.pop('board'): row
+        for row in Task.objects.order_by().values('board').annotate(**aggregates)
+    }
+    member_counts = dict(
+        Membership.objects.order_by().values('board').annotate(c=Count('id')).values_list('board', 'c'))
+
+    boards = list(Board.objects.all())
+    for board in boards:
+        for field, value in task_counts.get(board.pk, {}).items():
+            setattr(board, field, value)
+        board.member_count = member_counts.get(board.pk, 0)
+    Board.objects.bulk_update(boards, fields, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0006_access_pattern_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='member_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='tasks_done_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='tasks_high_prio_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='tasks_in_progress_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='tasks_low_prio_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='tasks_medium_prio_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='tasks_review_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='tasks_to_do_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='ticket_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.3 on 2026-10-18 04:19
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_comments_count(apps, schema_editor):
+    """Count the existing comments of every task in a single UPDATE."""
+    Task = apps.get_model('kanban_app', 'Task')
+    Comment = apps.get_model('kanban_app', 'Comment')
+    comment_count = Comment.objects.filter(
+        task=OuterRef('pk')
+    ).order_by().values('task').annotate(c=Count('*')).values('c')
+    Task.objects.update(
+        comments_count=Coalesce(Subquery(comment_count, output_field=IntegerField()), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0007_board_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_comments_count, migrations.RunPython.noop),
+    ]
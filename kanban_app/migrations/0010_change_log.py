@@ -0,0 +1,44 @@
+# Generated by Django 5.2.3 on 2026-10-18 04:27
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def start_logs_at_current_version(apps, schema_editor):
+    """Changes before the log existed are unknown; clients of existing boards start with a reset."""
+    Board = apps.get_model('kanban_app', 'Board')
+    Board.objects.update(change_log_start=F('version'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0009_version_stamps'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='change_log_start',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='BoardChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seq', models.PositiveBigIntegerField()),
+                ('kind', models.CharField(choices=[('task', 'Task'), ('comment', 'Comment')], max_length=10)),
+                ('object_id', models.PositiveIntegerField()),
+                ('task_id', models.PositiveIntegerField()),
+                ('action', models.CharField(choices=[('created', 'Created'), ('updated', 'Updated'), ('deleted', 'Deleted')], max_length=10)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('board', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='changes', to='kanban_app.board')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['board', 'seq'], name='boardchange_board_seq_idx'), models.Index(fields=['created_at'], name='boardchange_created_idx')],
+            },
+        ),
+        migrations.RunPython(start_logs_at_current_version, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+FTS_TABLE = 'kanban_task_search'
+
+
+def create_fts_table(apps, schema_editor):
+    """FTS5 index of task title, description and comments; only on SQLite (see kanban_app.search)."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+        f"USING fts5(title, description, comments, tokenize = 'unicode61 remove_diacritics 2')")
+    schema_editor.execute(
+        f"INSERT INTO {FTS_TABLE} (rowid, title, description, comments) "
+        f"SELECT t.id, t.title, t.description, COALESCE("
+        f"(SELECT group_concat(c.content, char(10)) FROM kanban_app_comment c WHERE c.task_id = t.id), '') "
+        f"FROM kanban_app_task t")
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0010_change_log'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
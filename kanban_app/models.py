@@ -1,10 +1,79 @@
 from django.contrib.auth.models import User
 from django.db import models
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+# Task status/priority value -> Board counter field that tracks it.
+STATUS_COUNTERS = {
+    'to-do': 'tasks_to_do_count',
+    'in-progress': 'tasks_in_progress_count',
+    'review': 'tasks_review_count',
+    'done': 'tasks_done_count',
+}
+PRIORITY_COUNTERS = {
+    'low': 'tasks_low_prio_count',
+    'medium': 'tasks_medium_prio_count',
+    'high': 'tasks_high_prio_count',
+}
+
+
+def saved_fields(instance, maintained):
+    """
+    Loaded concrete fields a plain `save()` of an existing row writes: all but
+    the `maintained` ones, which are only ever changed with F() updates and may
+    be stale on the instance.
+    """
+    deferred = instance.get_deferred_fields()
+    return [
+        field.name for field in instance._meta.concrete_fields
+        if not field.primary_key and field.name not in maintained and field.attname not in deferred
+    ]
+
+
+class BoardQuerySet(models.QuerySet):
+    """
+    Query helpers for boards: visibility per user and list counters.
+    """
+
+    def visible_to(self, user):
+        """
+        Return boards where the user is either owner or member.
+        Membership is matched via subquery so no members join leaks into annotations.
+        """
+        member_board_ids = Board.members.through.objects.filter(
+            user=user).values('board_id')
+        qs_owner = self.filter(owner_id=user)
+        qs_member = self.filter(pk__in=member_board_ids)
+        return (qs_owner | qs_member).distinct()
+
+    def with_computed_counters(self):
+        """
+        Annotate every denormalized counter as `computed_<field>`, derived from
+        the tasks and members tables. Used to rebuild and verify the stored values.
+        Tasks are the only multi-valued join, so task counts are not inflated;
+        members are counted in a correlated subquery.
+        """
+        member_count = Board.members.through.objects.filter(
+            board=OuterRef('pk')
+        ).order_by().values('board').annotate(c=Count('*')).values('c')
+        annotations = {
+            'computed_member_count': Coalesce(Subquery(member_count, output_field=IntegerField()), 0),
+            'computed_ticket_count': Count('tasks'),
+        }
+        for status, field in STATUS_COUNTERS.items():
+            annotations[f'computed_{field}'] = Count('tasks', filter=Q(tasks__status=status))
+        for priority, field in PRIORITY_COUNTERS.items():
+            annotations[f'computed_{field}'] = Count('tasks', filter=Q(tasks__priority=priority))
+        return self.annotate(**annotations)
 
 
 class Board(models.Model):
     """
     Represents a Kanban board that contains multiple tasks and members.
+    Task and member counters are denormalized and kept current by `kanban_app.counters`;
+    `version`/`updated_at` change whenever the board or anything on it changes.
+    Change log entries up to `change_log_start` have been compacted away.
     """
     title = models.CharField(max_length=100)
     members = models.ManyToManyField(
@@ -17,6 +86,36 @@ class Board(models.Model):
         related_name='owned_boards'
     )
 
+    member_count = models.PositiveIntegerField(default=0)
+    ticket_count = models.PositiveIntegerField(default=0)
+    tasks_to_do_count = models.PositiveIntegerField(default=0)
+    tasks_in_progress_count = models.PositiveIntegerField(default=0)
+    tasks_review_count = models.PositiveIntegerField(default=0)
+    tasks_done_count = models.PositiveIntegerField(default=0)
+    tasks_low_prio_count = models.PositiveIntegerField(default=0)
+    tasks_medium_prio_count = models.PositiveIntegerField(default=0)
+    tasks_high_prio_count = models.PositiveIntegerField(default=0)
+
+    version = models.PositiveBigIntegerField(default=1)
+    updated_at = models.DateTimeField(default=timezone.now)
+    change_log_start = models.PositiveBigIntegerField(default=0)
+
+    objects = BoardQuerySet.as_manager()
+
+    # Written by `kanban_app.counters`, `kanban_app.versions` and change log compaction only.
+    MAINTAINED_FIELDS = frozenset([
+        'member_count', 'ticket_count', *STATUS_COUNTERS.values(), *PRIORITY_COUNTERS.values(),
+        'version', 'updated_at', 'change_log_start',
+    ])
+
+    def save(self, *args, **kwargs):
+        """
+        Updates leave the counters and version stamp alone (see `saved_fields`).
+        """
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = saved_fields(self, self.MAINTAINED_FIELDS)
+        super().save(*args, **kwargs)
+
     def __str__(self):
         """
         Returns the board title for display purposes.
@@ -27,6 +126,8 @@ class Board(models.Model):
 class Task(models.Model):
     """
     Represents a task within a board. Can be assigned to a user and reviewed by another.
+    `comments_count` is denormalized and kept current by `kanban_app.counters`;
+    `version`/`updated_at` change whenever the task or its comments change.
     """
     title = models.CharField(max_length=100)
     description = models.TextField(blank=True, default='')
@@ -78,6 +179,39 @@ class Task(models.Model):
         default='medium'
     )
 
+    comments_count = models.PositiveIntegerField(default=0)
+
+    version = models.PositiveBigIntegerField(default=1)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['board', 'status'], name='task_board_status_idx'),
+            models.Index(fields=['board', 'priority'], name='task_board_priority_idx'),
+            models.Index(fields=['assignee', 'due_date'], name='task_assignee_due_idx'),
+            models.Index(fields=['reviewer', 'status'], name='task_reviewer_status_idx'),
+        ]
+
+    # Written by `kanban_app.counters` and `kanban_app.versions` only.
+    MAINTAINED_FIELDS = frozenset(['comments_count', 'version', 'updated_at'])
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remember the loaded values so counter updates can tell what changed.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        Updates leave comments_count and the version stamp alone (see `saved_fields`).
+        """
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = saved_fields(self, self.MAINTAINED_FIELDS)
+        super().save(*args, **kwargs)
+
     def __str__(self):
         """
         Returns a readable string showing task title and its board.
@@ -101,14 +235,144 @@ class Comment(models.Model):
     )
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['created_at']
         verbose_name = "Comment"
         verbose_name_plural = "Comments"
+        indexes = [
+            models.Index(fields=['task', 'created_at'], name='comment_task_created_idx'),
+        ]
 
     def __str__(self):
         """
         Returns the comment author and task title.
         """
         return f'Comment by {self.author.username} on {self.task.title}'
+
+
+class BoardChange(models.Model):
+    """
+    Append-only log of task and comment changes on a board, read by the change feed.
+    `seq` is the board version right after the change, so it grows per board.
+    Entries outlive the objects (and boards) they describe, hence no FK constraints.
+    """
+    TASK = 'task'
+    COMMENT = 'comment'
+    CREATED = 'created'
+    UPDATED = 'updated'
+    DELETED = 'deleted'
+
+    board = models.ForeignKey(
+        Board,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='changes'
+    )
+    seq = models.PositiveBigIntegerField()
+    kind = models.CharField(
+        max_length=10,
+        choices=[(TASK, 'Task'), (COMMENT, 'Comment')]
+    )
+    object_id = models.PositiveIntegerField()
+    task_id = models.PositiveIntegerField()
+    action = models.CharField(
+        max_length=10,
+        choices=[(CREATED, 'Created'), (UPDATED, 'Updated'), (DELETED, 'Deleted')]
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['board', 'seq'], name='boardchange_board_seq_idx'),
+            models.Index(fields=['created_at'], name='boardchange_created_idx'),
+        ]
+
+    def __str__(self):
+        """
+        Returns the change in a compact readable form.
+        """
+        return f'#{self.seq} {self.kind} {self.object_id} {self.action} on board {self.board_id}'
+
+
+class ImportJob(models.Model):
+    """
+    One bulk import run (see `kanban_app.imports`). `position` counts the input
+    rows whose chunk has committed, so a failed import resumes right after it.
+    `board` is the board rows are currently imported into.
+    """
+    NDJSON = 'ndjson'
+    CSV = 'csv'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    DONE = 'done'
+
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='import_jobs'
+    )
+    board = models.ForeignKey(
+        Board,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    format = models.CharField(
+        max_length=10,
+        choices=[(NDJSON, 'NDJSON'), (CSV, 'CSV')]
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=[(RUNNING, 'Running'), (FAILED, 'Failed'), (DONE, 'Done')],
+        default=RUNNING
+    )
+    position = models.PositiveBigIntegerField(default=0)
+    boards_created = models.PositiveIntegerField(default=0)
+    tasks_created = models.PositiveIntegerField(default=0)
+    comments_created = models.PositiveIntegerField(default=0)
+    rows_skipped = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    seconds = models.FloatField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        """
+        Returns the job id, format and status.
+        """
+        return f'Import #{self.pk} ({self.format}, {self.status})'
+
+
+class ImportRecord(models.Model):
+    """
+    Source id -> created object id of an import job, so comments find their
+    tasks (and a resumed job its boards) across chunks.
+    """
+    BOARD = 'board'
+    TASK = 'task'
+
+    job = models.ForeignKey(
+        ImportJob,
+        on_delete=models.CASCADE,
+        related_name='records'
+    )
+    kind = models.CharField(
+        max_length=10,
+        choices=[(BOARD, 'Board'), (TASK, 'Task')]
+    )
+    source_id = models.CharField(max_length=64)
+    object_id = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'kind', 'source_id'], name='importrecord_source_uniq'),
+        ]
+
+    def __str__(self):
+        """
+        Returns the mapping in a compact readable form.
+        """
+        return f'{self.kind} {self.source_id} -> {self.object_id} (import #{self.job_id})'
@@ -0,0 +1,119 @@
+"""
+In-process fan-out of board events to WebSocket subscribers.
+
+Subscribers live on an asyncio event loop (the ASGI server's), while events
+are published from synchronous Django code after the transaction commits.
+`publish` therefore hands each event to the subscriber loops with one
+`call_soon_threadsafe` per loop, which then fills the per-connection queues.
+A subscriber that falls behind has its queue replaced by a single `resync`
+event, so slow clients cost bounded memory and re-read the change feed.
+
+The broker only reaches connections of the current process. With several
+ASGI workers, run one per machine or replace `broker` with a shared one.
+"""
+import asyncio
+import json
+import threading
+
+from django.conf import settings
+from django.db import transaction
+
+RESYNC = ('resync', json.dumps({'type': 'resync'}))
+STOP = (None, None)
+
+
+class Subscriber:
+    """
+    One connection's subscription to one board. The queue holds
+    (event type, JSON text) pairs; events are encoded once per publish.
+    """
+    __slots__ = ('board_id', 'queue', 'loop')
+
+    def __init__(self, board_id, loop):
+        self.board_id = board_id
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=settings.KANBAN_WS_QUEUE_SIZE)
+
+    def deliver(self, message):
+        """Runs on the subscriber's loop."""
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.replace_pending(RESYNC)
+
+    def stop(self):
+        """Discard pending events and make the reader see STOP next."""
+        self.replace_pending(STOP)
+
+    def replace_pending(self, message):
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+
+class Broker:
+    """Board id -> subscribers registry; safe to publish from any thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._boards = {}
+
+    def subscribe(self, board_id):
+        """Register the running loop's connection for the board's events."""
+        subscriber = Subscriber(board_id, asyncio.get_running_loop())
+        with self._lock:
+            self._boards.setdefault(board_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            subscribers = self._boards.get(subscriber.board_id)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._boards[subscriber.board_id]
+
+    def subscriber_count(self, board_id=None):
+        with self._lock:
+            if board_id is not None:
+                return len(self._boards.get(board_id, ()))
+            return sum(len(subscribers) for subscribers in self._boards.values())
+
+    def publish(self, board_id, event):
+        """Deliver the event to every subscriber of the board, grouped per event loop."""
+        with self._lock:
+            subscribers = list(self._boards.get(board_id, ()))
+        if not subscribers:
+            return
+        message = (event['type'], json.dumps(event))
+        by_loop = {}
+        for subscriber in subscribers:
+            by_loop.setdefault(subscriber.loop, []).append(subscriber)
+        for loop, group in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(_deliver_all, group, message)
+            except RuntimeError:
+                # The loop was closed; its connections are gone.
+                pass
+
+
+def _deliver_all(subscribers, message):
+    for subscriber in subscribers:
+        subscriber.deliver(message)
+
+
+broker = Broker()
+
+
+def publish_after_commit(board_id, event):
+    """Publish once the current transaction commits (immediately outside one)."""
+    transaction.on_commit(lambda: broker.publish(board_id, event))
+
+
+def changes_event(entries):
+    """Event for change log entries of one board; clients fetch data from the change feed."""
+    return {
+        'type': 'changes',
+        'cursor': max(entry['seq'] for entry in entries),
+        'changes': entries,
+    }
@@ -0,0 +1,50 @@
+"""
+Server-side cache of serialized board detail payloads.
+
+The payload of `BoardDetailSerializer` does not depend on the requesting
+user (access is decided by the permission layer beforehand), so one entry
+per board serves every member. Entries carry the board version they were
+built from and are only served for that version; signal handlers also drop
+them after commit when tasks, comments or memberships change.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+
+def _cache():
+    return caches[settings.KANBAN_RESPONSE_CACHE_ALIAS]
+
+
+def _key(board_id):
+    return f'kanban:board-detail:{board_id}'
+
+
+def get_board_detail(board):
+    """Cached payload for this board version, or None."""
+    entry = _cache().get(_key(board.pk))
+    if entry is not None and entry[0] == board.version:
+        return entry[1]
+    return None
+
+
+def set_board_detail(board, data):
+    _cache().set(_key(board.pk), (board.version, data), settings.KANBAN_BOARD_DETAIL_CACHE_TTL)
+
+
+async def aget_board_detail(board):
+    """Async counterpart of `get_board_detail`."""
+    entry = await _cache().aget(_key(board.pk))
+    if entry is not None and entry[0] == board.version:
+        return entry[1]
+    return None
+
+
+async def aset_board_detail(board, data):
+    await _cache().aset(_key(board.pk), (board.version, data), settings.KANBAN_BOARD_DETAIL_CACHE_TTL)
+
+
+def invalidate_board_detail(board_ids):
+    """Drop cached payloads of the given boards once the transaction commits."""
+    keys = [_key(board_id) for board_id in set(board_ids)]
+    transaction.on_commit(lambda: _cache().delete_many(keys))
@@ -0,0 +1,212 @@
+"""
+Full-text search over tasks: title, description and the task's comments.
+
+Each task is one document with three weighted fields. On SQLite the index is
+an FTS5 table (`kanban_task_search`, created by migration 0011) written in
+the same transaction as the task or comment, and ranked with bm25(). Other
+databases use `MemoryIndex`, an in-process inverted index with the same
+tokenization and BM25 weighting. It is built from the database on the
+first search and then kept current after commit; other processes' writes
+reach it only when it is rebuilt (see `rebuild_index`).
+
+The signal handlers in `kanban_app.signals` call `index_tasks` and
+`remove_tasks`; search is always scoped to the given boards.
+"""
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection, transaction
+from kanban_app.models import Task, Comment
+
+FTS_TABLE = 'kanban_task_search'
+FIELDS = ('title', 'description', 'comments')
+WEIGHTS = (10.0, 3.0, 1.0)
+TOKEN = re.compile(r'[^\W_]+')
+
+
+def tokenize(text):
+    """Lowercased word tokens without diacritics, like FTS5's unicode61 tokenizer."""
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return TOKEN.findall(text)
+
+
+def documents(task_ids=None):
+    """Yield (task_id, board_id, title, description, comments) from the database."""
+    tasks = Task.objects.order_by('pk').values_list('pk', 'board_id', 'title', 'description')
+    comments = Comment.objects.order_by('task_id', 'pk').values_list('task_id', 'content')
+    if task_ids is not None:
+        tasks = tasks.filter(pk__in=task_ids)
+        comments = comments.filter(task_id__in=task_ids)
+    by_task = {}
+    for task_id, content in comments.iterator(chunk_size=2000):
+        by_task.setdefault(task_id, []).append(content)
+    for task_id, board_id, title, description in tasks.iterator(chunk_size=2000):
+        yield task_id, board_id, title, description, '\n'.join(by_task.get(task_id, ()))
+
+
+class Fts5Backend:
+    """SQLite FTS5 table keyed by task id; rows change in the writer's transaction."""
+
+    def index(self, task_ids):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({_placeholders(task_ids)})', task_ids)
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, description, comments) VALUES (%s, %s, %s, %s)',
+                [(task_id, title, description, comments)
+                 for task_id, _, title, description, comments in documents(task_ids)])
+
+    def remove(self, task_ids):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({_placeholders(task_ids)})', task_ids)
+
+    def rebuild(self):
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, description, comments) '
+                f'SELECT t.id, t.title, t.description, COALESCE('
+                f'(SELECT group_concat(c.content, char(10)) FROM kanban_app_comment c WHERE c.task_id = t.id), \'\') '
+                f'FROM kanban_app_task t')
+
+    def search(self, terms, board_ids, limit):
+        if not board_ids:
+            return []
+        match = ' '.join(f'"{term}"' for term in terms)
+        weights = ', '.join(str(weight) for weight in WEIGHTS)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT s.rowid, bm25({FTS_TABLE}, {weights}) AS rank FROM {FTS_TABLE} s '
+                f'JOIN kanban_app_task t ON t.id = s.rowid '
+                f'WHERE {FTS_TABLE} MATCH %s AND t.board_id IN ({_placeholders(board_ids)}) '
+                f'ORDER BY rank LIMIT %s',
+                [match, *board_ids, limit])
+            # bm25() is lower-is-better; expose higher-is-better scores.
+            return [(task_id, -rank) for task_id, rank in cursor.fetchall()]
+
+
+class MemoryIndex:
+    """
+    In-process inverted index: term -> {task id: weighted term frequency},
+    scored with BM25 over the weighted fields. Updates are applied after commit.
+    """
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.postings = {}
+        self.docs = {}
+        self.total_length = 0.0
+
+    def index(self, task_ids):
+        transaction.on_commit(lambda: self._apply(list(documents(task_ids)), task_ids))
+
+    def remove(self, task_ids):
+        transaction.on_commit(lambda: self._apply([], task_ids))
+
+    def rebuild(self):
+        docs = list(documents())
+        with self.lock:
+            self.postings, self.docs, self.total_length = {}, {}, 0.0
+            for doc in docs:
+                self._add(*doc)
+            self.loaded = True
+
+    def _apply(self, docs, task_ids):
+        with self.lock:
+            if not self.loaded:
+                return
+            for task_id in task_ids:
+                self._drop(task_id)
+            for doc in docs:
+                self._add(*doc)
+
+    def _add(self, task_id, board_id, *fields):
+        frequencies = Counter()
+        for weight, text in zip(WEIGHTS, fields):
+            for term in tokenize(text):
+                frequencies[term] += weight
+        length = sum(frequencies.values())
+        self.docs[task_id] = (board_id, length, tuple(frequencies))
+        self.total_length += length
+        for term, frequency in frequencies.items():
+            self.postings.setdefault(term, {})[task_id] = frequency
+
+    def _drop(self, task_id):
+        doc = self.docs.pop(task_id, None)
+        if doc is None:
+            return
+        self.total_length -= doc[1]
+        for term in doc[2]:
+            postings = self.postings[term]
+            del postings[task_id]
+            if not postings:
+                del self.postings[term]
+
+    def search(self, terms, board_ids, limit):
+        if not self.loaded:
+            self.rebuild()
+        board_ids = set(board_ids)
+        with self.lock:
+            lists = [self.postings.get(term, {}) for term in terms]
+            if not lists or not all(lists):
+                return []
+            lists.sort(key=len)
+            count = len(self.docs)
+            average = self.total_length / count
+            scores = {}
+            for task_id in lists[0]:
+                doc = self.docs[task_id]
+                if doc[0] not in board_ids or not all(task_id in postings for postings in lists[1:]):
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * doc[1] / average)
+                scores[task_id] = sum(
+                    math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                    * postings[task_id] * (self.k1 + 1) / (postings[task_id] + norm)
+                    for postings in lists)
+        return sorted(scores.items(), key=lambda item: -item[1])[:limit]
+
+
+def _placeholders(values):
+    return ', '.join(['%s'] * len(values))
+
+
+_memory_index = MemoryIndex()
+
+
+def get_backend():
+    """FTS5 on SQLite unless `KANBAN_SEARCH_BACKEND` says 'memory'."""
+    if settings.KANBAN_SEARCH_BACKEND == 'memory' or connection.vendor != 'sqlite':
+        return _memory_index
+    return Fts5Backend()
+
+
+def index_tasks(task_ids):
+    """(Re)index the given tasks from their current title, description and comments."""
+    task_ids = list(task_ids)
+    if task_ids:
+        get_backend().index(task_ids)
+
+
+def remove_tasks(task_ids):
+    task_ids = list(task_ids)
+    if task_ids:
+        get_backend().remove(task_ids)
+
+
+def rebuild_index():
+    get_backend().rebuild()
+
+
+def search_tasks(query, board_ids, limit):
+    """Return [(task_id, score)], best first, for tasks on the given boards matching every query term."""
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms:
+        return []
+    return get_backend().search(terms, list(board_ids), limit)
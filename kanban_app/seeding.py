@@ -0,0 +1,144 @@
+"""
+Synthetic data at production-like scale, for load tests and benchmarks.
+
+Board sizes follow a Zipf-like law (`skew`): board i gets a share of the
+tasks proportional to 1 / (i + 1) ** skew, so a few boards are huge and most
+are small. Member counts grow with board size. Assignees, reviewers and
+comment authors are members (or the owner) of the task's board, and
+comment counts per task are heavy-tailed. Everything is inserted with
+bulk_create; counters are rebuilt at the end. The same `seed` yields the
+same data.
+"""
+import itertools
+import random
+import time
+from collections import Counter
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from kanban_app import counters, search
+from kanban_app.models import Board, Task, Comment
+
+STATUSES = ['to-do', 'in-progress', 'review', 'done']
+PRIORITIES = ['low', 'medium', 'high']
+WORDS = ('login bug release api design review mobile sync cache search export import board task '
+         'comment deploy database index latency error retry token email layout onboarding').split()
+
+
+class Seeder:
+    """
+    Seeds users `{prefix}{i}@example.com` (all with `password`), boards,
+    memberships, tasks and comments. After `run()`, `user_ids`, `emails`,
+    `board_ids` and `task_ids` list what was created and `tasks_per_board`
+    counts the tasks of each board.
+    """
+
+    def __init__(self, users=1_000, boards=200, tasks=100_000, comments=200_000, skew=1.1,
+                 max_members=50, password='kanban-load-test', prefix='load', seed=42,
+                 batch_size=5_000, maintain=True, log=None):
+        self.users = users
+        self.boards = boards
+        self.tasks = tasks
+        self.comments = comments
+        self.skew = skew
+        self.max_members = max_members
+        self.password = password
+        self.prefix = prefix
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.maintain = maintain
+        self.log = log or (lambda message: None)
+
+    def run(self):
+        started = time.perf_counter()
+        self.seed_users()
+        self.seed_boards()
+        self.seed_tasks()
+        self.seed_comments()
+        if self.maintain:
+            self.log('Rebuilding counters and the search index...')
+            counters.rebuild_board_counters(self.board_ids)
+            counters.rebuild_comment_counts(board_ids=self.board_ids)
+            search.rebuild_index()
+        self.log(f'Seeded {len(self.user_ids)} users, {len(self.board_ids)} boards, {len(self.task_ids)} tasks, '
+                 f'{self.comments} comments in {time.perf_counter() - started:.1f}s')
+        return self
+
+    def seed_users(self):
+        # One hash for everyone: hashing per user would dominate seeding time.
+        password = make_password(self.password)
+        emails = [f'{self.prefix}{i}@example.com' for i in range(self.users)]
+        users = User.objects.bulk_create(
+            [User(username=email, email=email, password=password, first_name='Load', last_name=f'User {i}')
+             for i, email in enumerate(emails)], batch_size=self.batch_size)
+        self.user_ids = [user.pk for user in users]
+        self.emails = emails
+
+    def seed_boards(self):
+        """Board 0 is the biggest; `weights` holds each board's share of tasks."""
+        rng = self.rng
+        raw = [1 / (i + 1) ** self.skew for i in range(self.boards)]
+        self.weights = [weight / sum(raw) for weight in raw]
+        self.cum_weights = list(itertools.accumulate(self.weights))
+        owners = [rng.choice(self.user_ids) for _ in range(self.boards)]
+        boards = Board.objects.bulk_create(
+            [Board(title=f'{rng.choice(WORDS).title()} board {i}', owner_id_id=owner)
+             for i, owner in enumerate(owners)], batch_size=self.batch_size)
+        self.board_ids = [board.pk for board in boards]
+
+        Membership = Board.members.through
+        self.people = {}
+        memberships = []
+        for board_id, owner, weight in zip(self.board_ids, owners, self.weights):
+            count = max(2, min(self.max_members, round(self.max_members * weight / self.weights[0])))
+            members = [user for user in rng.sample(self.user_ids, min(count, len(self.user_ids))) if user != owner]
+            memberships += [Membership(board_id=board_id, user_id=user) for user in members]
+            self.people[board_id] = [owner, *members]
+        Membership.objects.bulk_create(memberships, batch_size=self.batch_size)
+
+    def seed_tasks(self):
+        rng = self.rng
+        remaining = self.tasks
+        self.task_ids = []
+        self.task_boards = {}
+        while remaining > 0:
+            size = min(self.batch_size, remaining)
+            boards = rng.choices(self.board_ids, cum_weights=self.cum_weights, k=size)
+            tasks = Task.objects.bulk_create([self.make_task(board_id) for board_id in boards],
+                                             batch_size=self.batch_size)
+            self.task_ids += [task.pk for task in tasks]
+            self.task_boards.update((task.pk, task.board_id) for task in tasks)
+            remaining -= size
+        self.tasks_per_board = Counter(self.task_boards.values())
+
+    def make_task(self, board_id):
+        rng = self.rng
+        people = self.people[board_id]
+        return Task(
+            title=' '.join(rng.sample(WORDS, 3)).capitalize(),
+            description=' '.join(rng.choices(WORDS, k=rng.randint(0, 40))),
+            board_id=board_id,
+            created_by_id=rng.choice(people),
+            assignee_id=rng.choice(people) if rng.random() < 0.8 else None,
+            reviewer_id=rng.choice(people) if rng.random() < 0.5 else None,
+            status=rng.choice(STATUSES),
+            priority=rng.choice(PRIORITIES),
+            due_date=None if rng.random() < 0.3 else f'2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+        )
+
+    def seed_comments(self):
+        """Heavy-tailed comments per task: task weights drawn from a Pareto distribution."""
+        rng = self.rng
+        if not self.task_ids:
+            return
+        cum_weights = list(itertools.accumulate(rng.paretovariate(1.2) for _ in self.task_ids))
+        remaining = self.comments
+        while remaining > 0:
+            size = min(self.batch_size, remaining)
+            tasks = rng.choices(self.task_ids, cum_weights=cum_weights, k=size)
+            Comment.objects.bulk_create([
+                Comment(task_id=task_id, author_id=rng.choice(self.people[self.task_boards[task_id]]),
+                        content=' '.join(rng.choices(WORDS, k=rng.randint(3, 30))))
+                for task_id in tasks
+            ], batch_size=self.batch_size)
+            remaining -= size
@@ -0,0 +1,315 @@
+import threading
+
+from django.contrib.auth.models import User
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import Signal, receiver
+from kanban_app import changes, counters, membership, realtime, response_cache, search, versions
+from kanban_app.models import Board, BoardChange, Task, Comment
+
+TRACKED_TASK_FIELDS = ('board_id', 'status', 'priority')
+SEARCH_TASK_FIELDS = ('board_id', 'title', 'description')
+# User fields embedded in board, task and comment payloads.
+DISPLAYED_USER_FIELDS = ('email', 'first_name', 'last_name')
+
+# Sent after bulk_create/bulk_update of tasks (which skip post_save) with
+# `created` and `updated` lists of Task instances. Bulk deletes go through
+# the ORM; their post_delete work is grouped by `DeletionBatch`.
+tasks_bulk_written = Signal()
+
+
+def deleting(origin, *models):
+    """Whether the delete() call started from an instance or queryset of one of `models`."""
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, models)
+
+
+class DeletionBatch(threading.local):
+    """
+    Groups the post_delete work of one delete() call, which the collector
+    sends row by row. `add` (from pre_delete, sent for every row before
+    anything is deleted) counts the rows per group key; `done` (from
+    post_delete) calls `flush(key, rows, origin)` once the last row of a
+    group is gone. A new origin starts a new batch, so state left by a
+    failed delete is dropped.
+    """
+
+    def __init__(self, key, flush):
+        self.key = key
+        self.flush = flush
+        self.origin = None
+        self.pending = {}
+
+    def add(self, instance, origin):
+        if origin is not self.origin:
+            self.origin, self.pending = origin, {}
+        group = self.pending.setdefault(self.key(instance), [0, []])
+        group[0] += 1
+
+    def done(self, instance, origin):
+        key = self.key(instance)
+        group = self.pending.get(key) if origin is self.origin else None
+        if group is None:  # not announced by pre_delete
+            self.flush(key, [instance], origin)
+            return
+        group[1].append(instance)
+        if len(group[1]) == group[0]:
+            del self.pending[key]
+            self.flush(key, group[1], origin)
+
+
+@receiver(pre_save, sender=Task)
+def remember_task_values(sender, instance, **kwargs):
+    """
+    Make sure the pre-update board/status/priority are known before saving.
+    Instances loaded with deferred fields (or built by hand) are topped up from the DB.
+    """
+    if instance._state.adding:
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    if all(field in loaded for field in TRACKED_TASK_FIELDS):
+        return
+    current = Task.objects.filter(pk=instance.pk).values(*TRACKED_TASK_FIELDS).first()
+    instance._loaded_values = {**loaded, **(current or {})}
+
+
+@receiver(post_save, sender=Board)
+def bump_version_on_board_save(sender, instance, created, **kwargs):
+    """Title changes must invalidate cached/conditional board responses."""
+    if not created:
+        versions.touch_boards([instance.pk])
+
+
+@receiver(post_save, sender=Task)
+def update_counters_on_task_save(sender, instance, created, **kwargs):
+    """
+    Adjust board counters (and board version) for a created or updated task,
+    bump the task version and append the write to the board's change log.
+    """
+    loaded = getattr(instance, '_loaded_values', {})
+    if created or not all(field in loaded for field in TRACKED_TASK_FIELDS):
+        counters.task_created(instance)
+    else:
+        counters.task_updated(instance, loaded)
+        versions.touch_tasks([instance.pk])
+    changes.task_saved(instance, created, loaded.get('board_id'))
+    instance._loaded_values = {
+        **loaded, **{field: getattr(instance, field) for field in TRACKED_TASK_FIELDS}}
+
+
+def tasks_deleted(board_id, tasks, origin):
+    """
+    Once per board and delete() call: drop the tasks from the search index and
+    the cached board detail and, unless the board goes too, from its counters
+    and into its change log.
+    """
+    task_ids = [task.pk for task in tasks]
+    if not deleting(origin, Board):
+        counters.tasks_deleted(board_id, tasks)
+        changes.tasks_deleted(board_id, task_ids)
+    response_cache.invalidate_board_detail([board_id])
+    search.remove_tasks(task_ids)
+
+
+task_deletions = DeletionBatch(lambda task: task.board_id, tasks_deleted)
+
+
+@receiver(pre_delete, sender=Task)
+def announce_task_delete(sender, instance, origin=None, **kwargs):
+    task_deletions.add(instance, origin)
+
+
+@receiver(post_delete, sender=Task)
+def update_on_task_delete(sender, instance, origin=None, **kwargs):
+    task_deletions.done(instance, origin)
+
+
+@receiver(post_save, sender=Comment)
+def update_comments_count_on_save(sender, instance, created, **kwargs):
+    """
+    Count a new comment on its task; edits only bump the task and board versions.
+    Either way the write is appended to the board's change log.
+    """
+    if created:
+        counters.comment_created(instance)
+    else:
+        versions.touch_tasks([instance.task_id])
+        versions.touch_board_of_task(instance.task_id)
+    changes.comment_written(instance, BoardChange.CREATED if created else BoardChange.UPDATED)
+
+
+def comments_deleted(task_id, comments, origin):
+    """
+    Once per task and delete() call: uncount and log the deleted comments,
+    reindex the task and drop the cached board detail (see
+    `invalidate_board_detail_on_comment`).
+    """
+    counters.comments_deleted(task_id, len(comments))
+    changes.comments_deleted(task_id, [comment.pk for comment in comments])
+    if Comment.task.is_cached(comments[0]):
+        response_cache.invalidate_board_detail([comments[0].task.board_id])
+    search.index_tasks([task_id])
+
+
+comment_deletions = DeletionBatch(lambda comment: comment.task_id, comments_deleted)
+
+
+@receiver(pre_delete, sender=Comment)
+def announce_comment_delete(sender, instance, origin=None, **kwargs):
+    """Comments deleted with their task (or board) need no work of their own."""
+    if not deleting(origin, Task, Board):
+        comment_deletions.add(instance, origin)
+
+
+@receiver(post_delete, sender=Comment)
+def update_on_comment_delete(sender, instance, origin=None, **kwargs):
+    if not deleting(origin, Task, Board):
+        comment_deletions.done(instance, origin)
+
+
+@receiver(m2m_changed, sender=Board.members.through)
+def update_member_count(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Keep member_count and the membership cache in sync with the membership table,
+    from either side of the relation.
+    Added pks are exactly the new rows; removals may name non-members, so they are recounted.
+    """
+    if action == 'pre_clear' and reverse:
+        instance._cleared_board_ids = list(instance.boards.values_list('pk', flat=True))
+    elif action == 'post_add' and pk_set:
+        if reverse:
+            counters.members_added(pk_set)
+            membership.invalidate_members(pk_set)
+        else:
+            counters.members_added([instance.pk], count=len(pk_set))
+            membership.invalidate_members([instance.pk])
+    elif action in ('post_remove', 'post_clear'):
+        if reverse:
+            board_ids = pk_set if action == 'post_remove' else instance._cleared_board_ids
+        else:
+            board_ids = [instance.pk]
+        counters.recount_members(board_ids)
+        membership.invalidate_members(board_ids)
+
+
+@receiver(pre_delete, sender=User)
+def remember_boards_of_deleted_user(sender, instance, **kwargs):
+    """A user's membership rows are deleted without m2m_changed; note the boards to recount."""
+    instance._member_board_ids = list(instance.boards.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=User)
+def recount_members_of_deleted_user(sender, instance, **kwargs):
+    board_ids = getattr(instance, '_member_board_ids', None)
+    if board_ids:
+        counters.recount_members(board_ids)
+        membership.invalidate_members(board_ids)
+        response_cache.invalidate_board_detail(board_ids)
+        for board_id in board_ids:
+            realtime.publish_after_commit(board_id, {'type': 'members'})
+
+
+@receiver(post_save, sender=Board)
+@receiver(post_save, sender=Task)
+def invalidate_board_detail_on_change(sender, instance, **kwargs):
+    """Board or task writes make the cached board detail stale."""
+    response_cache.invalidate_board_detail([instance.pk if sender is Board else instance.board_id])
+
+
+@receiver(post_save, sender=Comment)
+def invalidate_board_detail_on_comment(sender, instance, **kwargs):
+    """
+    Comments change comments_count in the board detail. The board is only
+    known without a query when the task is cached on the comment; otherwise
+    the board version bump alone keeps the stale entry from being served.
+    """
+    if Comment.task.is_cached(instance):
+        response_cache.invalidate_board_detail([instance.task.board_id])
+
+
+@receiver(m2m_changed, sender=Board.members.through)
+def invalidate_board_detail_on_membership(sender, instance, action, reverse, pk_set, **kwargs):
+    """Member lists are part of the board detail."""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        response_cache.invalidate_board_detail([instance.pk])
+    elif action == 'post_clear':
+        response_cache.invalidate_board_detail(instance._cleared_board_ids)
+    elif pk_set:
+        response_cache.invalidate_board_detail(pk_set)
+
+
+@receiver(pre_save, sender=User)
+def flag_displayed_user_changes(sender, instance, update_fields=None, **kwargs):
+    """
+    Note whether a name or email shown in board, task or comment payloads
+    changes. Saves limited to other fields (like `last_login`) skip the lookup.
+    """
+    instance._displayed_stale = False
+    if instance._state.adding or (update_fields is not None and not set(update_fields) & set(DISPLAYED_USER_FIELDS)):
+        return
+    current = User.objects.filter(pk=instance.pk).values(*DISPLAYED_USER_FIELDS).first()
+    instance._displayed_stale = current is not None and any(
+        current[field] != getattr(instance, field) for field in DISPLAYED_USER_FIELDS)
+
+
+@receiver(post_save, sender=User)
+def touch_boards_of_changed_user(sender, instance, **kwargs):
+    """Conditional GETs and the cached board detail must not keep serving the old name."""
+    if getattr(instance, '_displayed_stale', False):
+        response_cache.invalidate_board_detail(versions.touch_user(instance.pk))
+
+
+@receiver(tasks_bulk_written)
+def invalidate_board_detail_on_bulk_write(sender, created, updated, **kwargs):
+    response_cache.invalidate_board_detail({task.board_id for task in [*created, *updated]})
+
+
+@receiver(tasks_bulk_written)
+def log_bulk_task_writes(sender, created, updated, **kwargs):
+    changes.tasks_written(created, updated)
+
+
+@receiver(m2m_changed, sender=Board.members.through)
+def notify_subscribers_on_membership(sender, instance, action, reverse, pk_set, **kwargs):
+    """Connected clients refresh members; removed members are disconnected."""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        board_ids = [instance.pk]
+    else:
+        board_ids = instance._cleared_board_ids if action == 'post_clear' else pk_set or ()
+    for board_id in board_ids:
+        realtime.publish_after_commit(board_id, {'type': 'members'})
+
+
+@receiver(post_delete, sender=Board)
+def notify_subscribers_on_board_delete(sender, instance, **kwargs):
+    realtime.publish_after_commit(instance.pk, {'type': 'board_deleted'})
+
+
+@receiver(pre_save, sender=Task)
+def flag_search_changes(sender, instance, **kwargs):
+    """Reindex only new tasks and tasks whose searchable text (or board) changed."""
+    loaded = getattr(instance, '_loaded_values', {})
+    instance._search_stale = instance._state.adding or any(
+        field not in loaded or loaded[field] != getattr(instance, field) for field in SEARCH_TASK_FIELDS)
+
+
+@receiver(post_save, sender=Task)
+def index_task_on_save(sender, instance, **kwargs):
+    if getattr(instance, '_search_stale', True):
+        search.index_tasks([instance.pk])
+    instance._loaded_values.update({field: getattr(instance, field) for field in SEARCH_TASK_FIELDS})
+
+
+@receiver(post_save, sender=Comment)
+def index_task_on_comment(sender, instance, **kwargs):
+    search.index_tasks([instance.task_id])
+
+
+@receiver(tasks_bulk_written)
+def index_bulk_created_tasks(sender, created, updated, **kwargs):
+    """Bulk updates only touch status, priority, people and due date; nothing to reindex."""
+    search.index_tasks(task.pk for task in created)
@@ -1,3 +1,1104 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import io
+import json
+import pstats
+import tempfile
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import DatabaseError, connection
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.serializers import Serializer
+from rest_framework.test import APIClient, APITestCase
+from rest_framework.views import APIView
+from core.database import database_from_env
+from core.metrics import registry
+from core.profiling import ProfilingMiddleware, make_token
+from core import tracing
+from core.tracing import OtlpHttpExporter, Span, Trace
+from kanban_app.api import async_views
+from kanban_app.api.renderers import FastJSONRenderer
+from kanban_app.api.views import TaskViewSet
+from kanban_app.api.websocket import board_socket
+from kanban_app.changes import compact
+from kanban_app.counters import find_comment_count_drift, find_counter_drift, rebuild_comment_counts
+from kanban_app.imports import Importer, read_rows
+from kanban_app.models import Board, Task, Comment, ImportJob
+from kanban_app.realtime import broker
+from kanban_app.seeding import Seeder
+from kanban_app import search
+
+
+class BoardDetailQueryBudgetTests(APITestCase):
+    """
+    Board detail must be built in a fixed number of queries, independent of
+    how many tasks, comments and members the board has.
+    Measured with a cold cache so the membership lookup is included.
+    """
+    QUERY_CEILING = 4
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        self.member = User.objects.create_user(username='member@example.com', email='member@example.com')
+        self.board = Board.objects.create(title='Board', owner_id=self.owner)
+        self.board.members.set([self.owner, self.member])
+        self.client.force_authenticate(self.member)
+
+    def add_tasks(self, count):
+        tasks = Task.objects.bulk_create([
+            Task(title=f'Task {i}', board=self.board, created_by=self.owner,
+                 assignee=self.member, reviewer=self.owner)
+            for i in range(count)
+        ])
+        Comment.objects.bulk_create([
+            Comment(task=task, author=self.member, content='Comment')
+            for task in tasks for _ in range(2)
+        ])
+        rebuild_comment_counts(board_ids=[self.board.pk])
+
+    def get_detail(self):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/boards/{self.board.pk}/')
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_query_count_stays_within_ceiling(self):
+        self.add_tasks(50)
+        response, num_queries = self.get_detail()
+        self.assertLessEqual(num_queries, self.QUERY_CEILING)
+        self.assertEqual(len(response.data['tasks']), 50)
+        self.assertEqual(response.data['tasks'][0]['comments_count'], 2)
+        self.assertEqual(response.data['tasks'][0]['assignee']['email'], 'member@example.com')
+
+    def test_query_count_does_not_grow_with_tasks(self):
+        self.add_tasks(5)
+        _, small = self.get_detail()
+        self.add_tasks(100)
+        _, large = self.get_detail()
+        self.assertEqual(small, large)
+
+
+class BoardListTests(APITestCase):
+    """The board list reads its counts from the counter columns, in the same queries for any number of boards."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        self.members = [User.objects.create_user(username=f'user{i}@example.com', email=f'user{i}@example.com')
+                        for i in range(3)]
+        self.client.force_authenticate(self.owner)
+
+    def add_board(self, members, tasks):
+        board = Board.objects.create(title='Board', owner_id=self.owner)
+        board.members.set(members)
+        for status, priority in tasks:
+            Task.objects.create(title='Task', board=board, created_by=self.owner, status=status, priority=priority)
+        return board
+
+    def get_boards(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/boards/')
+        self.assertEqual(response.status_code, 200)
+        return response.data['results'], len(queries)
+
+    def test_counters(self):
+        board = self.add_board(self.members, [('to-do', 'high'), ('to-do', 'low'), ('done', 'high'),
+                                              ('review', 'medium')])
+        Task.objects.filter(board=board, status='review').get().delete()
+        board.members.remove(self.members[0])
+        task = Task.objects.get(board=board, status='done')
+        task.status = 'to-do'
+        task.save()
+        [row], _ = self.get_boards()
+        self.assertEqual(
+            {key: row[key] for key in ('member_count', 'ticket_count', 'tasks_to_do_count', 'tasks_high_prio_count')},
+            {'member_count': 2, 'ticket_count': 3, 'tasks_to_do_count': 3, 'tasks_high_prio_count': 2})
+
+    def test_query_count_does_not_grow_with_boards(self):
+        self.add_board(self.members[:1], [('to-do', 'high')])
+        _, small = self.get_boards()
+        for _ in range(10):
+            self.add_board(self.members, [('to-do', 'high'), ('done', 'low')])
+        rows, large = self.get_boards()
+        self.assertEqual(len(rows), 11)
+        self.assertEqual((small, large), (2, 2))
+
+
+class CommentThreadQueryBudgetTests(APITestCase):
+    """
+    A comment thread page costs the same queries however long it is:
+    the task with its board, then the comments with their authors.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        self.board = Board.objects.create(title='Board', owner_id=self.owner)
+        self.task = Task.objects.create(title='Task', board=self.board, created_by=self.owner)
+        authors = [self.owner] + [
+            User.objects.create_user(username=f'user{i}@example.com', email=f'user{i}@example.com')
+            for i in range(3)]
+        self.board.members.set(authors[1:])
+        Comment.objects.bulk_create([
+            Comment(task=self.task, author=authors[i % 4], content='Comment') for i in range(300)])
+        self.client.force_authenticate(self.owner)
+
+    def test_long_thread_in_constant_queries(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/tasks/{self.task.pk}/comments/?page_size=300')
+        self.assertEqual(len(response.data['results']), 300)
+
+
+class StaleSaveTests(APITestCase):
+    """Saving an instance loaded before a concurrent change keeps the maintained columns."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        self.board = Board.objects.create(title='Board', owner_id=self.owner)
+        Task.objects.create(title='First', board=self.board, created_by=self.owner)
+
+    def test_board_save_keeps_counters_and_version(self):
+        stale = Board.objects.get(pk=self.board.pk)
+        Task.objects.create(title='Second', board=self.board, created_by=self.owner, priority='high')
+        version = Board.objects.get(pk=self.board.pk).version
+        stale.title = 'Renamed'
+        stale.save()
+        board = Board.objects.get(pk=self.board.pk)
+        self.assertEqual((board.title, board.ticket_count, board.tasks_high_prio_count), ('Renamed', 2, 1))
+        self.assertGreater(board.version, version)
+        self.assertEqual(find_counter_drift([self.board.pk]), [])
+
+    def test_task_save_keeps_comments_count_and_version(self):
+        task = Task.objects.get()
+        stale = Task.objects.get(pk=task.pk)
+        for _ in range(2):
+            Comment.objects.create(task=task, author=self.owner, content='Comment')
+        version = Task.objects.get(pk=task.pk).version
+        stale.status = 'done'
+        stale.save()
+        task = Task.objects.get(pk=task.pk)
+        self.assertEqual((task.status, task.comments_count), ('done', 2))
+        self.assertGreater(task.version, version)
+        self.assertEqual(find_counter_drift([self.board.pk]), [])
+
+    def test_comment_delete_survives_drifted_counter(self):
+        task = Task.objects.get()
+        comment = Comment.objects.create(task=task, author=self.owner, content='Comment')
+        Task.objects.filter(pk=task.pk).update(comments_count=0)
+        self.client.force_authenticate(self.owner)
+        response = self.client.delete(f'/api/tasks/{task.pk}/comments/{comment.pk}/')
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(Task.objects.get(pk=task.pk).comments_count, 0)
+
+
+class DeletionTests(APITestCase):
+    """Cascading deletes do their counter, change log and search work once per task or board, not per row."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        self.board = Board.objects.create(title='Board', owner_id=self.owner)
+
+    def add_task(self, comments):
+        task = Task.objects.create(title='Task', board=self.board, created_by=self.owner)
+        for _ in range(comments):
+            Comment.objects.create(task=task, author=self.owner, content='Comment')
+        return task
+
+    def count_queries(self, delete):
+        with CaptureQueriesContext(connection) as queries:
+            delete()
+        return len(queries)
+
+    def indexed(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM {search.FTS_TABLE}')
+            return cursor.fetchone()[0]
+
+    def test_task_delete_does_not_grow_with_comments(self):
+        small, large = self.add_task(1), self.add_task(30)
+        self.assertEqual(self.count_queries(small.delete), self.count_queries(large.delete))
+        self.assertEqual(find_counter_drift([self.board.pk]), [])
+        self.assertEqual(self.indexed(), 0)
+
+    def test_comment_queryset_delete_is_grouped_per_task(self):
+        first, second = self.add_task(3), self.add_task(2)
+        with CaptureQueriesContext(connection) as queries:
+            Comment.objects.filter(task__board=self.board).delete()
+        task_updates = [query for query in queries if query['sql'].startswith('UPDATE "kanban_app_task"')]
+        self.assertEqual(len(task_updates), 2)
+        self.assertEqual(find_comment_count_drift([self.board.pk]), [])
+        deleted = self.board.changes.filter(kind='comment', action='deleted')
+        self.assertEqual(sorted(deleted.values_list('task_id', flat=True)), [first.pk] * 3 + [second.pk] * 2)
+
+    def test_user_delete_recounts_members(self):
+        member, other = (User.objects.create_user(username=f'{name}@example.com', email=f'{name}@example.com')
+                         for name in ('member', 'other'))
+        second = Board.objects.create(title='Second', owner_id=self.owner)
+        for board in (self.board, second):
+            board.members.set([member, other])
+        Task.objects.create(title='Task', board=self.board, created_by=self.owner, assignee=member)
+        member.delete()
+        self.assertEqual(find_counter_drift([self.board.pk, second.pk]), [])
+        self.assertEqual(Board.objects.get(pk=second.pk).member_count, 1)
+
+    def test_board_delete_clears_search(self):
+        self.add_task(2)
+        self.board.delete()
+        self.assertEqual(self.indexed(), 0)
+        self.assertFalse(Comment.objects.exists())
+
+
+class BulkTaskTests(APITestCase):
+    """The bulk endpoint checks access per item and keeps counters and versions consistent."""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        self.stranger = User.objects.create_user(username='stranger@example.com', email='stranger@example.com')
+        self.board = Board.objects.create(title='Board', owner_id=self.owner)
+        self.other_board = Board.objects.create(title='Other', owner_id=self.stranger)
+        self.task = Task.objects.create(title='Task', board=self.board, created_by=self.owner)
+        self.doomed = Task.objects.create(title='Doomed', board=self.board, created_by=self.owner, priority='high')
+        self.foreign = Task.objects.create(title='Foreign', board=self.other_board, created_by=self.stranger)
+        self.client.force_authenticate(self.owner)
+
+    def bulk(self, **payload):
+        return self.client.post('/api/tasks/bulk/', payload, format='json')
+
+    def test_atomic_batch_rolls_back(self):
+        response = self.bulk(create=[{'board': self.board.pk, 'title': 'New'}],
+                             update=[{'id': self.task.pk, 'status': 'done'}, {'id': self.task.pk + 1000}],
+                             delete=[self.doomed.pk])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors'], [{'op': 'update', 'index': 1, 'errors': {'id': ['Task not found.']}}])
+        self.assertEqual(Task.objects.filter(board=self.board).count(), 2)
+        self.assertEqual(Task.objects.get(pk=self.task.pk).status, 'to-do')
+
+    def test_non_atomic_batch_reports_item_errors(self):
+        response = self.bulk(atomic=False, create=[{'board': self.board.pk, 'title': 'New'}, {'board': self.board.pk}],
+                             update=[{'id': self.task.pk, 'assignee_id': self.stranger.pk}])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['created']), 1)
+        self.assertEqual([(error['op'], error['index']) for error in response.data['errors']],
+                         [('create', 1), ('update', 0)])
+        self.assertIn('assignee_id', response.data['errors'][1]['errors'])
+
+    def test_inaccessible_boards_are_rejected(self):
+        response = self.bulk(atomic=False, create=[{'board': self.other_board.pk, 'title': 'Sneaky'}],
+                             update=[{'id': self.foreign.pk, 'status': 'done'}], delete=[self.foreign.pk])
+        self.assertEqual(response.data['created'] + response.data['updated'] + response.data['deleted'], [])
+        self.assertEqual(len(response.data['errors']), 3)
+        self.assertEqual(Task.objects.get(pk=self.foreign.pk).status, 'to-do')
+
+    def test_mixed_batch_keeps_counters_and_bumps_versions(self):
+        board_version, task_version = self.board.version, Task.objects.get(pk=self.task.pk).version
+        with CaptureQueriesContext(connection) as queries:
+            response = self.bulk(create=[{'board': self.board.pk, 'title': f'New {i}', 'status': 'review'}
+                                         for i in range(3)],
+                                 update=[{'id': self.task.pk, 'status': 'done', 'priority': 'low'}],
+                                 delete=[self.doomed.pk])
+        self.assertEqual(response.status_code, 200)
+        board = Board.objects.get(pk=self.board.pk)
+        self.assertEqual((board.ticket_count, board.tasks_review_count, board.tasks_done_count,
+                          board.tasks_high_prio_count), (4, 3, 1, 0))
+        self.assertEqual(find_counter_drift([self.board.pk]), [])
+        self.assertGreater(board.version, board_version)
+        self.assertGreater(Task.objects.get(pk=self.task.pk).version, task_version)
+        board_updates = [query for query in queries if query['sql'].startswith('UPDATE "kanban_app_board"')]
+        self.assertEqual(len(board_updates), 3)  # one counter update per write kind
+
+
+class BoardDetailCacheTests(APITestCase):
+    """The cached board detail is shared by members and dropped on changes."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        self.member = User.objects.create_user(username='member@example.com', email='member@example.com')
+        self.board = Board.objects.create(title='Board', owner_id=self.owner)
+        self.board.members.set([self.member])
+        self.task = Task.objects.create(title='Task', board=self.board, created_by=self.owner)
+        cache.clear()
+
+    def get_detail(self, user):
+        self.client.force_authenticate(user)
+        response = self.client.get(f'/api/boards/{self.board.pk}/')
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_second_member_is_served_from_cache(self):
+        self.get_detail(self.member)
+        with CaptureQueriesContext(connection) as queries:
+            self.get_detail(self.owner)
+        self.assertEqual(len(queries), 1)
+
+    def test_changes_are_visible_after_caching(self):
+        self.get_detail(self.owner)
+        Comment.objects.create(task=self.task, author=self.owner, content='Comment')
+        self.assertEqual(self.get_detail(self.owner).data['tasks'][0]['comments_count'], 1)
+        Task.objects.create(title='Second', board=self.board, created_by=self.owner)
+        self.assertEqual(len(self.get_detail(self.owner).data['tasks']), 2)
+        self.board.members.remove(self.member)
+        self.assertEqual(self.get_detail(self.owner).data['members'], [])
+
+    def test_user_rename_is_visible_after_caching(self):
+        self.task.assignee = self.member
+        self.task.save()
+        self.get_detail(self.owner)
+        self.member.first_name, self.member.last_name = 'Ada', 'Lovelace'
+        self.member.save()
+        detail = self.get_detail(self.owner).data
+        self.assertEqual(detail['members'][0]['fullname'], 'Ada Lovelace')
+        self.assertEqual(detail['tasks'][0]['assignee']['fullname'], 'Ada Lovelace')
+
+    def test_login_does_not_touch_boards(self):
+        version = Board.objects.get(pk=self.board.pk).version
+        self.member.last_login = timezone.now()
+        self.member.save(update_fields=['last_login'])
+        self.member.save()
+        self.assertEqual(Board.objects.get(pk=self.board.pk).version, version)
+
+
+class ConditionalGetTests(APITestCase):
+    """ETags answer repeat requests with 304 until the response would change."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        self.member = User.objects.create_user(username='member@example.com', email='member@example.com')
+        self.board = Board.objects.create(title='Board', owner_id=self.owner)
+        self.board.members.set([self.member])
+        self.task = Task.objects.create(title='Task', board=self.board, created_by=self.owner, assignee=self.member)
+        Comment.objects.create(task=self.task, author=self.member, content='Comment')
+        self.urls = ['/api/boards/', f'/api/boards/{self.board.pk}/', f'/api/tasks/{self.task.pk}/',
+                     f'/api/tasks/{self.task.pk}/comments/']
+        self.client.force_authenticate(self.owner)
+
+    def etags(self):
+        return [self.client.get(url)['ETag'] for url in self.urls]
+
+    def statuses(self, etags, **headers):
+        return [self.client.get(url, headers={'If-None-Match': etag, **headers}).status_code
+                for url, etag in zip(self.urls, etags)]
+
+    def test_unchanged_responses_are_not_modified(self):
+        etags = self.etags()
+        self.assertEqual(self.statuses(etags), [304] * 4)
+        self.assertEqual(self.statuses(['"other"'] * 4), [200] * 4)
+
+    def test_writes_change_the_etags(self):
+        etags = self.etags()
+        Comment.objects.create(task=self.task, author=self.owner, content='Second')
+        self.assertEqual(self.statuses(etags), [200] * 4)
+        etags = self.etags()
+        Task.objects.create(title='Other', board=self.board, created_by=self.owner)
+        self.assertEqual(self.statuses(etags), [200, 200, 304, 304])
+
+    def test_user_rename_changes_the_etags(self):
+        etags = self.etags()
+        self.member.first_name = 'Ada'
+        self.member.save()
+        self.assertEqual(self.statuses(etags), [200] * 4)
+        self.assertEqual(self.client.get(self.urls[1]).data['members'][0]['fullname'], 'Ada')
+
+    def test_if_modified_since_alone_is_not_honoured(self):
+        detail = self.client.get(self.urls[1])
+        headers = {'If-Modified-Since': detail['Last-Modified']}
+        self.assertEqual(self.client.get(self.urls[1], headers=headers).status_code, 200)
+        self.assertEqual(self.client.get(self.urls[1], headers={**headers, 'If-None-Match': detail['ETag']})
+                         .status_code, 304)
+
+
+class BoardChangeFeedTests(APITestCase):
+    """The change feed returns one entry per changed object after a cursor."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        self.board = Board.objects.create(title='Board', owner_id=self.owner)
+        self.client.force_authenticate(self.owner)
+
+    def get_changes(self, since=None):
+        query = '' if since is None else f'?since={since}'
+        response = self.client.get(f'/api/boards/{self.board.pk}/changes/{query}')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_changes_since_cursor(self):
+        cursor = self.get_changes()['cursor']
+        kept = Task.objects.create(title='Kept', board=self.board, created_by=self.owner)
+        gone = Task.objects.create(title='Gone', board=self.board, created_by=self.owner)
+        kept.status = 'done'
+        kept.save()
+        Comment.objects.create(task=kept, author=self.owner, content='Comment')
+        gone_id = gone.pk
+        gone.delete()
+
+        data = self.get_changes(cursor)
+        entries = {(entry['type'], entry['id']): entry for entry in data['changes']}
+        self.assertFalse(data['reset'])
+        self.assertEqual(entries[('task', kept.pk)]['action'], 'created')
+        self.assertEqual(entries[('task', kept.pk)]['data']['status'], 'done')
+        self.assertEqual(entries[('task', gone_id)]['action'], 'deleted')
+        self.assertIsNone(entries[('task', gone_id)]['data'])
+        self.assertEqual(entries[('comment', kept.comments.get().pk)]['task'], kept.pk)
+        self.assertEqual(self.get_changes(data['cursor'])['changes'], [])
+
+    def test_compacted_cursor_resets(self):
+        cursor = self.get_changes()['cursor']
+        Task.objects.create(title='Task', board=self.board, created_by=self.owner)
+        compact(timezone.now() + timedelta(seconds=1))
+        self.assertTrue(self.get_changes(cursor)['reset'])
+
+
+class TaskSearchTests(APITestCase):
+    """Search matches titles, descriptions and comments on the user's boards and follows writes."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        self.stranger = User.objects.create_user(username='other@example.com', email='other@example.com')
+        self.board = Board.objects.create(title='Board', owner_id=self.owner)
+        self.other_board = Board.objects.create(title='Other', owner_id=self.stranger)
+        self.client.force_authenticate(self.owner)
+
+    def search(self, query, **params):
+        response = self.client.get('/api/tasks/search/', {'q': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return [task['id'] for task in response.data['results']]
+
+    def test_matches_fields_ranked_and_scoped(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            in_title = Task.objects.create(title='Login bug', board=self.board, created_by=self.owner)
+            in_description = Task.objects.create(
+                title='Ticket', description='The login page shows a bug', board=self.board, created_by=self.owner)
+            in_comment = Task.objects.create(title='Other ticket', board=self.board, created_by=self.owner)
+            Comment.objects.create(task=in_comment, author=self.owner, content='Same login bug on mobile')
+            Task.objects.create(title='Login bug', board=self.other_board, created_by=self.stranger)
+
+        self.assertEqual(self.search('LOGIN bug'), [in_title.pk, in_description.pk, in_comment.pk])
+        self.assertEqual(self.search('mobile'), [in_comment.pk])
+        self.assertEqual(self.search('login', board=self.other_board.pk), [])
+        self.assertEqual(self.client.get('/api/tasks/search/?q=').status_code, 400)
+
+    def test_index_follows_writes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            task = Task.objects.create(title='Draft', board=self.board, created_by=self.owner)
+            comment = Comment.objects.create(task=task, author=self.owner, content='Café menu')
+        self.assertEqual(self.search('cafe'), [task.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            comment.delete()
+            task.refresh_from_db()
+            task.title = 'Final'
+            task.save()
+        self.assertEqual(self.search('draft'), [])
+        self.assertEqual(self.search('cafe'), [])
+        self.assertEqual(self.search('final'), [task.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            task.delete()
+        self.assertEqual(self.search('final'), [])
+
+
+@override_settings(KANBAN_SEARCH_BACKEND='memory')
+class MemoryTaskSearchTests(TaskSearchTests):
+    """Same behaviour with the in-process index."""
+
+    def setUp(self):
+        super().setUp()
+        search.get_backend().loaded = False
+
+
+class TaskListFilterTests(APITestCase):
+    """Task lists filter, order and trim fields (and columns) on request."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        self.board = Board.objects.create(title='Board', owner_id=self.user)
+        today = timezone.localdate()
+        self.overdue = Task.objects.create(title='B overdue', board=self.board, created_by=self.user,
+                                           assignee=self.user, due_date=today - timedelta(days=1))
+        self.done = Task.objects.create(title='C done', board=self.board, created_by=self.user, assignee=self.user,
+                                        status='done', due_date=today - timedelta(days=1))
+        self.later = Task.objects.create(title='A later', board=self.board, created_by=self.user,
+                                         assignee=self.user, priority='high', due_date=today + timedelta(days=3))
+        self.client.force_authenticate(self.user)
+
+    def get_ids(self, path):
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return [task['id'] for task in response.data['results']]
+
+    def test_filters_and_ordering(self):
+        self.assertEqual(self.get_ids('/api/tasks/assigned-to-me/?overdue=true'), [self.overdue.pk])
+        self.assertEqual(self.get_ids('/api/tasks/assigned-to-me/?status=to-do,done&priority=medium'),
+                         [self.overdue.pk, self.done.pk])
+        self.assertEqual(self.get_ids(f'/api/tasks/?board={self.board.pk}&due_date_after={timezone.localdate()}'),
+                         [self.later.pk])
+        self.assertEqual(self.get_ids('/api/tasks/reviewing/?reviewer=none'), [])
+        self.assertEqual(self.get_ids('/api/tasks/assigned-to-me/?ordering=title&page_size=2'),
+                         [self.later.pk, self.overdue.pk])
+        self.assertEqual(self.client.get('/api/tasks/?status=later').status_code, 400)
+        self.assertEqual(self.client.get('/api/tasks/?ordering=due_date').data['results'][0]['id'], self.overdue.pk)
+
+    def test_task_list_is_scoped_to_own_boards(self):
+        stranger = User.objects.create_user(username='stranger@example.com', email='stranger@example.com')
+        Task.objects.create(title='Elsewhere', board=Board.objects.create(title='Other', owner_id=stranger),
+                            created_by=stranger)
+        self.assertEqual(self.get_ids('/api/tasks/?ordering=title'), [self.later.pk, self.overdue.pk, self.done.pk])
+        self.client.force_authenticate(stranger)
+        self.assertEqual(len(self.get_ids('/api/tasks/')), 1)
+        self.assertEqual(self.get_ids(f'/api/tasks/?board={self.board.pk}'), [])
+
+    def test_sparse_fields_skip_columns_and_joins(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/tasks/assigned-to-me/?overdue=true&fields=id,title,due_date')
+        self.assertEqual(response.data['results'], [
+            {'id': self.overdue.pk, 'title': 'B overdue', 'due_date': str(self.overdue.due_date)}])
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('description', queries[0]['sql'])
+        self.assertNotIn('auth_user', queries[0]['sql'])
+        self.assertEqual(self.client.get(f'/api/tasks/{self.later.pk}/?status=done').status_code, 200)
+
+
+class CursorPaginationTests(APITestCase):
+    """Cursor pages cap their size and visit every row exactly once, in order, across ties."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        self.board = Board.objects.create(title='Board', owner_id=self.user)
+        self.client.force_authenticate(self.user)
+
+    def add_tasks(self, titles):
+        return Task.objects.bulk_create([
+            Task(title=title, board=self.board, created_by=self.user) for title in titles])
+
+    def walk(self, path):
+        ids = []
+        while path:
+            response = self.client.get(path)
+            self.assertEqual(response.status_code, 200)
+            ids += [row['id'] for row in response.data['results']]
+            path = response.data['next']
+        return ids
+
+    def test_page_size_is_capped(self):
+        self.add_tasks(['Task'] * (settings.KANBAN_MAX_PAGE_SIZE + 1))
+        response = self.client.get(f'/api/tasks/?page_size={settings.KANBAN_MAX_PAGE_SIZE * 2}')
+        self.assertEqual(len(response.data['results']), settings.KANBAN_MAX_PAGE_SIZE)
+        self.assertIsNotNone(response.data['next'])
+        self.assertEqual(len(self.client.get('/api/tasks/').data['results']), settings.KANBAN_PAGE_SIZE)
+
+    def test_tied_sort_keys_page_stably(self):
+        tasks = self.add_tasks(['B', 'A', 'B', 'B', 'C', 'A', 'B'])
+        for ordering in ('title', '-title'):
+            with self.subTest(ordering=ordering):
+                expected = sorted(tasks, key=lambda task: (task.title, task.pk), reverse=ordering == '-title')
+                self.assertEqual(self.walk(f'/api/tasks/?ordering={ordering}&page_size=2'),
+                                 [task.pk for task in expected])
+
+    def test_comment_thread_is_oldest_first(self):
+        task = self.add_tasks(['Task'])[0]
+        comments = Comment.objects.bulk_create([
+            Comment(task=task, author=self.user, content=str(i)) for i in range(7)])
+        now = timezone.now()
+        for comment, seconds in zip(comments, [3, 1, 3, 2, 1, 3, 0]):
+            comment.created_at = now + timedelta(seconds=seconds)
+        Comment.objects.bulk_update(comments, ['created_at'])
+        expected = sorted(comments, key=lambda comment: (comment.created_at, comment.pk))
+        self.assertEqual(self.walk(f'/api/tasks/{task.pk}/comments/?page_size=2'),
+                         [comment.pk for comment in expected])
+
+
+class BoardExportTests(APITestCase):
+    """The export streams the board, its tasks and comments as NDJSON with users by email."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        self.member = User.objects.create_user(username='member@example.com', email='member@example.com')
+        self.board = Board.objects.create(title='Board', owner_id=self.owner)
+        self.board.members.set([self.member])
+        self.task = Task.objects.create(title='Task', board=self.board, created_by=self.owner, assignee=self.member)
+        self.comment = Comment.objects.create(task=self.task, author=self.member, content='Größe ✓')
+        self.client.force_authenticate(self.member)
+
+    def export(self, query=''):
+        response = self.client.get(f'/api/boards/{self.board.pk}/export/{query}')
+        self.assertEqual(response.status_code, 200)
+        return response, b''.join(response.streaming_content)
+
+    def test_ndjson_lines(self):
+        response, content = self.export()
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = [json.loads(line) for line in content.decode().splitlines()]
+        self.assertEqual([line['type'] for line in lines], ['board', 'task', 'comment'])
+        self.assertEqual(lines[0]['members'], ['member@example.com'])
+        self.assertEqual(lines[1]['assignee'], 'member@example.com')
+        self.assertIsNone(lines[1]['reviewer'])
+        self.assertEqual((lines[2]['task'], lines[2]['content']), (self.task.pk, 'Größe ✓'))
+
+    def test_gzip_matches_plain(self):
+        _, plain = self.export()
+        response, compressed = self.export('?gzip=1')
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertEqual(gzip.decompress(compressed), plain)
+
+    async def test_asgi_streams_asynchronously(self):
+        _, plain = await sync_to_async(self.export)()
+        token = await Token.objects.acreate(user=self.member)
+        response = await self.async_client.get(
+            f'/api/boards/{self.board.pk}/export/', headers={'Authorization': f'Token {token.key}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        self.assertEqual(b''.join([chunk async for chunk in response.streaming_content]), plain)
+
+
+class ImportTests(APITestCase):
+    """Imports stream NDJSON/CSV into boards with counters kept, skip invalid rows and resume after failures."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        self.member = User.objects.create_user(username='member@example.com', email='member@example.com')
+        self.board = Board.objects.create(title='Board', owner_id=self.owner)
+        self.board.members.set([self.member])
+        self.client.force_authenticate(self.owner)
+
+    def upload(self, name, content, **data):
+        response = self.client.post('/api/imports/', {'file': SimpleUploadedFile(name, content), **data})
+        self.assertEqual(response.status_code, 201)
+        return response.data
+
+    def test_export_round_trip(self):
+        task = Task.objects.create(title='Task', board=self.board, created_by=self.member, assignee=self.member,
+                                   status='done', priority='high')
+        Comment.objects.create(task=task, author=self.member, content='Comment')
+        exported = b''.join(self.client.get(f'/api/boards/{self.board.pk}/export/?gzip=1').streaming_content)
+
+        job = self.upload('board.ndjson.gz', exported)
+        self.assertEqual((job['status'], job['boards_created'], job['tasks_created'], job['comments_created']),
+                         ('done', 1, 1, 1))
+        board = Board.objects.get(pk=job['board'])
+        imported = board.tasks.get()
+        self.assertEqual((imported.assignee, imported.created_by, imported.comments_count), (self.member, self.member, 1))
+        self.assertEqual(list(board.members.all()), [self.member])
+        self.assertEqual(find_counter_drift([board.pk]), [])
+        self.assertEqual(find_comment_count_drift([board.pk]), [])
+
+    def test_csv_skips_invalid_rows(self):
+        content = (
+            'title,status,assignee,due_date\n'
+            'Ok,review,member@example.com,2026-01-31\n'
+            'Stranger,to-do,nobody@example.com,\n'
+            ',to-do,,\n'
+        ).encode()
+        job = self.upload('tasks.csv', content, board=self.board.pk)
+        self.assertEqual((job['tasks_created'], job['rows_skipped']), (1, 2))
+        self.assertEqual([error['row'] for error in job['errors']], [2, 3])
+        self.assertEqual(self.board.tasks.get().assignee, self.member)
+        self.assertEqual(find_counter_drift([self.board.pk]), [])
+
+    def test_comment_authors_must_be_members(self):
+        User.objects.create_user(username='stranger@example.com', email='stranger@example.com')
+        lines = [{'type': 'board', 'id': 1, 'title': 'Imported', 'members': ['member@example.com']},
+                 {'type': 'task', 'id': 1, 'title': 'Task'}]
+        lines += [{'type': 'comment', 'task': 1, 'author': author, 'content': 'Hi'}
+                  for author in ('member@example.com', 'owner@example.com', 'stranger@example.com')]
+        job = self.upload('board.ndjson', '\n'.join(map(json.dumps, lines)).encode())
+        self.assertEqual((job['comments_created'], job['rows_skipped']), (2, 1))
+        self.assertIn('member or owner', job['errors'][0]['error'])
+
+    def test_malformed_row_values_are_skipped(self):
+        lines = [{'type': 'board', 'id': 1, 'title': 'Imported', 'members': 7},
+                 {'type': 'task', 'id': 1, 'title': 'Ok', 'due_date': '2026-01-31'},
+                 {'type': 'task', 'id': 2, 'title': 'Date', 'due_date': 20240101},
+                 {'type': 'task', 'id': 3, 'title': 'Description', 'description': {}},
+                 {'type': 'task', 'id': 4, 'title': 'Status', 'status': ['done']},
+                 {'type': 'comment', 'task': 1, 'author': 'owner@example.com', 'content': {'text': 'Hi'}},
+                 {'type': 'comment', 'task': 1, 'author': 'owner@example.com', 'content': 'Hi', 'created_at': 1},
+                 {'type': 'comment', 'task': 1, 'author': 'owner@example.com', 'content': 'Hi',
+                  'updated_at': 'yesterday'},
+                 {'type': 'comment', 'task': 1, 'author': 'owner@example.com', 'content': 'Hi',
+                  'created_at': '2026-01-31T12:00:00+00:00'}]
+        job = self.upload('board.ndjson', '\n'.join(map(json.dumps, lines)).encode())
+        self.assertEqual((job['status'], job['tasks_created'], job['comments_created'], job['rows_skipped']),
+                         ('done', 1, 1, 6))
+        self.assertEqual([error['row'] for error in job['errors']], [3, 4, 5, 6, 7, 8])
+        self.assertEqual(job['errors'][1]['error'], 'description: must be a string.')
+
+    def test_failed_import_is_an_error_response(self):
+        content = gzip.compress(b'{"type": "board", "title": "Imported"}\n' * 100)[:-20]
+        response = self.client.post('/api/imports/', {'file': SimpleUploadedFile('board.ndjson.gz', content)})
+        self.assertEqual((response.status_code, response.data['status']), (400, 'failed'))
+
+    def test_resume_after_failure(self):
+        lines = [json.dumps({'type': 'board', 'id': 1, 'title': 'Imported', 'members': ['member@example.com']})]
+        lines += [json.dumps({'type': 'task', 'id': i, 'title': f'Task {i}'}) for i in range(4)]
+        lines += [json.dumps({'type': 'comment', 'task': 0, 'author': 'member@example.com', 'content': 'Hi'})]
+        content = '\n'.join(lines).encode()
+
+        def failing(rows):
+            for number, row in enumerate(rows):
+                if number == 3:
+                    raise DatabaseError('connection lost')
+                yield row
+
+        job = ImportJob.objects.create(created_by=self.owner, format=ImportJob.NDJSON)
+        with self.assertRaises(DatabaseError):
+            Importer(job, chunk_size=2).run(failing(read_rows(io.BytesIO(content), job.format)))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.position, job.tasks_created), (ImportJob.FAILED, 2, 1))
+
+        response = self.client.post(f'/api/imports/{job.pk}/resume/', {'file': SimpleUploadedFile('a.ndjson', content)})
+        self.assertEqual((response.data['status'], response.data['position']), ('done', 6))
+        board = Board.objects.get(pk=response.data['board'])
+        self.assertEqual(board.tasks.count(), 4)
+        self.assertEqual(board.tasks.get(title='Task 0').comments_count, 1)
+        self.assertEqual(find_counter_drift([board.pk]), [])
+
+
+class DatabaseConfigTests(SimpleTestCase):
+    """DATABASES comes from DB_* variables: tuned SQLite by default, PostgreSQL with persistent or pooled connections."""
+
+    def test_sqlite_tuned_by_default(self):
+        config = database_from_env({}, Path('/app'))
+        self.assertEqual(config['NAME'], Path('/app/db.sqlite3'))
+        self.assertIn('journal_mode=WAL', config['OPTIONS']['init_command'])
+        self.assertEqual(config['OPTIONS']['transaction_mode'], 'IMMEDIATE')
+        self.assertNotIn('OPTIONS', database_from_env({'DB_SQLITE_TUNED': '0'}, Path('/app')))
+
+    def test_postgres_profiles(self):
+        config = database_from_env({'DB_ENGINE': 'postgres', 'DB_HOST': 'db'}, Path('/app'))
+        self.assertEqual((config['HOST'], config['CONN_MAX_AGE'], config['CONN_HEALTH_CHECKS']), ('db', 60, True))
+        pooled = database_from_env({'DB_ENGINE': 'postgres', 'DB_POOL': '1', 'DB_POOL_MAX_SIZE': '20'}, Path('/app'))
+        self.assertEqual((pooled['CONN_MAX_AGE'], pooled['OPTIONS']['pool']['max_size']), (0, 20))
+        with self.assertRaises(ValueError):
+            database_from_env({'DB_ENGINE': 'oracle'}, Path('/app'))
+
+
+class MetricsTests(APITestCase):
+    """Requests are recorded per URL name and method, and /metrics is limited to local addresses and staff."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        self.board = Board.objects.create(title='Board', owner_id=self.owner)
+        Task.objects.create(title='Task', board=self.board, created_by=self.owner)
+        registry.reset()
+
+    def test_records_latency_queries_and_bytes(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.owner).key}')
+        self.client.get(f'/api/boards/{self.board.pk}/')
+        self.client.get('/api/boards/999/')
+        self.client.credentials()
+        with override_settings(KANBAN_METRICS_ALLOWED_IPS=['127.0.0.1']):
+            text = self.client.get('/metrics').content.decode()
+        labels = '{view="board-detail",method="GET"}'
+        values = dict(line.rsplit(' ', 1) for line in text.splitlines() if not line.startswith('#'))
+        self.assertEqual(values[f'kanban_http_request_duration_seconds_count{labels}'], '2')
+        self.assertGreater(int(values[f'kanban_http_db_queries_sum{labels}']), 2)
+        self.assertGreater(float(values[f'kanban_http_db_duration_seconds_sum{labels}']), 0)
+        self.assertGreater(int(values[f'kanban_http_response_bytes_sum{labels}']), 100)
+        self.assertEqual(values[f'kanban_http_db_queries_bucket{labels[:-1]},le="+Inf"}}'], '2')
+        self.assertEqual(values['kanban_http_requests_total{view="board-detail",method="GET",status="4xx"}'], '1')
+
+    def test_access(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.owner).key}')
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        staff = User.objects.create_user(username='staff', is_staff=True)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=staff).key}')
+        self.assertEqual(self.client.get('/metrics').status_code, 200)
+        self.client.credentials()
+        self.client.force_login(staff)
+        self.assertEqual(self.client.get('/metrics').status_code, 200)
+        self.client.logout()
+        with override_settings(KANBAN_METRICS_ALLOWED_IPS=['10.0.0.7']):
+            self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='10.0.0.7').status_code, 200)
+
+
+class ProfilingTests(APITestCase):
+    """Requests with a signed header or picked by the sample rate are profiled; staff can fetch the profiles."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.settings_override = override_settings(KANBAN_PROFILE_DIR=directory.name)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        self.owner = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        self.staff = User.objects.create_user(username='staff@example.com', is_staff=True)
+        self.board = Board.objects.create(title='Board', owner_id=self.owner)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.owner).key}')
+
+    def test_signed_header(self):
+        url = f'/api/boards/{self.board.pk}/'
+        self.assertNotIn('X-Kanban-Profile-Id', self.client.get(url))
+        self.assertNotIn('X-Kanban-Profile-Id', self.client.get(url, HTTP_X_KANBAN_PROFILE='forged'))
+        profile_id = self.client.get(url, HTTP_X_KANBAN_PROFILE=make_token())['X-Kanban-Profile-Id']
+
+        self.assertEqual(self.client.get('/api/profiles/').status_code, 403)
+        self.client.credentials()
+        self.client.force_authenticate(self.staff)
+        listing = self.client.get('/api/profiles/').json()
+        self.assertEqual([(item['id'], item['view']) for item in listing['results']], [(profile_id, 'board-detail')])
+        detail = self.client.get(f'/api/profiles/{profile_id}/').json()
+        self.assertEqual(detail['query_count'], len(detail['queries']))
+        self.assertTrue(any('kanban_app_board' in query['sql'] for query in detail['queries']))
+        self.assertIn('cumulative', detail['top'])
+        download = self.client.get(f'/api/profiles/{profile_id}/download/')
+        with tempfile.NamedTemporaryFile(suffix='.prof') as file:
+            file.write(b''.join(download.streaming_content))
+            file.flush()
+            self.assertGreater(pstats.Stats(file.name).total_calls, 0)
+        self.assertEqual(self.client.get('/api/profiles/../secrets/').status_code, 404)
+
+    def test_signed_header_over_asgi_is_logged(self):
+        async def get_response(request):
+            return HttpResponse()
+
+        middleware = ProfilingMiddleware(get_response)
+        with self.assertLogs('kanban.profiling', 'WARNING') as logs:
+            request = AsyncRequestFactory().get('/api/boards/', headers={'X-Kanban-Profile': make_token()})
+            response = async_to_sync(middleware)(request)
+        self.assertNotIn('X-Kanban-Profile-Id', response)
+        self.assertIn('GET /api/boards/', logs.output[0])
+        self.assertEqual(list(Path(settings.KANBAN_PROFILE_DIR).iterdir()), [])
+
+    @override_settings(KANBAN_PROFILE_RATE=1, KANBAN_PROFILE_MAX_COUNT=2)
+    def test_sampling_keeps_newest_profiles(self):
+        ids = [self.client.get('/api/boards/')['X-Kanban-Profile-Id'] for _ in range(3)]
+        self.client.credentials()
+        self.client.force_authenticate(self.staff)
+        kept = [item['id'] for item in self.client.get('/api/profiles/').json()['results']]
+        self.assertEqual(kept, [ids[2], ids[1]])
+
+
+class TracingTests(APITestCase):
+    """With tracing on, each request becomes one trace with spans for the DRF stages and SQL."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / 'traces.ndjson'
+        self.settings_override = override_settings(KANBAN_TRACE_EXPORTER='file', KANBAN_TRACE_FILE=str(self.path))
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        self.addCleanup(tracing.uninstall)
+        self.owner = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        self.board = Board.objects.create(title='Board', owner_id=self.owner)
+        self.task = Task.objects.create(title='Task', board=self.board, created_by=self.owner, assignee=self.owner)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.owner).key}')
+
+    def test_spans_of_task_patch(self):
+        response = self.client.patch(f'/api/tasks/{self.task.pk}/', {'status': 'done'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        [line] = self.path.read_text().splitlines()
+        spans = json.loads(line)['resourceSpans'][0]['scopeSpans'][0]['spans']
+        by_id = {span['spanId']: span for span in spans}
+        names = {span['name'] for span in spans}
+        self.assertEqual(spans[0]['name'], 'PATCH task-detail')
+        self.assertTrue({'drf.authenticate', 'permission IsTaskOwnerOrBoardMember.has_object_permission',
+                         'TaskViewSet.get_object', 'db.query'} <= names)
+        self.assertTrue(any(name.startswith('serialize ') for name in names))
+        self.assertTrue(any(name.startswith('field ') and name.endswith('.get_fullname') for name in names))
+        self.assertEqual({span['traceId'] for span in spans}, {spans[0]['traceId']})
+        for span in spans[1:]:
+            self.assertIn(span['parentSpanId'], by_id)
+            self.assertLessEqual(int(span['endTimeUnixNano']), int(spans[0]['endTimeUnixNano']))
+
+    def test_uninstall_restores_drf(self):
+        originals = (APIView.initial, Serializer.data, TaskViewSet.__dict__.get('get_object'))
+        self.client.get(f'/api/tasks/{self.task.pk}/')
+        self.assertIsNot(APIView.initial, originals[0])
+        tracing.uninstall()
+        self.assertEqual((APIView.initial, Serializer.data, TaskViewSet.__dict__.get('get_object')), originals)
+
+    def test_otlp_exporter_posts_batches(self):
+        received = []
+
+        class Collector(BaseHTTPRequestHandler):
+            def do_POST(self):
+                received.append(json.loads(self.rfile.read(int(self.headers['Content-Length']))))
+                self.send_response(200)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(('127.0.0.1', 0), Collector)
+        self.addCleanup(server.server_close)
+        thread = threading.Thread(target=server.handle_request)
+        thread.start()
+        trace = Trace(max_spans=10)
+        root = Span(trace, 'GET board-list', None, {'http.status_code': 200})
+        root.end = root.start + 1000
+        trace.spans.append(root)
+        OtlpHttpExporter(f'http://127.0.0.1:{server.server_port}/v1/traces').export(trace)
+        thread.join(5)
+        [exported] = received[0]['resourceSpans'][0]['scopeSpans'][0]['spans']
+        self.assertEqual((exported['name'], exported['traceId']), ('GET board-list', trace.trace_id))
+        self.assertEqual(exported['attributes'], [{'key': 'http.status_code', 'value': {'intValue': '200'}}])
+
+
+class LeanReadTests(APITestCase):
+    """The lean read path returns exactly what the serializers return."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner@example.com', email='owner@example.com',
+                                              first_name='Ada', last_name='Lovelace')
+        self.member = User.objects.create_user(username='member@example.com', email='member@example.com',
+                                               first_name='Zoë')
+        self.former = User.objects.create_user(username='former@example.com', email='former@example.com')
+        self.board = Board.objects.create(title='Board', owner_id=self.owner)
+        self.board.members.set([self.member, self.former])
+        for i in range(7):
+            Task.objects.create(title=f'Task {i} ✓', description='x' * i, board=self.board, created_by=self.owner,
+                                assignee=self.member if i % 2 else self.owner,
+                                reviewer=self.former if i % 3 == 0 else None,
+                                due_date=timezone.localdate() + timedelta(days=i) if i % 2 else None,
+                                status='done' if i == 3 else 'to-do')
+        self.board.members.remove(self.former)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.member).key}')
+
+    def get_both(self, path):
+        cache.clear()
+        with override_settings(KANBAN_LEAN_READS=False):
+            expected = self.client.get(path)
+        cache.clear()
+        with override_settings(KANBAN_LEAN_READS=True):
+            actual = self.client.get(path)
+        self.assertEqual(actual.status_code, 200)
+        return actual.content, expected.content
+
+    def test_output_is_identical(self):
+        for path in [
+            '/api/tasks/assigned-to-me/',
+            '/api/tasks/assigned-to-me/?page_size=2&ordering=-title',
+            '/api/tasks/assigned-to-me/?fields=id,reviewer,due_date&ordering=updated_at',
+            f'/api/tasks/?board={self.board.pk}&page_size=3',
+            f'/api/boards/{self.board.pk}/',
+        ]:
+            with self.subTest(path=path):
+                self.assertEqual(*self.get_both(path))
+
+    def test_next_page_cursor_is_identical(self):
+        actual, expected = self.get_both('/api/tasks/?page_size=2&ordering=-updated_at')
+        next_page = json.loads(actual)['next']
+        self.assertEqual(next_page, json.loads(expected)['next'])
+        self.assertEqual(*self.get_both(next_page))
+
+    def test_renderers_decode_to_the_same_values(self):
+        payload = {'score': 2.5e-05, 'big': 1e16, 'when': timezone.now(), 'title': 'Zoë\u2028✓', 'ids': [1, 2]}
+        fast, plain = FastJSONRenderer().render(payload), JSONRenderer().render(payload)
+        self.assertEqual(json.loads(fast), json.loads(plain))
+        self.assertNotIn(b'\xe2\x80\xa8', fast)
+
+
+class SeedingTests(APITestCase):
+    """Seeded data is skewed, consistent with memberships and counters, and seeded users can log in."""
+
+    def test_seeded_data(self):
+        seeder = Seeder(users=30, boards=8, tasks=400, comments=300, max_members=6, batch_size=100).run()
+        sizes = [seeder.tasks_per_board[board_id] for board_id in seeder.board_ids]
+        self.assertEqual((sum(sizes), Comment.objects.count()), (400, 300))
+        self.assertGreater(sizes[0], 4 * sizes[-1])
+        for task in Task.objects.select_related('board'):
+            people = {task.board.owner_id_id, *task.board.members.values_list('pk', flat=True)}
+            self.assertTrue({task.created_by_id, task.assignee_id or task.created_by_id} <= people)
+        self.assertEqual(find_counter_drift(seeder.board_ids), [])
+        self.assertEqual(find_comment_count_drift(), [])
+        response = self.client.post('/api/login/', {'email': seeder.emails[0], 'password': 'kanban-load-test'})
+        self.assertEqual(response.status_code, 200)
+
+
+class BoardSocketTests(TransactionTestCase):
+    """Board events reach connected members over the ASGI WebSocket endpoint."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        self.member = User.objects.create_user(username='member@example.com', email='member@example.com')
+        self.board = Board.objects.create(title='Board', owner_id=self.owner)
+        self.board.members.set([self.member])
+        self.token = Token.objects.create(user=self.member).key
+        cache.clear()
+
+    async def connect(self, token):
+        inbox, outbox = asyncio.Queue(), asyncio.Queue()
+        scope = {'type': 'websocket', 'path': f'/ws/boards/{self.board.pk}/',
+                 'query_string': f'token={token}'.encode(), 'headers': []}
+        inbox.put_nowait({'type': 'websocket.connect'})
+        handler = asyncio.ensure_future(board_socket(scope, inbox.get, outbox.put))
+        return handler, inbox, outbox
+
+    async def next_message(self, outbox):
+        return await asyncio.wait_for(outbox.get(), timeout=5)
+
+    async def test_invalid_token_is_rejected(self):
+        handler, _, outbox = await self.connect('invalid')
+        self.assertEqual(await self.next_message(outbox), {'type': 'websocket.close', 'code': 4401})
+        await handler
+
+    async def test_member_receives_changes_until_removed(self):
+        handler, inbox, outbox = await self.connect(self.token)
+        self.assertEqual((await self.next_message(outbox))['type'], 'websocket.accept')
+
+        task = await Task.objects.acreate(title='Task', board=self.board, created_by=self.owner)
+        event = json.loads((await self.next_message(outbox))['text'])
+        self.assertEqual(event['type'], 'changes')
+        self.assertEqual(event['changes'][0]['id'], task.pk)
+
+        await sync_to_async(self.board.members.remove)(self.member)
+        self.assertEqual(await self.next_message(outbox), {'type': 'websocket.close', 'code': 4403})
+        await handler
+        self.assertEqual(broker.subscriber_count(), 0)
+
+
+class AsyncReadViewTests(TransactionTestCase):
+    """The async read views answer exactly like the DRF views they replace under ASGI."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        self.member = User.objects.create_user(username='member@example.com', email='member@example.com')
+        self.outsider = User.objects.create_user(username='outsider@example.com', email='outsider@example.com')
+        self.board = Board.objects.create(title='Board', owner_id=self.owner)
+        self.board.members.set([self.member])
+        self.task = Task.objects.create(title='Task', board=self.board, created_by=self.owner,
+                                        assignee=self.member, reviewer=self.owner)
+        Comment.objects.create(task=self.task, author=self.member, content='Comment')
+        self.tokens = {user: Token.objects.create(user=user).key for user in (self.member, self.outsider)}
+        cache.clear()
+
+    def assert_same(self, view, path, user, **kwargs):
+        headers = {'Authorization': f'Token {self.tokens[user]}'}
+        expected = APIClient().get(path, headers=headers)
+        actual = async_to_sync(view.as_view())(AsyncRequestFactory().get(path, headers=headers), **kwargs)
+        self.assertEqual(actual.status_code, expected.status_code)
+        self.assertEqual(json.loads(actual.content), json.loads(expected.content))
+        self.assertEqual(actual.get('ETag'), expected.get('ETag'))
+
+    def test_responses_match_sync_views(self):
+        self.assert_same(async_views.BoardListReadView, '/api/boards/?page_size=1', self.member)
+        self.assert_same(async_views.BoardDetailReadView, f'/api/boards/{self.board.pk}/', self.member,
+                         pk=self.board.pk)
+        self.assert_same(async_views.AssignedTaskReadView, '/api/tasks/assigned-to-me/', self.member)
+        self.assert_same(async_views.ReviewingTaskReadView, '/api/tasks/reviewing/', self.member)
+        self.assert_same(async_views.AssignedTaskReadView,
+                         '/api/tasks/assigned-to-me/?status=to-do&ordering=-title&fields=id,title,reviewer', self.member)
+        self.assert_same(async_views.CommentListReadView, f'/api/tasks/{self.task.pk}/comments/', self.member,
+                         task_pk=self.task.pk)
+
+    def test_errors_match_sync_views(self):
+        self.assert_same(async_views.BoardDetailReadView, f'/api/boards/{self.board.pk}/', self.outsider,
+                         pk=self.board.pk)
+        self.assert_same(async_views.BoardDetailReadView, '/api/boards/999/', self.member, pk=999)
+        self.assert_same(async_views.AssignedTaskReadView, '/api/tasks/assigned-to-me/?fields=secret', self.member)
+        self.assert_same(async_views.CommentListReadView, f'/api/tasks/{self.task.pk}/comments/', self.outsider,
+                         task_pk=self.task.pk)
@@ -0,0 +1,46 @@
+"""
+Version stamps used for conditional GET (ETag / Last-Modified).
+
+Board.version and Task.version only ever grow and are bumped with F()
+expressions together with `updated_at`. A board is touched whenever the
+board itself, its membership, any of its tasks or any of their comments
+change; a task is touched when it or its comments change. Renaming a user
+touches every board and task whose payload embeds that user.
+"""
+from django.db.models import F, Q
+from django.utils import timezone
+from kanban_app.models import Board, Task
+
+
+def touch():
+    """Update kwargs that bump a version stamp; merge into an existing UPDATE where possible."""
+    return {'version': F('version') + 1, 'updated_at': timezone.now()}
+
+
+def touch_boards(board_ids):
+    Board.objects.filter(pk__in=board_ids).update(**touch())
+
+
+def touch_tasks(task_ids):
+    Task.objects.filter(pk__in=task_ids).update(**touch())
+
+
+def touch_board_of_task(task_id):
+    """Bump the board that owns the task without loading the task."""
+    Board.objects.filter(tasks=task_id).update(**touch())
+
+
+def touch_user(user_id):
+    """
+    Bump the tasks the user is assigned to, reviews or commented on, and their
+    boards plus the boards the user owns or belongs to. Returns the board ids.
+    """
+    task_ids = list(Task.objects.filter(
+        Q(assignee=user_id) | Q(reviewer=user_id) | Q(comments__author=user_id)
+    ).values_list('pk', flat=True).distinct())
+    board_ids = list(Board.objects.filter(
+        Q(owner_id=user_id) | Q(members=user_id) | Q(tasks__in=task_ids)
+    ).values_list('pk', flat=True).distinct())
+    touch_tasks(task_ids)
+    touch_boards(board_ids)
+    return board_ids